@@ -0,0 +1,121 @@
+"""도구 결과 캐시 — 도구별 TTL + 크기 제한 LRU.
+
+같은 도구를 같은 인자로 다시 부르면 (예: 점심 전에 수십 번 오는 "오늘 점심 뭐야?")
+백엔드 조회 없이 저장해 둔 ToolResult 를 돌려준다. 캐시는 도구 이름별로 프로세스에 하나씩 두므로
+에이전트를 다시 만들어도(설정 변경) 유지되고, 데이터를 바꾼 쪽은 에이전트 없이 ``invalidate()`` 로 비운다.
+캐시는 워커 프로세스마다 따로이므로 다른 워커에 알리는 일은 호출하는 쪽(``hobi.cache_events``)이 맡는다.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from agent.types import ToolResult
+
+
+def normalize_args(args: dict[str, Any]) -> dict[str, Any]:
+    """캐시 키용 인자 정규화 — 문자열 앞뒤 공백/연속 공백 정리 + 소문자, 빈 값(None/""/{}) 제거."""
+    out: dict[str, Any] = {}
+    for key, value in args.items():
+        if isinstance(value, str):
+            value = " ".join(value.split()).lower()
+        elif isinstance(value, dict):
+            value = normalize_args(value)
+        if value is None or value == "" or value == {}:
+            continue
+        out[key] = value
+    return out
+
+
+def args_key(args: dict[str, Any]) -> str:
+    return json.dumps(normalize_args(args), sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+
+
+class ToolCache:
+    """도구 하나의 결과 캐시. 항목은 ``ttl`` 초 뒤 만료, ``max_entries`` 를 넘으면 가장 오래 안 쓴 것부터 버림."""
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # {키: (만료 시각 monotonic, 정규화된 인자, 결과)}
+        self._entries: OrderedDict[str, tuple[float, dict, ToolResult]] = OrderedDict()
+        # 메트릭
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: str) -> ToolResult | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[2]
+
+    def put(self, key: str, args: dict[str, Any], result: ToolResult) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, normalize_args(args), result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, match: Callable[[dict], bool] | None = None) -> int:
+        """``match(정규화된 인자)`` 가 참인 항목(없으면 전부)을 지운다. 지운 수 반환."""
+        if match is None:
+            removed = len(self._entries)
+            self._entries.clear()
+        else:
+            keys = [key for key, (_, args, _) in self._entries.items() if match(args)]
+            for key in keys:
+                del self._entries[key]
+            removed = len(keys)
+        self.invalidations += removed
+        return removed
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+# {도구 이름: 캐시}
+_caches: dict[str, ToolCache] = {}
+
+
+def get_cache(tool_name: str, ttl: float, max_entries: int) -> ToolCache:
+    """도구 이름별 캐시 (없으면 생성, TTL/크기는 도구 설정을 따라 갱신)."""
+    cache = _caches.get(tool_name)
+    if cache is None:
+        cache = _caches[tool_name] = ToolCache(ttl, max_entries)
+    else:
+        cache.ttl = ttl
+        cache.max_entries = max_entries
+    return cache
+
+
+def invalidate(tool_name: str, match: Callable[[dict], bool] | None = None) -> int:
+    """도구 캐시 비우기 — 데이터가 바뀐 쪽(API 라우터 등)에서 호출."""
+    cache = _caches.get(tool_name)
+    return cache.invalidate(match) if cache is not None else 0
+
+
+def cache_stats() -> dict[str, dict]:
+    return {name: cache.stats() for name, cache in _caches.items()}
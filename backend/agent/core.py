@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from collections.abc import AsyncGenerator
 from typing import Any
@@ -14,6 +15,8 @@ logger = logging.getLogger(__name__)
 
 # 도구 호출 무한 루프 방지
 _MAX_TOOL_ROUNDS = 5
+# 한 라운드에서 동시에 실행할 도구 호출 수 기본값
+_MAX_TOOL_CONCURRENCY = 4
 
 
 class Agent:
@@ -23,6 +26,9 @@ class Agent:
       1. 유저 질문 + 시스템 프롬프트 → LLM
       2. LLM이 tool_call 을 반환하면 해당 도구 실행 → 결과를 메시지에 추가 → 다시 LLM
       3. LLM이 텍스트 응답을 반환하면 최종 답변으로 반환
+
+    한 라운드의 tool_call 들은 최대 ``max_concurrency`` 개씩 동시에 실행하고, 결과는 요청 순서대로
+    메시지에 넣는다. ``parallel_safe = False`` 인 도구는 다른 호출과 겹치지 않게 혼자 실행한다.
     """
 
     def __init__(
@@ -30,10 +36,12 @@ class Agent:
         llm: BaseLLM,
         tools: list[BaseTool],
         system_prompt: str,
+        max_concurrency: int = _MAX_TOOL_CONCURRENCY,
     ):
         self.llm = llm
         self.tools: dict[str, BaseTool] = {t.name: t for t in tools}
         self.system_prompt = system_prompt
+        self.max_concurrency = max(1, max_concurrency)
 
     # ------------------------------------------------------------------
     # 동기(전체 응답)
@@ -63,9 +71,9 @@ class Agent:
                     "tool_calls": executed_tools,
                 }
 
-            # 도구 실행
-            for tc in response.tool_calls:
-                result = await self._execute_tool(tc)
+            # 도구 실행 (라운드 안에서 동시에, 결과는 요청 순서대로)
+            results = await self._execute_tools(response.tool_calls)
+            for tc, result in zip(response.tool_calls, results):
                 executed_tools.append(tc.name)
 
                 # assistant 메시지(tool_call 포함)는 LLM 프로바이더가 내부적으로
@@ -102,26 +110,36 @@ class Agent:
     ) -> AsyncGenerator[StreamEvent, None]:
         """질문에 대해 StreamEvent 를 yield.
 
-        도구 호출 → 실행 → 최종 응답 스트리밍 순서로 진행.
+        라운드마다 스트리밍 요청 한 번 — 텍스트 조각은 생성되는 대로 token 으로 내보내고,
+        도구 호출이 오면 실행한 뒤 다음 라운드에서 이어서 스트리밍한다 (도구가 없으면 첫 토큰부터 바로).
+        route_info 는 첫 토큰 앞에, 이후 라우트(마지막으로 실행한 도구)가 바뀌면 다시 보낸다.
         """
         messages = self._build_messages(question, history)
         tool_specs = [t.get_spec() for t in self.tools.values()]
         executed_tools: list[str] = []
-        need_final_stream = True
+        sent_route: str | None = None
 
         for _ in range(_MAX_TOOL_ROUNDS):
-            response: LLMResponse = await self.llm.chat(messages, tools=tool_specs)
-
-            if not response.has_tool_calls:
-                # 도구를 한 번도 호출하지 않았고 LLM이 바로 응답한 경우
-                # → 이미 받은 텍스트를 그대로 yield (이중 LLM 호출 방지)
-                if not executed_tools and response.content:
-                    need_final_stream = False
+            route = executed_tools[-1] if executed_tools else "llm"
+            text_parts: list[str] = []
+            tool_calls: list[ToolCall] = []
+
+            async for chunk in self.llm.chat_stream_with_tools(messages, tools=tool_specs):
+                if chunk.type == "text" and chunk.text:
+                    if sent_route != route:
+                        yield StreamEvent(type="route_info", data=route)
+                        sent_route = route
+                    text_parts.append(chunk.text)
+                    yield StreamEvent(type="token", data=chunk.text)
+                elif chunk.type == "tool_call" and chunk.tool_call is not None:
+                    tool_calls.append(chunk.tool_call)
+
+            if not tool_calls:
                 break
 
             # 도구 실행 단계
-            for tc in response.tool_calls:
-                result = await self._execute_tool(tc)
+            results = await self._execute_tools(tool_calls)
+            for tc, result in zip(tool_calls, results):
                 executed_tools.append(tc.name)
                 messages.append(Message(
                     role="tool",
@@ -132,23 +150,15 @@ class Agent:
 
             messages.append(Message(
                 role="assistant",
-                content=response.content or "",
+                content="".join(text_parts),
             ))
         else:
             yield StreamEvent(type="error", data="도구 호출 최대 라운드 초과")
             return
 
-        # 라우트 정보
-        route = executed_tools[-1] if executed_tools else "llm"
-        yield StreamEvent(type="route_info", data=route)
-
-        if need_final_stream:
-            # 도구 실행 후 최종 응답을 스트리밍으로 생성
-            async for token in self.llm.chat_stream(messages):
-                yield StreamEvent(type="token", data=token)
-        else:
-            # 도구 없이 직접 응답한 경우 — 이미 받은 텍스트를 한 번에 yield
-            yield StreamEvent(type="token", data=response.content)
+        # 텍스트 없이 끝난 경우에도 라우트 정보는 보냄
+        if sent_route != route:
+            yield StreamEvent(type="route_info", data=route)
 
         yield StreamEvent(type="done")
 
@@ -169,6 +179,36 @@ class Agent:
         msgs.append(Message(role="user", content=question))
         return msgs
 
+    async def _execute_tools(self, tool_calls: list[ToolCall]) -> list[str]:
+        """한 라운드의 ToolCall 들을 실행하고 결과 문자열을 요청 순서대로 반환.
+
+        연속된 병렬 가능 호출은 묶어서 동시에(최대 ``max_concurrency`` 개) 실행하고,
+        ``parallel_safe = False`` 인 도구 호출은 앞 묶음이 끝난 뒤 혼자 실행한다.
+        """
+        if len(tool_calls) == 1:
+            return [await self._execute_tool(tool_calls[0])]
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def limited(tc: ToolCall) -> str:
+            async with semaphore:
+                return await self._execute_tool(tc)
+
+        results: list[str] = []
+        batch: list[ToolCall] = []
+        for tc in tool_calls:
+            tool = self.tools.get(tc.name)
+            if tool is None or tool.parallel_safe:
+                batch.append(tc)
+                continue
+            if batch:
+                results.extend(await asyncio.gather(*(limited(b) for b in batch)))
+                batch = []
+            results.append(await self._execute_tool(tc))
+        if batch:
+            results.extend(await asyncio.gather(*(limited(b) for b in batch)))
+        return results
+
     async def _execute_tool(self, tc: ToolCall) -> str:
         """ToolCall 을 실행하고 결과 문자열을 반환."""
         tool = self.tools.get(tc.name)
@@ -178,7 +218,7 @@ class Agent:
 
         try:
             logger.info(f"도구 실행: {tc.name}({tc.arguments})")
-            result = await tool.execute(**tc.arguments)
+            result = await tool.run(**tc.arguments)
             logger.info(f"도구 결과: {tc.name} → {result.content[:100]}...")
             return result.content
         except Exception as e:
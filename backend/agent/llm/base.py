@@ -5,7 +5,7 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from collections.abc import AsyncGenerator
 
-from agent.types import Message, ToolSpec, LLMResponse
+from agent.types import Message, ToolSpec, LLMResponse, LLMStreamChunk
 
 
 class BaseLLM(ABC):
@@ -25,8 +25,21 @@ class BaseLLM(ABC):
         self,
         messages: list[Message],
     ) -> AsyncGenerator[str, None]:
-        """텍스트 응답을 토큰 단위로 스트리밍.
+        """텍스트 응답을 토큰 단위로 스트리밍 (도구 없이)."""
+        ...
+
+    async def chat_stream_with_tools(
+        self,
+        messages: list[Message],
+        tools: list[ToolSpec] | None = None,
+    ) -> AsyncGenerator[LLMStreamChunk, None]:
+        """텍스트 조각과 도구 호출 조각을 생성되는 대로 스트리밍.
 
-        도구 호출이 필요 없는 최종 응답 단계에서 사용한다.
+        도구 호출은 조각(``tool_call_delta``)을 흘려보낸 뒤 스트림 끝에서 조립된 ``tool_call`` 로 한 번 더 준다.
+        기본 구현은 스트리밍을 지원하지 않는 프로바이더용 — ``chat()`` 전체 응답을 조각 하나씩으로 나눠 준다.
         """
-        ...
+        response = await self.chat(messages, tools=tools)
+        if response.content:
+            yield LLMStreamChunk(type="text", text=response.content)
+        for index, tc in enumerate(response.tool_calls):
+            yield LLMStreamChunk(type="tool_call", index=index, id=tc.id, name=tc.name, tool_call=tc)
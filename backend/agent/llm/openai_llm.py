@@ -8,7 +8,7 @@ from collections.abc import AsyncGenerator
 
 from openai import AsyncOpenAI
 
-from agent.types import Message, ToolSpec, LLMResponse, ToolCall
+from agent.types import Message, ToolSpec, LLMResponse, LLMStreamChunk, ToolCall
 from agent.llm.base import BaseLLM
 
 logger = logging.getLogger(__name__)
@@ -82,14 +82,10 @@ class OpenAILLM(BaseLLM):
         tool_calls: list[ToolCall] = []
         if choice.message.tool_calls:
             for tc in choice.message.tool_calls:
-                try:
-                    args = json.loads(tc.function.arguments)
-                except (json.JSONDecodeError, TypeError):
-                    args = {}
                 tool_calls.append(ToolCall(
                     id=tc.id,
                     name=tc.function.name,
-                    arguments=args,
+                    arguments=_parse_arguments(tc.function.arguments),
                 ))
 
         return LLMResponse(
@@ -115,3 +111,74 @@ class OpenAILLM(BaseLLM):
             delta = chunk.choices[0].delta if chunk.choices else None
             if delta and delta.content:
                 yield delta.content
+
+    # ------------------------------------------------------------------
+    # chat_stream_with_tools (텍스트 + 도구 호출 스트리밍)
+    # ------------------------------------------------------------------
+
+    async def chat_stream_with_tools(
+        self,
+        messages: list[Message],
+        tools: list[ToolSpec] | None = None,
+    ) -> AsyncGenerator[LLMStreamChunk, None]:
+        """한 번의 스트리밍 요청으로 텍스트 조각과 도구 호출 조각을 함께 받는다.
+
+        OpenAI 는 도구 호출을 ``index`` 별 조각으로 보낸다 — 첫 조각에 id/name, 이후 arguments JSON 이
+        여러 조각으로 나뉘어 온다. 조각은 받는 대로 흘려보내고, 스트림이 끝나면 index 별로 이어 붙인
+        arguments 를 파싱해 완성된 ToolCall 을 준다.
+        """
+        kwargs: dict = {
+            "model": self.model,
+            "temperature": self.temperature,
+            "messages": self._to_openai_messages(messages),
+            "stream": True,
+        }
+        if tools:
+            kwargs["tools"] = self._to_openai_tools(tools)
+
+        stream = await self.client.chat.completions.create(**kwargs)
+        # {index: [id, name, arguments 조각들]}
+        partial: dict[int, list] = {}
+        async for chunk in stream:
+            delta = chunk.choices[0].delta if chunk.choices else None
+            if delta is None:
+                continue
+            if delta.content:
+                yield LLMStreamChunk(type="text", text=delta.content)
+            for tc in delta.tool_calls or ():
+                entry = partial.setdefault(tc.index, [None, None, []])
+                name = tc.function.name if tc.function else None
+                fragment = (tc.function.arguments if tc.function else None) or ""
+                if tc.id:
+                    entry[0] = tc.id
+                if name:
+                    entry[1] = name
+                entry[2].append(fragment)
+                yield LLMStreamChunk(
+                    type="tool_call_delta",
+                    text=fragment,
+                    index=tc.index,
+                    id=tc.id,
+                    name=name,
+                )
+
+        for index in sorted(partial):
+            call_id, name, fragments = partial[index]
+            if not name:
+                logger.warning(f"이름 없는 도구 호출 조각 무시 (index={index})")
+                continue
+            tool_call = ToolCall(
+                id=call_id or f"call_{index}",
+                name=name,
+                arguments=_parse_arguments("".join(fragments)),
+            )
+            yield LLMStreamChunk(type="tool_call", index=index, id=tool_call.id, name=name, tool_call=tool_call)
+
+
+def _parse_arguments(raw: str | None) -> dict:
+    """도구 호출 arguments JSON 파싱 (비었거나 깨졌으면 빈 dict)."""
+    try:
+        args = json.loads(raw or "{}")
+    except (json.JSONDecodeError, TypeError):
+        return {}
+    return args if isinstance(args, dict) else {}
@@ -5,6 +5,7 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from typing import Any
 
+from agent.cache import ToolCache, args_key, get_cache
 from agent.types import ToolSpec, ToolResult
 
 
@@ -13,6 +14,9 @@ class BaseTool(ABC):
 
     구현 시 ``name``, ``description``, ``parameters`` 를 정의하고
     ``execute()`` 를 구현한다.
+
+    에이전트는 한 라운드의 도구 호출을 동시에 실행하므로 ``execute()`` 안의 블로킹 I/O 는
+    ``asyncio.to_thread`` 로 넘긴다. 다른 호출과 동시에 돌면 안 되는 도구는 ``parallel_safe = False``.
     """
 
     # 서브클래스에서 반드시 설정
@@ -22,6 +26,11 @@ class BaseTool(ABC):
         "type": "object",
         "properties": {},
     }
+    # False 면 같은 라운드의 다른 도구 호출과 겹치지 않게 혼자 실행
+    parallel_safe: bool = True
+    # 결과 캐시 (agent.cache) — TTL 초 (0 이면 캐시 안 함) 와 최대 항목 수
+    cache_ttl: float = 0
+    cache_size: int = 128
 
     def get_spec(self) -> ToolSpec:
         """LLM에 전달할 ToolSpec 을 반환."""
@@ -31,6 +40,27 @@ class BaseTool(ABC):
             parameters=self.parameters,
         )
 
+    @property
+    def cache(self) -> ToolCache | None:
+        return get_cache(self.name, self.cache_ttl, self.cache_size) if self.cache_ttl > 0 else None
+
+    def cache_key(self, kwargs: dict[str, Any]) -> str:
+        """결과 캐시 키 — 기본은 정규화된 인자. 인자 밖의 값(오늘 날짜 등)에 따라 결과가 바뀌면 재정의."""
+        return args_key(kwargs)
+
+    async def run(self, **kwargs: Any) -> ToolResult:
+        """캐시를 거쳐 ``execute()`` 를 호출 (에이전트는 이것을 부른다). 오류 결과는 캐시하지 않는다."""
+        cache = self.cache
+        if cache is None:
+            return await self.execute(**kwargs)
+        key = self.cache_key(kwargs)
+        result = cache.get(key)
+        if result is None:
+            result = await self.execute(**kwargs)
+            if not result.error:
+                cache.put(key, kwargs, result)
+        return result
+
     @abstractmethod
     async def execute(self, **kwargs: Any) -> ToolResult:
         """도구를 실행하고 ToolResult 를 반환한다.
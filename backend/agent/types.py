@@ -39,6 +39,7 @@ class ToolResult:
     """도구 실행 결과."""
     content: str
     metadata: dict[str, Any] | None = None
+    error: bool = False  # 실패 결과 (캐시하지 않음)
 
 
 @dataclass
@@ -52,6 +53,23 @@ class LLMResponse:
         return len(self.tool_calls) > 0
 
 
+@dataclass
+class LLMStreamChunk:
+    """스트리밍 LLM 응답 조각 (``BaseLLM.chat_stream_with_tools``).
+
+    - ``text``: 텍스트 조각 (``text``)
+    - ``tool_call_delta``: 도구 호출 조각 — 응답 안 순서(``index``), 첫 조각의 ``id``/``name``,
+      arguments JSON 일부(``text``)
+    - ``tool_call``: 조립이 끝난 도구 호출 (스트림 끝에서 ``index`` 순서대로)
+    """
+    type: Literal["text", "tool_call_delta", "tool_call"]
+    text: str = ""
+    index: int = 0
+    id: str | None = None
+    name: str | None = None
+    tool_call: ToolCall | None = None
+
+
 @dataclass
 class StreamEvent:
     """SSE 스트리밍 이벤트."""
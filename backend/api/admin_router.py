@@ -1,9 +1,11 @@
 """관리자 전용 API (사원 등록/관리)"""
 import logging
+from datetime import date, timedelta
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, EmailStr
 
 from api.deps import get_current_user
+from lib.auth import invalidate_profile, revoke_user
 from lib.supabase import get_supabase_admin
 
 logger = logging.getLogger(__name__)
@@ -20,7 +22,11 @@ POSITIONS = ["CEO", "CTO", "이사", "소장", "부소장", "팀장", "대리",
 
 
 async def get_admin_user(current_user=Depends(get_current_user)):
-    """현재 유저가 관리자인지 확인"""
+    """현재 유저가 관리자인지 확인
+
+    권한 회수가 바로 반영되도록 프로필 캐시를 쓰지 않고 service role 로 매번 조회한다
+    (anon 클라이언트는 RLS 때문에 빈 결과가 나올 수 있음).
+    """
     supabase = get_supabase_admin()
     result = (
         supabase.table("profiles")
@@ -158,6 +164,7 @@ async def update_user(user_id: str, body: UpdateUserRequest, admin=Depends(get_a
     if not result.data:
         raise HTTPException(status_code=404, detail="사원을 찾을 수 없습니다.")
 
+    invalidate_profile(user_id)
     return {"message": "수정 완료", "profile": result.data[0]}
 
 
@@ -196,9 +203,73 @@ async def delete_user(user_id: str, admin=Depends(get_admin_user)):
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"삭제 실패: {e}")
 
+    # 로컬 JWT 검증은 토큰 만료 전까지 통과하므로 삭제된 유저는 따로 차단
+    revoke_user(user_id)
     return {"message": "사원이 삭제되었습니다."}
 
 
+# ===== WebSocket 모니터링 =====
+
+
+@router.get("/ws/connections")
+async def ws_connection_metrics(admin=Depends(get_admin_user)):
+    """접속 중인 WebSocket 연결별 송신 큐 깊이 / 전송 지연 / 수신 제한 + 룸별 현황 / 위치 저장 대기 / 위치 스냅샷 / heartbeat"""
+    from ws.rooms import rooms
+
+    connections = rooms.connection_metrics()
+    return {
+        "count": len(connections),
+        "connections": connections,
+        "rooms": rooms.room_metrics(),
+        "persistence": rooms.persistence.stats(),
+        "snapshot": rooms.snapshot.stats(),
+        "inbound": rooms.limit_metrics(),
+        "heartbeat": rooms.heartbeat_metrics(),
+    }
+
+
+@router.post("/ws/maps/reload")
+async def ws_reload_maps(admin=Depends(get_admin_user)):
+    """룸 맵 파일(충돌 레이어) 다시 읽기 — 접속은 끊지 않음"""
+    from ws.rooms import rooms
+
+    return {"blocked_tiles": rooms.reload_maps()}
+
+
+@router.get("/ws/heatmap")
+async def ws_heatmap(
+    room: str = "main",
+    day: date | None = None,
+    days: int = 1,
+    admin=Depends(get_admin_user),
+):
+    """룸 이동 로그 집계 — 타일별 머문 시간/방문 수 + 영역별 함께 있던 쌍 수 (``day`` 부터 거꾸로 ``days`` 일)"""
+    import asyncio
+
+    from ws.heatmap import room_heatmap
+    from ws.rooms import rooms
+
+    target = rooms.get(room)
+    if target is None:
+        raise HTTPException(status_code=404, detail=f"룸을 찾을 수 없습니다: {room}")
+    if not 1 <= days <= 31:
+        raise HTTPException(status_code=400, detail="days 는 1~31 이어야 합니다.")
+    move_log = target.manager.move_log
+    if move_log is None:
+        raise HTTPException(status_code=404, detail="이동 로그가 꺼져 있습니다.")
+    # 아직 버퍼에 있는 오늘 이동까지 포함
+    await move_log.flush()
+    end = day or date.today()
+    return await asyncio.to_thread(
+        room_heatmap,
+        room,
+        target.config.grid_width,
+        target.config.grid_height,
+        [end - timedelta(days=n) for n in range(days)],
+        move_log.directory,
+    )
+
+
 # ===== 헬퍼 =====
 
 
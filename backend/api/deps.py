@@ -1,6 +1,6 @@
 from fastapi import Depends, HTTPException, Header
 
-from lib.supabase import get_supabase_client
+from lib.auth import AuthError, verify_token
 
 
 async def get_current_user(authorization: str = Header(None)):
@@ -8,7 +8,7 @@ async def get_current_user(authorization: str = Header(None)):
     JWT 토큰을 검증하고 현재 사용자 정보를 반환하는 FastAPI 의존성 함수입니다.
 
     Authorization 헤더에서 Bearer 토큰을 추출한 후,
-    Supabase auth.get_user()를 사용하여 토큰을 검증합니다.
+    lib.auth.verify_token()으로 서명/만료를 로컬에서 검증합니다. (Supabase 왕복 없음)
     """
     if not authorization:
         raise HTTPException(
@@ -27,10 +27,8 @@ async def get_current_user(authorization: str = Header(None)):
     token = parts[1]
 
     try:
-        supabase = get_supabase_client()
-        user_response = supabase.auth.get_user(token)
-        return user_response.user
-    except Exception:
+        return verify_token(token)
+    except AuthError:
         raise HTTPException(
             status_code=401,
             detail="Invalid or expired token",
@@ -5,6 +5,8 @@ import logging
 from fastapi import APIRouter, HTTPException, Header
 from pydantic import BaseModel
 
+from hobi.cache_events import menu_updated
+from lib.auth import invalidate_profile
 from lib.supabase import get_supabase_admin
 from lib.timezone import today_kst
 from rag.vector_store import embed_and_store_document
@@ -66,6 +68,8 @@ async def save_weekly_menu(
     # 사이드 이펙트: NPC 상태 메시지 + RAG 지식베이스 업데이트
     _update_npc_status(supabase, body.menus)
     _update_knowledge_base(supabase, body)
+    # 호비가 캐시해 둔 식단/문서 검색 결과 버림
+    menu_updated()
 
     return {"message": f"Menu {action} successfully", "post_title": body.post_title}
 
@@ -168,10 +172,14 @@ def _update_npc_status(supabase, menus: dict):
             .execute()
         )
         if npc.data:
+            from ws.rooms import rooms
             for row in npc.data:
                 supabase.table("profiles").update(
                     {"status_message": status}
                 ).eq("id", row["id"]).execute()
+                invalidate_profile(row["id"])
+                # NPC 는 모든 맵에 고정으로 그려지므로 접속 중인 전체 클라이언트에 전송
+                rooms.broadcast_player_update(row["id"], {"status_message": status})
             logger.info(f"NPC 상태 메시지 업데이트: {status}")
         else:
             logger.warning("NPC 프로필을 찾을 수 없습니다 (is_npc=True)")
@@ -7,7 +7,9 @@ from pydantic import BaseModel
 
 from api.deps import get_current_user
 from lib.supabase import get_supabase_admin
+from agent.cache import cache_stats
 from hobi.agent import get_hobi_agent, reset_agent
+from hobi.cache_events import knowledge_updated
 from rag.vector_store import embed_and_store_document, rebuild_all_embeddings, get_total_chunks
 from rag.config import get_settings, save_settings
 
@@ -212,10 +214,19 @@ async def update_npc_settings(body: SettingsRequest, current_user=Depends(get_cu
     # 모델이나 프롬프트 변경 시 에이전트 재생성
     if any(k in updates for k in ("chat_model", "chat_temperature", "system_prompt")):
         reset_agent()
+    # 검색 설정 변경 시 캐시된 문서 검색 결과 버림
+    if any(k in updates for k in ("chunk_size", "chunk_overlap", "embedding_model", "retrieval_k", "show_sources")):
+        knowledge_updated()
 
     return current
 
 
+@router.get("/tool-cache")
+async def get_tool_cache_stats(current_user=Depends(get_current_user)):
+    """에이전트 도구 결과 캐시 현황 (도구별 항목 수, 적중률)"""
+    return cache_stats()
+
+
 # ===== 문서 관리 (Supabase DB) =====
 
 
@@ -288,6 +299,7 @@ async def create_document(body: DocumentRequest, current_user=Depends(get_curren
 
     # 임베딩 생성 + 저장
     chunk_count = embed_and_store_document(doc_id, filename, body.content)
+    knowledge_updated()
 
     return {
         "filename": filename,
@@ -318,6 +330,7 @@ async def update_document(filename: str, body: DocumentRequest, current_user=Dep
 
     # 임베딩 재생성
     chunk_count = embed_and_store_document(doc_id, filename, body.content)
+    knowledge_updated()
 
     return {
         "filename": filename,
@@ -346,6 +359,7 @@ async def delete_document(filename: str, current_user=Depends(get_current_user))
     # 청크 먼저 삭제 → 문서 삭제 (ID 기준, 동명 문서 보호)
     supabase.table("knowledge_chunks").delete().eq("document_id", doc_id).execute()
     supabase.table("knowledge_documents").delete().eq("id", doc_id).execute()
+    knowledge_updated()
 
     total = get_total_chunks()
     return {
@@ -404,6 +418,7 @@ async def upload_document(file: UploadFile = File(...), current_user=Depends(get
         doc_id = result.data[0]["id"]
 
     chunk_count = embed_and_store_document(doc_id, file.filename, text)
+    knowledge_updated()
 
     return {
         "filename": file.filename,
@@ -419,6 +434,7 @@ async def upload_document(file: UploadFile = File(...), current_user=Depends(get
 async def rebuild_index(current_user=Depends(get_current_user)):
     """전체 임베딩 재빌드"""
     total = rebuild_all_embeddings()
+    knowledge_updated()
     return {"message": f"인덱스 재빌드 완료 ({total}개 청크)"}
 
 
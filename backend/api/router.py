@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 
 from api.deps import get_current_user
+from lib.auth import invalidate_profile
 from lib.supabase import get_supabase_client
 
 router = APIRouter(prefix="/api")
@@ -85,4 +86,9 @@ async def update_my_profile(
         .eq("id", current_user.id)
         .execute()
     )
+    invalidate_profile(current_user.id)
+    if "status_message" in update_data:
+        # 접속 중이면 나를 보고 있는 클라이언트에 바로 반영 (재접속 없이)
+        from ws.rooms import rooms
+        rooms.publish_player_update(current_user.id, {"status_message": update_data["status_message"]})
     return {"profile": result.data[0] if result.data else None}
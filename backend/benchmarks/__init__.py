@@ -0,0 +1,4 @@
+"""WebSocket/에이전트 성능 벤치마크 스크립트 모음.
+
+backend/ 디렉터리에서 ``python -m benchmarks.<모듈명>`` 으로 실행한다.
+"""
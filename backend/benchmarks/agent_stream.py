@@ -0,0 +1,116 @@
+"""에이전트 스트리밍 첫 토큰 시간(TTFT) — 기존 2단계(``chat`` → ``chat_stream``) vs 라운드당 스트리밍 한 번.
+
+LLM 은 첫 토큰까지 ``FIRST_TOKEN`` 초, 이후 토큰마다 ``PER_TOKEN`` 초가 걸리는 스크립트 LLM 이다.
+``chat()`` 은 응답 전체가 끝나야 돌아오고, 스트리밍 호출은 토큰이 나오는 대로 준다.
+
+- 도구 없는 답: 기존은 완성된 응답 전체를 기다린 뒤 한 번에, 지금은 첫 토큰부터 바로
+- 도구 한 번: 기존은 도구 결정 응답 → 도구 → 도구가 더 필요 없다는 응답(``chat``, 답 전체) → ``chat_stream`` 첫 토큰,
+  지금은 도구 결정 스트림 → 도구 → 다음 라운드 첫 토큰
+
+실행: ``cd backend && python -m benchmarks.agent_stream``
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncGenerator
+
+from agent import Agent, BaseLLM, BaseTool, Message, ToolResult, ToolSpec
+from agent.types import LLMResponse, LLMStreamChunk, ToolCall
+
+FIRST_TOKEN = 0.40
+PER_TOKEN = 0.02
+ANSWER_TOKENS = 60
+TOOL_CALL_TOKENS = 8  # 도구 호출 arguments 조각 수
+TOOL_DELAY = 0.15
+
+
+class ScriptedLLM(BaseLLM):
+    """``use_tool`` 이면 첫 라운드에 도구를 한 번 부르고, 도구 결과가 있으면 답한다."""
+
+    def __init__(self, use_tool: bool):
+        self.use_tool = use_tool
+
+    def _wants_tool(self, messages: list[Message]) -> bool:
+        return self.use_tool and not any(m.role == "tool" for m in messages)
+
+    async def chat(self, messages: list[Message], tools: list[ToolSpec] | None = None) -> LLMResponse:
+        if tools and self._wants_tool(messages):
+            await asyncio.sleep(FIRST_TOKEN + PER_TOKEN * TOOL_CALL_TOKENS)
+            return LLMResponse(tool_calls=[ToolCall(id="call-0", name="lookup", arguments={"q": "x"})])
+        await asyncio.sleep(FIRST_TOKEN + PER_TOKEN * ANSWER_TOKENS)
+        return LLMResponse(content="토큰" * ANSWER_TOKENS)
+
+    async def chat_stream(self, messages: list[Message]) -> AsyncGenerator[str, None]:
+        await asyncio.sleep(FIRST_TOKEN)
+        for _ in range(ANSWER_TOKENS):
+            yield "토큰"
+            await asyncio.sleep(PER_TOKEN)
+
+    async def chat_stream_with_tools(
+        self,
+        messages: list[Message],
+        tools: list[ToolSpec] | None = None,
+    ) -> AsyncGenerator[LLMStreamChunk, None]:
+        await asyncio.sleep(FIRST_TOKEN)
+        if tools and self._wants_tool(messages):
+            for _ in range(TOOL_CALL_TOKENS):
+                yield LLMStreamChunk(type="tool_call_delta", text="{}", name="lookup")
+                await asyncio.sleep(PER_TOKEN)
+            tool_call = ToolCall(id="call-0", name="lookup", arguments={"q": "x"})
+            yield LLMStreamChunk(type="tool_call", id="call-0", name="lookup", tool_call=tool_call)
+            return
+        for _ in range(ANSWER_TOKENS):
+            yield LLMStreamChunk(type="text", text="토큰")
+            await asyncio.sleep(PER_TOKEN)
+
+
+class SleepTool(BaseTool):
+    name = "lookup"
+
+    async def execute(self, **kwargs) -> ToolResult:
+        await asyncio.sleep(TOOL_DELAY)
+        return ToolResult(content="result")
+
+
+async def two_step_ttft(agent: Agent) -> float:
+    """기존 run_stream 흐름 — 도구 결정은 chat(), 도구를 썼으면 최종 답을 chat_stream() 으로."""
+    t0 = time.perf_counter()
+    messages = agent._build_messages("question", None)
+    tool_specs = [t.get_spec() for t in agent.tools.values()]
+    executed = False
+    while True:
+        response = await agent.llm.chat(messages, tools=tool_specs)
+        if not response.has_tool_calls:
+            break
+        executed = True
+        for tc, result in zip(response.tool_calls, await agent._execute_tools(response.tool_calls)):
+            messages.append(Message(role="tool", content=result, tool_call_id=tc.id, name=tc.name))
+    if not executed:
+        return time.perf_counter() - t0
+    async for _ in agent.llm.chat_stream(messages):
+        return time.perf_counter() - t0
+    return time.perf_counter() - t0
+
+
+async def single_pass_ttft(agent: Agent) -> float:
+    t0 = time.perf_counter()
+    async for event in agent.run_stream("question"):
+        if event.type == "token":
+            return time.perf_counter() - t0
+    return time.perf_counter() - t0
+
+
+def main():
+    print(f"first token {FIRST_TOKEN * 1000:.0f} ms, {ANSWER_TOKENS} tokens x {PER_TOKEN * 1000:.0f} ms, tool {TOOL_DELAY * 1000:.0f} ms")
+    print(f"{'case':>10} {'two-step ms':>12} {'single-pass ms':>15}")
+    for label, use_tool in (("no tool", False), ("one tool", True)):
+        agent = Agent(ScriptedLLM(use_tool), [SleepTool()], "system")
+        old = asyncio.run(two_step_ttft(agent)) * 1000
+        new = asyncio.run(single_pass_ttft(agent)) * 1000
+        print(f"{label:>10} {old:>12.0f} {new:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""에이전트 도구 라운드 지연 — 한 라운드의 도구 호출을 차례로 vs 동시에 실행.
+
+LLM 은 첫 라운드에 도구 호출 여러 개를 돌려주고 두 번째 라운드에 답하는 스크립트 LLM,
+도구는 정해진 시간만큼 기다리는 가짜 도구(rag_search / db_query / web_search 지연을 흉내)라서
+측정값은 ``Agent.run`` 의 도구 실행 오케스트레이션 비용 + 가장 느린 도구 시간이다.
+
+실행: ``cd backend && python -m benchmarks.agent_tools``
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncGenerator
+
+from agent import Agent, BaseLLM, BaseTool, Message, ToolResult, ToolSpec
+from agent.types import LLMResponse, ToolCall
+
+# (도구 이름, 지연 초)
+TOOLS = (("rag_search", 0.30), ("db_query", 0.12), ("web_search", 0.45))
+RUNS = 5
+
+
+class ScriptedLLM(BaseLLM):
+    """첫 호출에 모든 도구를 한 번씩 부르고, 도구 결과가 오면 답한다."""
+
+    def __init__(self, calls: list[ToolCall]):
+        self.calls = calls
+
+    async def chat(self, messages: list[Message], tools: list[ToolSpec] | None = None) -> LLMResponse:
+        if messages[-1].role == "user":
+            return LLMResponse(tool_calls=self.calls)
+        return LLMResponse(content="done")
+
+    async def chat_stream(self, messages: list[Message]) -> AsyncGenerator[str, None]:
+        yield "done"
+
+
+class SleepTool(BaseTool):
+    def __init__(self, name: str, delay: float, parallel_safe: bool = True):
+        self.name = name
+        self.delay = delay
+        self.parallel_safe = parallel_safe
+
+    async def execute(self, **kwargs) -> ToolResult:
+        await asyncio.sleep(self.delay)
+        return ToolResult(content=self.name)
+
+
+async def bench(max_concurrency: int, unsafe: str | None = None) -> float:
+    tools = [SleepTool(name, delay, parallel_safe=name != unsafe) for name, delay in TOOLS]
+    calls = [ToolCall(id=f"call-{i}", name=name, arguments={}) for i, (name, _) in enumerate(TOOLS)]
+    agent = Agent(ScriptedLLM(calls), tools, "system", max_concurrency=max_concurrency)
+    t0 = time.perf_counter()
+    for _ in range(RUNS):
+        result = await agent.run("question")
+        assert result["tool_calls"] == [name for name, _ in TOOLS]
+    return (time.perf_counter() - t0) / RUNS * 1000
+
+
+def main():
+    total = sum(delay for _, delay in TOOLS) * 1000
+    slowest = max(delay for _, delay in TOOLS) * 1000
+    print(f"tools: {', '.join(f'{n} {d * 1000:.0f} ms' for n, d in TOOLS)} (sum {total:.0f}, max {slowest:.0f})")
+    print(f"sequential (max_concurrency=1): {asyncio.run(bench(1)):7.1f} ms/round")
+    print(f"concurrent (max_concurrency=4): {asyncio.run(bench(4)):7.1f} ms/round")
+    print(f"concurrent, db_query not parallel_safe: {asyncio.run(bench(4, 'db_query')):7.1f} ms/round")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""워커 간 백플레인 벤치마크 — 인메모리 허브 vs Unix 소켓 브로커 (별도 프로세스).
+
+워커(ConnectionManager) 2개에 플레이어를 나눠 접속시키고
+워커 A 의 이동이 워커 B 클라이언트에 도착하기까지의 지연과 처리량을 측정한다.
+서로 다른 워커의 플레이어가 init/player_joined 로 서로를 보는지도 확인한다.
+
+실행: ``cd backend && python -m benchmarks.backplane``
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from ws.backplane import InMemoryBackplane, InMemoryHub, UnixSocketBackplane
+from ws.limits import UNLIMITED
+from ws.manager import ConnectionManager
+
+PLAYERS_PER_WORKER = 50
+LATENCY_MOVES = 2000
+GRID = (40, 20)
+
+
+class ProbeWebSocket:
+    """수신한 player_moved 수를 세고 도착을 알리는 가짜 WebSocket."""
+
+    def __init__(self):
+        self.messages: list[dict] = []
+        self.moved = 0
+        self.arrived = asyncio.Event()
+
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def send_text(self, data: str):
+        if data.startswith('{"type": "player_moved"'):
+            self.moved += 1
+            self.arrived.set()
+        else:
+            self.messages.append(json.loads(data))
+
+    async def send_bytes(self, data: bytes):
+        pass
+
+    async def close(self, code: int = 1000, reason: str = ""):
+        pass
+
+
+async def _connect_all(worker: ConnectionManager, prefix: str) -> dict[str, ProbeWebSocket]:
+    sockets = {}
+    for i in range(PLAYERS_PER_WORKER):
+        uid = f"{prefix}-{i}"
+        ws = ProbeWebSocket()
+        sockets[uid] = ws
+        await worker.connect(uid, {"id": uid, "name": uid}, ws, "token")
+    return sockets
+
+
+async def _measure(a: ConnectionManager, b: ConnectionManager) -> dict:
+    sockets_a = await _connect_all(a, "a")
+    sockets_b = await _connect_all(b, "b")
+    await asyncio.sleep(0.2)
+
+    # 가시성: B 의 마지막 접속자는 init 으로 A 의 플레이어를 모두 받아야 함
+    last_b = sockets_b[f"b-{PLAYERS_PER_WORKER - 1}"]
+    init = next(m for m in last_b.messages if m["type"] == "init")
+    sees_remote = sum(1 for uid in init["players"] if uid.startswith("a-"))
+
+    mover = "a-0"
+    probe = last_b
+    steps = ((1, 0), (-1, 0), (0, 1), (0, -1))
+    latencies = []
+    for i in range(LATENCY_MOVES):
+        pos = a.positions[mover]
+        for dx, dy in steps[i % 4:] + steps[:i % 4]:
+            gx, gy = pos["gridX"] + dx, pos["gridY"] + dy
+            if a.grid.is_free(gx, gy) and 1 <= gx < GRID[0] - 1 and 1 <= gy < GRID[1] - 1:
+                break
+        probe.arrived.clear()
+        before = probe.moved
+        t0 = time.perf_counter()
+        await a.apply_move(mover, gx, gy, "down")
+        if a.positions[mover]["gridX"] != gx or a.positions[mover]["gridY"] != gy:
+            continue
+        while probe.moved == before:
+            await probe.arrived.wait()
+            probe.arrived.clear()
+        latencies.append(time.perf_counter() - t0)
+
+    # 처리량: A 의 모든 플레이어가 한 칸씩 왕복 — B 의 위치 사본이 A 와 같아질 때까지
+    t0 = time.perf_counter()
+    count = 0
+    for rep in range(10):
+        dx = 1 if rep % 2 == 0 else -1
+        for uid in sockets_a:
+            pos = a.positions[uid]
+            gx = pos.x
+            await a.apply_move(uid, gx + dx, pos.y, "down")
+            if pos.x != gx:  # 위치 레코드는 제자리에서 갱신됨
+                count += 1
+    while any(b.positions.get(uid) != a.positions[uid] for uid in sockets_a):
+        await asyncio.sleep(0.0005)
+    elapsed = time.perf_counter() - t0
+
+    latencies.sort()
+    return {
+        "sees_remote": sees_remote,
+        "p50_us": statistics.median(latencies) * 1e6,
+        "p99_us": latencies[int(len(latencies) * 0.99)] * 1e6,
+        "moves_per_sec": count / elapsed,
+    }
+
+
+async def _in_memory() -> dict:
+    hub = InMemoryHub(*GRID)
+    a = ConnectionManager(*GRID, backplane=InMemoryBackplane(*GRID, hub=hub), limits=UNLIMITED)
+    b = ConnectionManager(*GRID, backplane=InMemoryBackplane(*GRID, hub=hub), limits=UNLIMITED)
+    try:
+        return await _measure(a, b)
+    finally:
+        await a.backplane.close()
+        await b.backplane.close()
+
+
+async def _unix_broker() -> dict:
+    path = os.path.join(tempfile.mkdtemp(), "cgtown-ws.sock")
+    broker = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "ws.broker",
+        "--path", path, "--width", str(GRID[0]), "--height", str(GRID[1]),
+    )
+    try:
+        for _ in range(100):
+            if os.path.exists(path):
+                break
+            await asyncio.sleep(0.05)
+        a = ConnectionManager(*GRID, backplane=UnixSocketBackplane(path), limits=UNLIMITED)
+        b = ConnectionManager(*GRID, backplane=UnixSocketBackplane(path), limits=UNLIMITED)
+        try:
+            return await _measure(a, b)
+        finally:
+            await a.backplane.close()
+            await b.backplane.close()
+    finally:
+        broker.terminate()
+        await broker.wait()
+
+
+def main():
+    print(f"{'backplane':>12} {'sees remote':>12} {'p50 us':>9} {'p99 us':>9} {'moves/s':>10}")
+    for label, run in (("in-memory", _in_memory), ("unix broker", _unix_broker)):
+        r = asyncio.run(run())
+        print(
+            f"{label:>12} {r['sees_remote']:>5}/{PLAYERS_PER_WORKER:<6} {r['p50_us']:>9.1f} "
+            f"{r['p99_us']:>9.1f} {r['moves_per_sec']:>10,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
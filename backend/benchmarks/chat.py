@@ -0,0 +1,80 @@
+"""근접 채팅 수신자 탐색 비용 — AOI 셀 색인 조회 vs 룸 전체 순회.
+
+룸 인원을 늘려 가며 무작위 플레이어가 채팅을 보낼 때 반경 안 수신자를 찾는 데 드는 시간을 잰다.
+"scan" 은 모든 플레이어 위치와 거리를 비교하는 경우(설계 문서 초안과 같은 방식)이다.
+
+실행: ``cd backend && python -m benchmarks.chat``
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import statistics
+import time
+
+from ws.limits import UNLIMITED
+from ws.manager import CHAT_RADIUS, ConnectionManager
+
+ROOM_SIZES = (30, 100, 300, 1000)
+SAMPLES = 2000
+
+
+class NullWebSocket:
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def send_text(self, data: str):
+        pass
+
+    async def send_bytes(self, data: bytes):
+        pass
+
+    async def close(self, code: int = 1000, reason: str = ""):
+        pass
+
+
+def _scan(manager: ConnectionManager, user_id: str, gx: int, gy: int) -> list[str]:
+    return [
+        uid for uid, pos in manager.positions.items()
+        if uid != user_id and abs(pos["gridX"] - gx) + abs(pos["gridY"] - gy) <= manager.chat_radius
+    ]
+
+
+async def _run(players: int) -> dict:
+    # 인원이 늘어도 밀도가 비슷하도록 (타일 4칸에 1명 꼴) 맵을 키움
+    side = max(12, int((players * 4 / 2) ** 0.5) + 2)
+    manager = ConnectionManager(
+        grid_width=side * 2, grid_height=side, limits=UNLIMITED, heartbeat_interval=0, chat_metric="manhattan"
+    )
+    for i in range(players):
+        await manager.connect(f"user-{i}", {"id": f"user-{i}"}, NullWebSocket(), "token")
+        await asyncio.sleep(0)  # 입장 알림 송신 큐를 비움
+    for conn in manager.active_connections.values():
+        conn.sender.stop()
+
+    rng = random.Random(0)
+    senders = [f"user-{rng.randrange(players)}" for _ in range(SAMPLES)]
+    result = {}
+    for label, find in (("scan", _scan), ("indexed", ConnectionManager.chat_recipients)):
+        timings, recipients = [], 0
+        for uid in senders:
+            pos = manager.positions[uid]
+            t0 = time.perf_counter()
+            found = find(manager, uid, pos["gridX"], pos["gridY"])
+            timings.append(time.perf_counter() - t0)
+            recipients += len(found)
+        result[label] = (statistics.median(timings) * 1e6, recipients / SAMPLES)
+    return result
+
+
+def main():
+    print(f"radius {CHAT_RADIUS} (manhattan)")
+    print(f"{'players':>8} {'scan us':>9} {'indexed us':>11} {'recipients':>11}")
+    for n in ROOM_SIZES:
+        r = asyncio.run(_run(n))
+        print(f"{n:>8} {r['scan'][0]:>9.1f} {r['indexed'][0]:>11.1f} {r['indexed'][1]:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,472 @@
+"""WebSocket 부하 테스트 — 실제 ``/ws`` 엔드포인트에 N개의 클라이언트를 붙여 측정.
+
+FastAPI 앱(ws 라우터 + 룸 레지스트리 라이프사이클)을 같은 프로세스의 별도 스레드에서
+uvicorn 으로 띄우고, 클라이언트는 진짜 WebSocket 으로 접속 → 무작위 걷기 → 종료한다.
+Supabase 인증은 스텁으로 대체한다 (임의 HS256 시크릿으로 토큰 발급, 프로필 조회는 고정값).
+
+측정 항목 (클라이언트 수별):
+- 입장 지연: 접속 시작 ~ init 수신
+- 이동 → 수신 지연 p50/p95/p99: 이동을 보낸 시각 ~ 다른 클라이언트가 그 위치를 받은 시각
+  (``--probes`` 명의 클라이언트만 수신 프레임을 파싱해서 표본을 모은다)
+- 수신 메시지/초, 바이트/초 (전체 클라이언트 합계)
+- 서버 CPU / 메시지: 서버 스레드의 CPU 시간 ÷ 클라이언트가 받은 프레임 수
+
+클라이언트도 같은 프로세스(GIL 공유)에서 돌기 때문에 지연 값에는 클라이언트 처리 시간이 섞인다.
+서버 CPU 는 서버 스레드만 따로 잰다.
+
+실행::
+
+    cd backend && python -m benchmarks.loadtest --clients 10,100,500,2000 --duration 10
+    python -m benchmarks.loadtest --clients 500 --tick-rate 20 --binary --view-radius 8
+    python -m benchmarks.loadtest --compare benchmarks/results/loadtest-20260101-120000.json
+
+결과는 ``benchmarks/results/loadtest-<시각>.json`` (또는 ``--out``) 에 저장되고,
+``--compare`` 로 이전 결과 파일과 나란히 출력할 수 있다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import resource
+import secrets
+import socket
+import threading
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from pathlib import Path
+
+import jwt
+import uvicorn
+from fastapi import FastAPI
+from websockets.asyncio.client import connect
+
+from lib.auth import JWT_AUDIENCE
+from ws import endpoint, protocol
+from ws.manager import DEFAULT_ROOM, GRID_HEIGHT, GRID_WIDTH
+from ws.rooms import RoomConfig, RoomRegistry
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+CLIENT_COUNTS = (10, 100, 500, 2000)
+DURATION = 10.0  # 측정 구간 (초)
+WARMUP = 1.0  # 전원 입장 후 측정 전 대기 (초)
+MOVES_PER_SEC = 2.0  # 클라이언트당 초당 이동
+DENSITY = 0.1  # 자동 격자 크기: 타일 대비 플레이어 비율
+PROBES = 50  # 수신 프레임을 파싱해 지연 표본을 모으는 클라이언트 수
+CONNECT_CONCURRENCY = 100  # 동시에 진행하는 접속 핸드셰이크 수
+
+_STEPS = {(0, 1): "down", (0, -1): "up", (1, 0): "right", (-1, 0): "left"}
+
+
+def _percentile(values: list[float], p: float) -> float | None:
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def _ms(value: float | None) -> float | None:
+    return None if value is None else round(value * 1000, 3)
+
+
+def _grid_for(clients: int) -> tuple[int, int]:
+    """플레이어 밀도가 DENSITY 가 되도록 2:1 격자 크기 (최소 기본 맵 크기)."""
+    width = math.ceil(math.sqrt(clients / DENSITY * 2))
+    return max(GRID_WIDTH, width), max(GRID_HEIGHT, width // 2)
+
+
+# ----------------------------------------------------------------------
+# 서버 (스텁 인증 + 별도 스레드의 uvicorn)
+# ----------------------------------------------------------------------
+
+
+def _stub_auth(secret: str) -> None:
+    """Supabase 없이 돌도록 — 로컬 HS256 검증 + 고정 프로필 + 위치 저장 비활성화."""
+    os.environ["SUPABASE_JWT_SECRET"] = secret
+    # SUPABASE_URL 이 없으면 PositionStore 는 저장을 건너뛴다
+    os.environ.pop("SUPABASE_URL", None)
+    endpoint.get_profile = lambda user_id: {"username": "", "status_message": ""}
+
+
+def _make_token(secret: str, user_id: str) -> str:
+    return jwt.encode(
+        {
+            "sub": user_id,
+            "email": f"{user_id}@loadtest.local",
+            "aud": JWT_AUDIENCE,
+            "exp": int(time.time()) + 3600,
+            "user_metadata": {"username": user_id},
+        },
+        secret,
+        algorithm="HS256",
+    )
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class ServerThread:
+    """ws 라우터만 올린 FastAPI 앱을 별도 스레드에서 실행.
+
+    ``main.app`` 은 RAG/LLM 의존성까지 불러오므로 WebSocket 경로에 필요한 부분만 조립한다.
+    엔드포인트 모듈의 ``rooms`` 를 실행마다 새 룸 레지스트리(룸 하나)로 바꿔 끼운다.
+    """
+
+    def __init__(self, registry: RoomRegistry):
+        self.manager = registry.rooms[registry.default].manager
+        self.port = _free_port()
+        endpoint.rooms = registry
+
+        @asynccontextmanager
+        async def lifespan(app: FastAPI):
+            await registry.start()
+            yield
+            await registry.shutdown()
+
+        app = FastAPI(lifespan=lifespan)
+        app.include_router(endpoint.router)
+        config = uvicorn.Config(
+            app, host="127.0.0.1", port=self.port, log_level="warning", backlog=4096,
+        )
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, name="loadtest-server", daemon=True)
+        self._clock: int | None = None
+
+    def start(self) -> None:
+        self.thread.start()
+        while not self.server.started:
+            if not self.thread.is_alive():
+                raise RuntimeError("server failed to start")
+            time.sleep(0.01)
+        self._clock = time.pthread_getcpuclockid(self.thread.ident)
+
+    def cpu_time(self) -> float:
+        """서버 스레드가 지금까지 쓴 CPU 시간 (초)."""
+        return time.clock_gettime(self._clock)
+
+    def stop(self) -> None:
+        self.server.should_exit = True
+        self.thread.join(timeout=30)
+
+    @property
+    def url(self) -> str:
+        return f"ws://127.0.0.1:{self.port}/ws"
+
+
+# ----------------------------------------------------------------------
+# 클라이언트
+# ----------------------------------------------------------------------
+
+
+class LoadRun:
+    """한 번의 실행(클라이언트 N명)에서 모든 클라이언트가 공유하는 측정 상태."""
+
+    def __init__(self, binary: bool):
+        self.binary = binary
+        self.measuring = False
+        # {user_id: (gridX, gridY, 보낸 시각)} — 각 클라이언트가 마지막으로 보낸 이동
+        self.sent: dict[str, tuple[int, int, float]] = {}
+        # 바이너리 프레임 해석용 {player_index: user_id}
+        self.index_to_uid: dict[int, str] = {}
+        self.join_latencies: list[float] = []
+        self.move_latencies: list[float] = []
+        self.moves_sent = 0
+        self.frames = 0
+        self.bytes = 0
+        self.corrections = 0
+        self.errors = 0
+
+    def observe(self, user_id: str, grid_x: int, grid_y: int, now: float) -> None:
+        sent = self.sent.get(user_id)
+        if sent is not None and sent[0] == grid_x and sent[1] == grid_y:
+            self.move_latencies.append(now - sent[2])
+
+
+class LoadClient:
+    def __init__(self, run: LoadRun, user_id: str, token: str, probe: bool):
+        self.run = run
+        self.user_id = user_id
+        self.token = token
+        self.probe = probe
+        self.ws = None
+        self.position: tuple[int, int] | None = None
+        self.bounds = (GRID_WIDTH, GRID_HEIGHT)
+
+    async def join(self, url: str, view_radius: int | None) -> None:
+        query = f"?token={self.token}"
+        if view_radius is not None:
+            query += f"&view_radius={view_radius}"
+        subprotocols = [protocol.SUBPROTOCOL_BINARY] if self.run.binary else None
+        t0 = time.perf_counter()
+        self.ws = await connect(
+            url + query, subprotocols=subprotocols, compression=None, max_size=None, ping_interval=None,
+        )
+        while True:
+            raw = await self.ws.recv()
+            if isinstance(raw, str) and raw.startswith('{"type": "init"'):
+                break
+        self.run.join_latencies.append(time.perf_counter() - t0)
+        init = json.loads(raw)
+        self.position = (init["your_position"]["gridX"], init["your_position"]["gridY"])
+        self.run.index_to_uid[init["your_index"]] = self.user_id
+
+    async def receive(self) -> None:
+        run = self.run
+        try:
+            async for raw in self.ws:
+                now = time.perf_counter()
+                if run.measuring:
+                    run.frames += 1
+                    run.bytes += len(raw)
+                if isinstance(raw, bytes):
+                    if self.probe and run.measuring:
+                        for idx, gx, gy, _ in protocol.decode_moves(raw):
+                            uid = run.index_to_uid.get(idx)
+                            if uid is not None:
+                                run.observe(uid, gx, gy, now)
+                    continue
+                if raw.startswith('{"type": "correction"'):
+                    pos = json.loads(raw)["position"]
+                    if pos is not None:
+                        self.position = (pos["gridX"], pos["gridY"])
+                    run.corrections += 1
+                    continue
+                if not (self.probe and run.measuring):
+                    continue
+                msg = json.loads(raw)
+                if msg["type"] == "player_moved":
+                    pos = msg["position"]
+                    run.observe(msg["user_id"], pos["gridX"], pos["gridY"], now)
+                elif msg["type"] == "tick":
+                    for uid, pos in msg["players"].items():
+                        run.observe(uid, pos["gridX"], pos["gridY"], now)
+        except Exception:
+            pass
+
+    async def walk(self, rate: float, stop: asyncio.Event) -> None:
+        interval = 1.0 / rate
+        await asyncio.sleep(random.random() * interval)
+        width, height = self.bounds
+        while not stop.is_set():
+            gx, gy = self.position
+            (dx, dy), direction = random.choice(list(_STEPS.items()))
+            nx, ny = gx + dx, gy + dy
+            if 0 < nx < width - 1 and 0 < ny < height - 1:
+                if self.run.binary:
+                    frame = protocol.encode_client_move(nx, ny, direction)
+                else:
+                    frame = json.dumps({"type": "move", "gridX": nx, "gridY": ny, "direction": direction})
+                self.run.sent[self.user_id] = (nx, ny, time.perf_counter())
+                try:
+                    await self.ws.send(frame)
+                except Exception:
+                    return
+                # 충돌로 거부되면 correction 이 원래 위치로 되돌린다
+                self.position = (nx, ny)
+                if self.run.measuring:
+                    self.run.moves_sent += 1
+            await asyncio.sleep(interval)
+
+
+# ----------------------------------------------------------------------
+# 실행
+# ----------------------------------------------------------------------
+
+
+async def _run_clients(
+    server: ServerThread,
+    clients: int,
+    grid: tuple[int, int],
+    args: argparse.Namespace,
+    secret: str,
+) -> dict:
+    run = LoadRun(args.binary)
+    loop = asyncio.get_running_loop()
+    members = [
+        LoadClient(run, f"load-{i}", _make_token(secret, f"load-{i}"), probe=i < args.probes)
+        for i in range(clients)
+    ]
+    for client in members:
+        client.bounds = grid
+
+    # 1) 입장
+    gate = asyncio.Semaphore(CONNECT_CONCURRENCY)
+    readers = []
+
+    async def join(client: LoadClient):
+        async with gate:
+            try:
+                await client.join(server.url, args.view_radius)
+            except Exception:
+                run.errors += 1
+                return
+        # 다른 클라이언트가 입장하는 동안에도 수신해야 서버 송신 큐가 넘치지 않음
+        readers.append(asyncio.create_task(client.receive()))
+
+    t0 = loop.time()
+    await asyncio.gather(*(join(c) for c in members))
+    join_elapsed = loop.time() - t0
+    joined = [c for c in members if c.position is not None]
+
+    # 2) 무작위 걷기 (워밍업 후 측정)
+    stop = asyncio.Event()
+    walkers = [asyncio.create_task(c.walk(args.rate, stop)) for c in joined]
+    await asyncio.sleep(WARMUP)
+
+    cpu0 = server.cpu_time()
+    process0 = time.process_time()
+    t0 = loop.time()
+    run.measuring = True
+    await asyncio.sleep(args.duration)
+    run.measuring = False
+    elapsed = loop.time() - t0
+    server_cpu = server.cpu_time() - cpu0
+    process_cpu = time.process_time() - process0
+
+    stop.set()
+    await asyncio.gather(*walkers)
+    sender_stats = server.manager.connection_metrics()
+    limit_stats = server.manager.limit_metrics()
+
+    # 3) 정상 종료 (1000 → 즉시 퇴장)
+    t0 = loop.time()
+    await asyncio.gather(*(c.ws.close() for c in joined), return_exceptions=True)
+    await asyncio.gather(*readers)
+    while server.manager.active_connections:
+        await asyncio.sleep(0.01)
+    leave_elapsed = loop.time() - t0
+
+    return {
+        "clients": clients,
+        "joined": len(joined),
+        "connect_errors": run.errors,
+        "grid": list(grid),
+        "join_total_s": round(join_elapsed, 3),
+        "join_ms": {
+            "p50": _ms(_percentile(run.join_latencies, 50)),
+            "p95": _ms(_percentile(run.join_latencies, 95)),
+            "p99": _ms(_percentile(run.join_latencies, 99)),
+            "max": _ms(max(run.join_latencies, default=None)),
+        },
+        "move_to_receive_ms": {
+            "samples": len(run.move_latencies),
+            "p50": _ms(_percentile(run.move_latencies, 50)),
+            "p95": _ms(_percentile(run.move_latencies, 95)),
+            "p99": _ms(_percentile(run.move_latencies, 99)),
+        },
+        "moves_per_sec": round(run.moves_sent / elapsed, 1),
+        "messages_per_sec": round(run.frames / elapsed, 1),
+        "bytes_per_sec": round(run.bytes / elapsed, 1),
+        "server_cpu_s": round(server_cpu, 4),
+        "server_cpu_util": round(server_cpu / elapsed, 3),
+        "server_cpu_us_per_message": round(server_cpu / run.frames * 1e6, 3) if run.frames else None,
+        "process_cpu_s": round(process_cpu, 4),
+        "corrections": run.corrections,
+        "rejected": limit_stats["rejected"],
+        "coalesced": sum(s["coalesced"] for s in sender_stats.values()),
+        "max_queue_depth": max((s["max_queue_depth"] for s in sender_stats.values()), default=0),
+        "leave_total_s": round(leave_elapsed, 3),
+    }
+
+
+def _run_once(clients: int, args: argparse.Namespace, secret: str) -> dict:
+    grid = tuple(args.grid) if args.grid else _grid_for(clients)
+    config = RoomConfig(DEFAULT_ROOM, grid_width=grid[0], grid_height=grid[1])
+    server = ServerThread(RoomRegistry([config], tick_rate=args.tick_rate))
+    server.start()
+    try:
+        return asyncio.run(_run_clients(server, clients, grid, args, secret))
+    finally:
+        server.stop()
+
+
+def _raise_fd_limit(clients: int) -> None:
+    # 클라이언트/서버 소켓이 한 프로세스에 모두 있으므로 2배 + 여유
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    needed = clients * 2 + 256
+    if soft < needed:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(needed, hard), hard))
+
+
+def _fmt(value, spec: str) -> str:
+    return "-" if value is None else format(value, spec)
+
+
+def _print_table(label: str, runs: list[dict]) -> None:
+    print(label)
+    print(
+        f"{'clients':>7} {'join p50':>9} {'join p99':>9} {'move p50':>9} {'move p95':>9} {'move p99':>9} "
+        f"{'msgs/s':>10} {'KB/s':>9} {'cpu us/msg':>11} {'cpu util':>9}"
+    )
+    for r in runs:
+        join, move = r["join_ms"], r["move_to_receive_ms"]
+        print(
+            f"{r['clients']:>7} {_fmt(join['p50'], '9.2f')} {_fmt(join['p99'], '9.2f')} "
+            f"{_fmt(move['p50'], '9.2f')} {_fmt(move['p95'], '9.2f')} {_fmt(move['p99'], '9.2f')} "
+            f"{r['messages_per_sec']:>10,.0f} {r['bytes_per_sec'] / 1024:>9,.1f} "
+            f"{_fmt(r['server_cpu_us_per_message'], '11.2f')} {r['server_cpu_util']:>9.2f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CG Town /ws 부하 테스트")
+    parser.add_argument("--clients", default=",".join(map(str, CLIENT_COUNTS)),
+                        help="쉼표로 구분한 클라이언트 수 목록 (예: 10,100,500,2000)")
+    parser.add_argument("--duration", type=float, default=DURATION, help="측정 구간 (초)")
+    parser.add_argument("--rate", type=float, default=MOVES_PER_SEC, help="클라이언트당 초당 이동")
+    parser.add_argument("--probes", type=int, default=PROBES, help="지연 표본을 모으는 클라이언트 수")
+    parser.add_argument("--view-radius", type=int, default=None, help="클라이언트 시야 반경 (없으면 맵 전체)")
+    parser.add_argument("--tick-rate", type=float, default=0.0, help="틱 모드 주기 (0 이면 즉시 전송)")
+    parser.add_argument("--binary", action="store_true", help="바이너리 서브프로토콜 사용")
+    parser.add_argument("--grid", type=lambda s: tuple(int(v) for v in s.split("x")), default=None,
+                        help="격자 크기 WxH (없으면 클라이언트 수에 맞춰 자동)")
+    parser.add_argument("--out", type=Path, default=None, help="결과 JSON 경로")
+    parser.add_argument("--compare", type=Path, default=None, help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+
+    counts = [int(c) for c in args.clients.split(",") if c]
+    secret = secrets.token_hex(32)
+    _stub_auth(secret)
+    _raise_fd_limit(max(counts))
+
+    runs = []
+    for clients in counts:
+        runs.append(_run_once(clients, args, secret))
+        _print_table(f"[{clients} clients]", runs[-1:])
+
+    result = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "config": {
+            "duration": args.duration,
+            "rate": args.rate,
+            "probes": args.probes,
+            "view_radius": args.view_radius,
+            "tick_rate": args.tick_rate,
+            "binary": args.binary,
+            "cpu_count": os.cpu_count(),
+        },
+        "runs": runs,
+    }
+    out = args.out or RESULTS_DIR / f"loadtest-{datetime.now():%Y%m%d-%H%M%S}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    print()
+    _print_table(f"this run ({out})", runs)
+    if args.compare:
+        previous = json.loads(args.compare.read_text(encoding="utf-8"))
+        print()
+        _print_table(f"previous ({args.compare}, {previous['timestamp']})", previous["runs"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""플레이어 상태 레코드의 메모리 / 이동당 할당 — dict 레코드 vs ``__slots__`` 레코드.
+
+- 세션당 바이트: 접속자 N명의 연결 정보 + 위치 + user_info 를 만들었을 때 늘어난 메모리 / N.
+  "dict" 는 이전 방식(연결 dict + 위치 dict), "slots" 는 ``Session`` + ``Position`` + 고정된 user_info.
+  WebSocket / 송신 큐 / 수신 제한 객체는 양쪽이 같으므로 공유 자리표시자로 둔다.
+- 이동당 할당: 이동 한 번의 상태 갱신 경로(백플레인 권위 상태, 중계 이벤트, positions,
+  player_moved 메시지)가 잡는 임시 메모리(tracemalloc peak)와 남기는 메모리.
+  "dict" 는 이동마다 위치 dict 를 새로 만들고 중계 이벤트를 항상 만드는 이전 경로,
+  "slots" 는 레코드를 제자리에서 갱신하고 다른 워커가 없으면 이벤트를 만들지 않는 현재 경로이다.
+  참고로 실제 ``ConnectionManager.apply_move`` (관찰자 없음) 의 값도 함께 잰다.
+
+실행: ``cd backend && python -m benchmarks.memory``
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import secrets
+import time
+import tracemalloc
+
+from ws.limits import UNLIMITED
+from ws.manager import ConnectionManager
+from ws.session import Position, Session
+
+SESSIONS = 1000
+MOVES = 5000
+_PLACEHOLDER = object()
+
+
+class NullWebSocket:
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def send_text(self, data: str):
+        pass
+
+    async def send_bytes(self, data: bytes):
+        pass
+
+    async def close(self, code: int = 1000, reason: str = ""):
+        pass
+
+
+def _user_info(i: int) -> dict:
+    uid = f"user-{i}"
+    return {
+        "id": uid,
+        "email": f"{uid}@cginside.co.kr",
+        "email_prefix": uid,
+        "name": f"직원 {i}",
+        "status_message": "",
+    }
+
+
+def _dict_session(i: int) -> tuple[dict, dict]:
+    conn = {
+        "ws": _PLACEHOLDER,
+        "sender": _PLACEHOLDER,
+        "user_info": _user_info(i),
+        "token": "token",
+        "binary": False,
+        "resume_token": secrets.token_urlsafe(24),
+        "expiry": None,
+        "limiter": _PLACEHOLDER,
+        "last_seen": time.monotonic(),
+        "view_radius": None,
+    }
+    return conn, {"gridX": i % 24, "gridY": i // 24, "direction": "down"}
+
+
+def _slots_session(i: int) -> tuple[Session, Position]:
+    session = Session(
+        _PLACEHOLDER,
+        _PLACEHOLDER,
+        _user_info(i),
+        "token",
+        _PLACEHOLDER,
+        resume_token=secrets.token_urlsafe(24),
+        last_seen=time.monotonic(),
+    )
+    session.handle = i
+    return session, Position(i % 24, i // 24)
+
+
+def session_bytes(factory) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    sessions = {f"user-{i}": factory(i) for i in range(SESSIONS)}
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(sessions) == SESSIONS
+    return (after - before) / SESSIONS
+
+
+def _dict_move(state: dict, positions: dict, uid: str, gx: int, gy: int, direction: str) -> str:
+    position = {"gridX": gx, "gridY": gy, "direction": direction}
+    state[uid]["position"] = position
+    event = {"type": "move", "user_id": uid, "position": position}
+    positions[uid] = position
+    del event  # 다른 워커가 없어도 만들어지던 중계 이벤트
+    return json.dumps({"type": "player_moved", "user_id": uid, "position": position})
+
+
+def _slots_move(state: dict, positions: dict, uid: str, gx: int, gy: int, direction: str) -> str:
+    stored = state[uid]["position"]
+    stored["gridX"] = gx
+    stored["gridY"] = gy
+    stored["direction"] = direction
+    position = positions[uid]
+    position.set(gx, gy, direction)
+    return f'{{"type": "player_moved", "user_id": {json.dumps(uid)}, "position": {position.json()}}}'
+
+
+def move_allocations(move, make_position) -> dict:
+    uid = "user-0"
+    state = {uid: {"position": {"gridX": 0, "gridY": 0, "direction": "down"}}}
+    positions = {uid: make_position()}
+    tracemalloc.start()
+    peaks, retained = [], 0
+    for n in range(MOVES):
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        move(state, positions, uid, n % 2, 0, "right")
+        current, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - before)
+        retained += current - before
+    tracemalloc.stop()
+    # 시간은 tracemalloc 없이 따로
+    t0 = time.perf_counter()
+    for n in range(MOVES):
+        move(state, positions, uid, n % 2, 0, "right")
+    elapsed = time.perf_counter() - t0
+    return {
+        "peak_bytes": sum(peaks) / MOVES,
+        "retained_bytes": retained / MOVES,
+        "ns": elapsed / MOVES * 1e9,
+    }
+
+
+async def manager_move_allocations() -> dict:
+    manager = ConnectionManager(grid_width=24, grid_height=12, limits=UNLIMITED, heartbeat_interval=0)
+    await manager.connect("user-0", _user_info(0), NullWebSocket(), "token")
+    pos = manager.positions["user-0"]
+    x0 = pos.x
+    tracemalloc.start()
+    peaks = []
+    for n in range(MOVES):
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        await manager.apply_move("user-0", x0 + (1 if pos.x == x0 else 0), pos.y, "right")
+        peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    tracemalloc.stop()
+    manager.active_connections["user-0"].sender.stop()
+    return {"peak_bytes": sum(peaks) / MOVES}
+
+
+def main():
+    print(f"{'records':>8} {'bytes/session':>14}")
+    for label, factory in (("dict", _dict_session), ("slots", _slots_session)):
+        print(f"{label:>8} {session_bytes(factory):>14.0f}")
+    print()
+    print(f"{'records':>8} {'peak B/move':>12} {'retained B/move':>16} {'ns/move':>9}")
+    for label, move, make in (
+        ("dict", _dict_move, lambda: {"gridX": 0, "gridY": 0, "direction": "down"}),
+        ("slots", _slots_move, lambda: Position(0, 0)),
+    ):
+        r = move_allocations(move, make)
+        print(f"{label:>8} {r['peak_bytes']:>12.0f} {r['retained_bytes']:>16.1f} {r['ns']:>9.0f}")
+    r = asyncio.run(manager_move_allocations())
+    print(f"apply_move (no observers): peak {r['peak_bytes']:.0f} B/move")
+
+
+if __name__ == "__main__":
+    main()
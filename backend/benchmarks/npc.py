@@ -0,0 +1,117 @@
+"""서버 시뮬레이션 NPC 비용 — NPC 틱 하나가 이벤트 루프를 얼마나 쓰는지.
+
+- step: ``NpcSimulation.step`` 한 번 (wander 3/4 + route 1/4, 벽 10%, 플레이어 점유 포함)
+- tick: ``ConnectionManager.npc_tick`` 한 번 — step + 관찰자별 시야 필터 + ``npc_moves`` 메시지 조립 + 송신 큐에 넣기
+  (플레이어 절반은 맵 전체 시야, 절반은 모바일처럼 ``VIEW_RADIUS`` 타일 시야)
+
+플레이어 이동 처리와 같은 이벤트 루프에서 돌기 때문에 틱이 짧아야 한다. 목표는 NPC 500명까지 틱 1 ms 안팎
+(이 트리 측정: 100명 0.7 ms, 500명 1.0 ms, 1000명 1.4~1.6 ms — 1000명이면 4 Hz 에서 루프 시간의 약 0.6%).
+
+실행: ``cd backend && python -m benchmarks.npc``
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+
+from ws.collision import CollisionMap
+from ws.limits import UNLIMITED
+from ws.manager import ConnectionManager
+from ws.npc import NpcSimulation, NpcSpec
+
+GRID = (96, 48)
+NPC_COUNTS = (100, 300, 500, 1000)
+PLAYERS = 50
+VIEW_RADIUS = 12
+TICKS = 500
+WALL_RATIO = 0.1
+
+
+class NullWebSocket:
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def send_text(self, data: str):
+        pass
+
+    async def send_bytes(self, data: bytes):
+        pass
+
+    async def close(self, code: int = 1000, reason: str = ""):
+        pass
+
+
+def _walls() -> CollisionMap:
+    rng = random.Random(7)
+    width, height = GRID
+    tiles = [(x, y) for x in range(width) for y in range(height)]
+    return CollisionMap(width, height, rng.sample(tiles, int(len(tiles) * WALL_RATIO)))
+
+
+def _specs(count: int) -> list[NpcSpec]:
+    rng = random.Random(count)
+    width, height = GRID
+    routes = [
+        NpcSpec(
+            f"route-{i}",
+            route=tuple((rng.randrange(width), rng.randrange(height), 1.0) for _ in range(3)),
+        )
+        for i in range(count // 4)
+    ]
+    return [NpcSpec("wander", count=count - len(routes)), *routes]
+
+
+def bench_step(count: int, walls: CollisionMap) -> tuple[float, float, float]:
+    """(평균 ms, 최대 ms, 틱당 움직인 NPC 수)."""
+    sim = NpcSimulation(*GRID, _specs(count), seed=1)
+    sim.set_walls(walls)
+    occupied = random.Random(3).sample(range(GRID[0] * GRID[1]), PLAYERS)
+    sim.place(occupied)
+    sim.step(occupied)  # 워밍업
+    moved = 0
+    t0 = time.perf_counter()
+    for _ in range(TICKS):
+        moved += len(sim.step(occupied))
+    elapsed = (time.perf_counter() - t0) / TICKS * 1000
+    return elapsed, sim.max_step_ms, moved / TICKS
+
+
+async def bench_tick(count: int, walls: CollisionMap) -> float:
+    manager = ConnectionManager(
+        *GRID,
+        limits=UNLIMITED,
+        heartbeat_interval=0,
+        npcs=NpcSimulation(*GRID, _specs(count), seed=1),
+    )
+    manager.set_collision(walls)
+    for n in range(PLAYERS):
+        radius = VIEW_RADIUS if n % 2 else None
+        await manager.connect(f"user-{n}", {"id": f"user-{n}"}, NullWebSocket(), "token", view_radius=radius)
+    # 틱 루프 대신 직접 호출
+    manager._npc_task.cancel()
+    elapsed = 0.0
+    for _ in range(TICKS):
+        t0 = time.perf_counter()
+        manager.npc_tick()
+        elapsed += time.perf_counter() - t0
+        await asyncio.sleep(0)  # 송신 태스크가 큐를 비우도록 (측정에서는 제외)
+    for conn in manager.active_connections.values():
+        conn.sender.stop()
+    manager.stop()
+    return elapsed / TICKS * 1000
+
+
+def main():
+    walls = _walls()
+    print(f"grid {GRID[0]}x{GRID[1]}, walls {walls.count()}, players {PLAYERS}, {TICKS} ticks")
+    print(f"{'npcs':>6} {'step ms':>8} {'max ms':>7} {'moved':>6} {'tick ms':>8}")
+    for count in NPC_COUNTS:
+        step, worst, moved = bench_step(count, walls)
+        tick = asyncio.run(bench_tick(count, walls))
+        print(f"{count:>6} {step:>8.3f} {worst:>7.3f} {moved:>6.0f} {tick:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
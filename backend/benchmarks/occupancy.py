@@ -0,0 +1,122 @@
+"""타일 점유 인덱스 마이크로 벤치마크 — 이동 처리량(moves/sec) 비교.
+
+기존 방식(positions 전체 스캔)과 OccupancyGrid 방식의 충돌 검사 + 이동,
+그리고 동시 입장(join storm) 시 스폰 위치 탐색 비용을 30 / 300 / 3000명 기준으로 측정한다.
+브로드캐스트/직렬화 비용은 제외하고 충돌 처리 경로만 측정한다.
+
+실행: ``cd backend && python -m benchmarks.occupancy``
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import time
+
+from ws.manager import ConnectionManager
+from ws.session import Position
+
+PLAYER_COUNTS = (30, 300, 3000)
+MOVES = 20_000
+# 격자 밀도 (플레이어 수 / 스폰 가능 타일 수)
+DENSITY = 0.25
+
+_STEPS = ((0, 1), (0, -1), (1, 0), (-1, 0))
+
+
+def _grid_size(players: int) -> tuple[int, int]:
+    """플레이어 수에 맞춰 2:1 비율 격자 크기를 계산 (기본 24x12 이상)."""
+    tiles = players / DENSITY
+    height = max(12, math.ceil(math.sqrt(tiles / 2)) + 2)
+    return height * 2, height
+
+
+def _legacy_move(positions: dict, user_id: str, gx: int, gy: int) -> bool:
+    """기존 handle_move 의 충돌 검사 (전체 스캔)."""
+    for uid, pos in positions.items():
+        if uid != user_id and pos["gridX"] == gx and pos["gridY"] == gy:
+            return False
+    positions[user_id] = {"gridX": gx, "gridY": gy, "direction": "down"}
+    return True
+
+
+def _legacy_spawn(positions: dict, width: int, height: int) -> dict:
+    """기존 _find_spawn_position (매번 occupied 집합 재구성)."""
+    occupied = {(p["gridX"], p["gridY"]) for p in positions.values()}
+    for _ in range(200):
+        gx = random.randint(1, width - 2)
+        gy = random.randint(1, height - 2)
+        if (gx, gy) not in occupied:
+            return {"gridX": gx, "gridY": gy, "direction": "down"}
+    return {"gridX": 1, "gridY": 1, "direction": "down"}
+
+
+def _random_moves(manager: ConnectionManager, uids: list[str], count: int) -> list[tuple]:
+    rng = random.Random(42)
+    moves = []
+    for _ in range(count):
+        uid = rng.choice(uids)
+        pos = manager.positions[uid]
+        dx, dy = rng.choice(_STEPS)
+        moves.append((uid, pos["gridX"] + dx, pos["gridY"] + dy))
+    return moves
+
+
+def bench(players: int) -> dict:
+    width, height = _grid_size(players)
+    manager = ConnectionManager(grid_width=width, grid_height=height)
+
+    # 스폰 (join storm)
+    uids = [f"user-{i}" for i in range(players)]
+    t0 = time.perf_counter()
+    for uid in uids:
+        gx, gy = manager.grid.random_free()
+        manager.grid.move(uid, gx, gy)
+        manager.positions[uid] = Position(gx, gy)
+    grid_spawn = time.perf_counter() - t0
+
+    legacy_positions: dict = {}
+    t0 = time.perf_counter()
+    for uid in uids:
+        legacy_positions[uid] = _legacy_spawn(legacy_positions, width, height)
+    legacy_spawn = time.perf_counter() - t0
+
+    moves = _random_moves(manager, uids, MOVES)
+    legacy_positions = {uid: dict(pos) for uid, pos in manager.positions.items()}
+
+    # 이동 — 기존 전체 스캔
+    t0 = time.perf_counter()
+    for uid, gx, gy in moves:
+        _legacy_move(legacy_positions, uid, gx, gy)
+    legacy_elapsed = time.perf_counter() - t0
+
+    # 이동 — OccupancyGrid
+    t0 = time.perf_counter()
+    for uid, gx, gy in moves:
+        if manager.grid.move(uid, gx, gy):
+            manager.positions[uid].set(gx, gy, "down")
+    grid_elapsed = time.perf_counter() - t0
+
+    return {
+        "players": players,
+        "grid": f"{width}x{height}",
+        "legacy_moves_per_sec": MOVES / legacy_elapsed,
+        "grid_moves_per_sec": MOVES / grid_elapsed,
+        "legacy_spawn_ms": legacy_spawn * 1000,
+        "grid_spawn_ms": grid_spawn * 1000,
+    }
+
+
+def main():
+    print(f"{'players':>8} {'grid':>9} {'legacy mv/s':>14} {'grid mv/s':>14} {'legacy join':>12} {'grid join':>11}")
+    for n in PLAYER_COUNTS:
+        r = bench(n)
+        print(
+            f"{r['players']:>8} {r['grid']:>9} "
+            f"{r['legacy_moves_per_sec']:>14,.0f} {r['grid_moves_per_sec']:>14,.0f} "
+            f"{r['legacy_spawn_ms']:>10.1f}ms {r['grid_spawn_ms']:>9.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
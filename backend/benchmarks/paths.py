@@ -0,0 +1,93 @@
+"""move_to 비용 — 한 칸씩 move 를 보낼 때와 경로를 한 번 알릴 때의 전송 프레임 수 + 경로 계획 시간.
+
+룸에 N명이 있고 한 명이 사무실을 가로질러(약 20칸) 걸어갈 때 관찰자들에게 나가는 프레임 수를 센다.
+경로 계획 시간은 목적지 거리장이 캐시에 없을 때(cold)와 있을 때(cached)를 나눠 잰다.
+
+실행: ``cd backend && python -m benchmarks.paths``
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import time
+
+from ws.limits import UNLIMITED
+from ws.manager import ConnectionManager
+
+ROOM_SIZES = (10, 30, 100)
+SAMPLES = 200
+
+
+class CountingWebSocket:
+    frames = 0
+
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def send_text(self, data: str):
+        CountingWebSocket.frames += 1
+
+    async def send_bytes(self, data: bytes):
+        CountingWebSocket.frames += 1
+
+    async def close(self, code: int = 1000, reason: str = ""):
+        pass
+
+
+async def _room(players: int) -> ConnectionManager:
+    manager = ConnectionManager(48, 24, limits=UNLIMITED, heartbeat_interval=0, path_step=0.001)
+    await manager.connect("walker", {"id": "walker"}, CountingWebSocket(), "token", {"gridX": 2, "gridY": 12, "direction": "right"})
+    for i in range(players - 1):
+        await manager.connect(f"user-{i}", {"id": f"user-{i}"}, CountingWebSocket(), "token")
+        await asyncio.sleep(0)
+    await asyncio.sleep(0.01)
+    return manager
+
+
+async def _frames(players: int, move_to: bool) -> int:
+    manager = await _room(players)
+    CountingWebSocket.frames = 0
+    if move_to:
+        await manager.handle_move_to("walker", {"gridX": 22, "gridY": 12})
+        while manager._walks:
+            await asyncio.sleep(0.005)
+    else:
+        path = manager._plan_path("walker", manager.positions["walker"], (22, 12)) or []
+        for gx, gy in path:
+            await manager.apply_move("walker", gx, gy, "right")
+            await asyncio.sleep(0.001)  # 클라이언트가 칸마다 보내는 간격
+    await asyncio.sleep(0.05)
+    manager.stop()
+    return CountingWebSocket.frames
+
+
+def _plan_times() -> tuple[float, float]:
+    manager = ConnectionManager(48, 24, limits=UNLIMITED, heartbeat_interval=0)
+    planner = manager.planner
+    no_one = lambda idx: False  # noqa: E731
+    cold, cached = [], []
+    for i in range(SAMPLES):
+        goal = (i % 46 + 1, i % 22 + 1)
+        planner._fields.clear()
+        t0 = time.perf_counter()
+        planner.plan((0, 0), goal, no_one)
+        cold.append(time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        planner.plan((47, 23), goal, no_one)
+        cached.append(time.perf_counter() - t0)
+    return statistics.median(cold) * 1e6, statistics.median(cached) * 1e6
+
+
+def main():
+    print(f"{'players':>8} {'per-tile frames':>16} {'move_to frames':>15}")
+    for n in ROOM_SIZES:
+        per_tile = asyncio.run(_frames(n, move_to=False))
+        path = asyncio.run(_frames(n, move_to=True))
+        print(f"{n:>8} {per_tile:>16} {path:>15}")
+    cold, cached = _plan_times()
+    print(f"plan 48x24: cold {cold:.1f} us, cached field {cached:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
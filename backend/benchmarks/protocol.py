@@ -0,0 +1,78 @@
+"""JSON vs 바이너리(cgtown.bin.v1) 위치 프로토콜 비교 벤치마크.
+
+이동 메시지 1건 / 틱 프레임(N명) 기준으로 전송 바이트와 인코딩·디코딩 비용을 측정한다.
+
+실행: ``cd backend && python -m benchmarks.protocol``
+"""
+
+from __future__ import annotations
+
+import json
+import timeit
+import uuid
+
+from ws import protocol
+
+ITERATIONS = 50_000
+TICK_PLAYERS = (1, 10, 30, 100)
+
+
+def _json_move(user_id: str, position: dict) -> str:
+    return json.dumps({"type": "player_moved", "user_id": user_id, "position": position})
+
+
+def _binary_move(index: int, position: dict) -> bytes:
+    return protocol.encode_moves([protocol.encode_move_record(index, position)])
+
+
+def _json_tick(players: dict) -> str:
+    fragments = [
+        f"{json.dumps(uid)}:{json.dumps(pos, separators=(',', ':'))}" for uid, pos in players.items()
+    ]
+    return f'{{"type":"tick","seq":1,"players":{{{",".join(fragments)}}}}}'
+
+
+def _binary_tick(indexed: list[tuple[int, dict]]) -> bytes:
+    return protocol.encode_moves([protocol.encode_move_record(i, pos) for i, pos in indexed])
+
+
+def _per_call_us(fn, number: int = ITERATIONS) -> float:
+    return timeit.timeit(fn, number=number) / number * 1e6
+
+
+def main():
+    user_id = str(uuid.uuid4())
+    position = {"gridX": 17, "gridY": 9, "direction": "left"}
+
+    text = _json_move(user_id, position)
+    data = _binary_move(3, position)
+    client_text = json.dumps({"type": "move", **position})
+    client_data = protocol.encode_client_move(17, 9, "left")
+
+    print("== 이동 1건 ==")
+    print(f"{'':>22} {'JSON':>10} {'binary':>10}")
+    print(f"{'server→client bytes':>22} {len(text.encode()):>10} {len(data):>10}")
+    print(f"{'client→server bytes':>22} {len(client_text.encode()):>10} {len(client_data):>10}")
+    print(f"{'encode us':>22} {_per_call_us(lambda: _json_move(user_id, position)):>10.2f} "
+          f"{_per_call_us(lambda: _binary_move(3, position)):>10.2f}")
+    print(f"{'decode(recv) us':>22} {_per_call_us(lambda: json.loads(client_text)):>10.2f} "
+          f"{_per_call_us(lambda: protocol.decode_client_move(client_data)):>10.2f}")
+
+    print()
+    print("== 틱 프레임 ==")
+    print(f"{'players':>8} {'JSON B':>8} {'bin B':>8} {'JSON us':>9} {'bin us':>9}")
+    for n in TICK_PLAYERS:
+        players = {
+            str(uuid.uuid4()): {"gridX": i % 24, "gridY": i % 12, "direction": "down"} for i in range(n)
+        }
+        indexed = list(enumerate(players.values()))
+        number = max(1000, ITERATIONS // n)
+        print(
+            f"{n:>8} {len(_json_tick(players).encode()):>8} {len(_binary_tick(indexed)):>8} "
+            f"{_per_call_us(lambda: _json_tick(players), number):>9.2f} "
+            f"{_per_call_us(lambda: _binary_tick(indexed), number):>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""룸 격리 벤치마크 — 붐비는 룸이 조용한 룸의 이동 처리 지연을 얼마나 늘리는지.
+
+붐비는 룸에 이동 명령을 한꺼번에 쌓아 둔 상태에서 조용한 룸 플레이어의 이동이
+처리되기까지 걸린 시간을 잰다. 비교 대상 "shared" 는 두 룸의 명령이 한 워커 큐를
+공유하는 경우(룸 워커 분리 전과 같은 순서)이다.
+
+실행: ``cd backend && python -m benchmarks.rooms``
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import time
+
+from ws.limits import UNLIMITED
+from ws.position_snapshot import PositionSnapshot
+from ws.rooms import RoomConfig, RoomRegistry
+
+BUSY_PLAYERS = 50
+BURST_MOVES = (100, 500, 2000)  # 붐비는 룸에 쌓이는 이동 명령 수
+SAMPLES = 5
+
+
+class NullWebSocket:
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def send_text(self, data: str):
+        pass
+
+    async def send_bytes(self, data: bytes):
+        pass
+
+    async def close(self, code: int = 1000, reason: str = ""):
+        pass
+
+
+async def _run(burst: int, shared: bool) -> float:
+    registry = RoomRegistry(
+        [RoomConfig("busy", grid_width=48, grid_height=24), RoomConfig("quiet", grid_width=16, grid_height=8)],
+        snapshot=PositionSnapshot(""),  # 벤치마크 플레이어를 로컬 스냅샷/이동 로그에 남기지 않음
+        move_log_dir="",
+        limits=UNLIMITED,
+        heartbeat_interval=0,
+    )
+    await registry.start()
+    busy, quiet = registry.rooms["busy"], registry.rooms["quiet"]
+    for i in range(BUSY_PLAYERS):
+        await registry.connect(f"busy-{i}", {"id": f"busy-{i}"}, NullWebSocket(), "token", "busy")
+    await registry.connect("quiet-0", {"id": "quiet-0"}, NullWebSocket(), "token", "quiet")
+
+    latencies = []
+    for sample in range(SAMPLES):
+        for n in range(burst):
+            uid = f"busy-{n % BUSY_PLAYERS}"
+            pos = busy.manager.positions[uid]
+            dx = 1 if (n // BUSY_PLAYERS + sample) % 2 == 0 else -1
+            busy.submit(busy.manager.handle_move, uid, {
+                "gridX": pos["gridX"] + dx, "gridY": pos["gridY"], "direction": "right",
+            })
+        done = asyncio.Event()
+
+        async def quiet_move(t0: float = time.perf_counter()):
+            latencies.append(time.perf_counter() - t0)
+            done.set()
+
+        (busy if shared else quiet).submit(quiet_move)
+        await done.wait()
+        # 다음 표본 전에 붐비는 룸 큐를 비움
+        while busy._queue.qsize():
+            await asyncio.sleep(0.001)
+
+    await registry.shutdown()
+    return statistics.median(latencies) * 1000
+
+
+def main():
+    print(f"{'burst':>7} {'shared ms':>10} {'per-room ms':>12}")
+    for burst in BURST_MOVES:
+        shared = asyncio.run(_run(burst, shared=True))
+        per_room = asyncio.run(_run(burst, shared=False))
+        print(f"{burst:>7} {shared:>10.2f} {per_room:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""init 스냅샷 조립 비용 — 플레이어별 JSON 조각 캐시 vs 매번 전체 직렬화.
+
+방에 N명이 있고 모두가 한 번씩 움직인 상태에서 30명이 연달아 재접속(아침 9시 상황)할 때
+init 메시지 하나를 만드는 데 드는 시간을 잰다. "uncached" 는 매 입장마다 모든 조각을
+버리고 다시 인코딩하는 경우(이전 방식과 같은 비용)이다.
+
+실행: ``cd backend && python -m benchmarks.snapshot``
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import time
+
+from ws.limits import UNLIMITED
+from ws.manager import ConnectionManager
+
+ROOM_SIZES = (30, 100, 300, 1000)
+RECONNECTS = 30
+
+
+class NullWebSocket:
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def send_text(self, data: str):
+        pass
+
+    async def send_bytes(self, data: bytes):
+        pass
+
+    async def close(self, code: int = 1000, reason: str = ""):
+        pass
+
+
+async def _run(players: int, cached: bool) -> dict:
+    side = max(12, int((players * 4 / 2) ** 0.5) + 2)
+    manager = ConnectionManager(grid_width=side * 2, grid_height=side, limits=UNLIMITED)
+    for i in range(players):
+        uid = f"user-{i}"
+        user_info = {
+            "id": uid,
+            "email": f"{uid}@cginside.co.kr",
+            "email_prefix": uid,
+            "name": f"직원 {i}",
+            "status_message": "오늘 점심은 뭐 먹지? " * 3,
+        }
+        await manager.connect(uid, user_info, NullWebSocket(), "token")
+        # 입장 알림이 송신 큐에 쌓이지 않도록 접속마다 writer 태스크에 양보 (실제로도 접속은 하나씩 수신됨)
+        await asyncio.sleep(0)
+    # 모두 한 칸씩 움직여 위치 조각이 한 번씩 무효화된 상태
+    for uid, pos in list(manager.positions.items()):
+        for dx in (1, -1):
+            gx = pos.x
+            await manager.apply_move(uid, gx + dx, pos.y, "right")
+            if pos.x != gx:  # 위치 레코드는 제자리에서 갱신됨
+                break
+        await asyncio.sleep(0)
+    # 큐가 넘쳐 끊긴 클라이언트가 있으면 줄어든 방을 잰 것이 된다
+    dropped = sum(1 for conn in manager.active_connections.values() if conn.sender.closed)
+    assert not dropped, f"{dropped}/{players} clients dropped (send queue overflow)"
+
+    timings = []
+    for i in range(RECONNECTS):
+        uid = f"user-{i}"
+        if not cached:
+            manager._info_json.clear()
+            manager._entry_json.clear()
+        t0 = time.perf_counter()
+        manager._init_message(uid)
+        timings.append(time.perf_counter() - t0)
+    for conn in manager.active_connections.values():
+        conn.sender.stop()
+    return {"p50_us": statistics.median(timings) * 1e6, "max_us": max(timings) * 1e6}
+
+
+def main():
+    print(f"{'players':>8} {'mode':>9} {'init p50 us':>12} {'init max us':>12}")
+    for n in ROOM_SIZES:
+        for label, cached in (("uncached", False), ("cached", True)):
+            r = asyncio.run(_run(n, cached))
+            print(f"{n:>8} {label:>9} {r['p50_us']:>12.1f} {r['max_us']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
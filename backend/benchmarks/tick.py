@@ -0,0 +1,108 @@
+"""이동 즉시 전송 vs 틱 모드(델타 스냅샷) 비교 벤치마크.
+
+N명이 동시에 걸어다니는 1초를 시뮬레이션하여 모드별로
+전송 프레임 수, 전송 바이트, 서버 CPU 시간을 측정한다.
+
+실행: ``cd backend && python -m benchmarks.tick``
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+
+from ws.limits import UNLIMITED
+from ws.manager import ConnectionManager
+
+PLAYER_COUNTS = (30, 100, 300)
+MOVES_PER_SEC = 6  # 플레이어당 초당 이동 (MOVE_DURATION 150ms 기준)
+TICK_RATE = 20
+
+_STEPS = ((0, 1), (0, -1), (1, 0), (-1, 0))
+
+
+class CountingWebSocket:
+    """전송 프레임 수/바이트만 세는 가짜 WebSocket."""
+
+    def __init__(self):
+        self.frames = 0
+        self.bytes = 0
+
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def send_text(self, data: str):
+        self.frames += 1
+        self.bytes += len(data.encode())
+
+    async def send_bytes(self, data: bytes):
+        self.frames += 1
+        self.bytes += len(data)
+
+    async def close(self, code: int = 1000, reason: str = ""):
+        pass
+
+
+async def _run(players: int, tick_rate: float) -> dict:
+    # 플레이어 수에 맞춰 넉넉한 격자 사용 (밀도 ~25%)
+    side = max(12, int((players * 4 / 2) ** 0.5) + 2)
+    manager = ConnectionManager(grid_width=side * 2, grid_height=side, tick_rate=tick_rate, limits=UNLIMITED)
+    sockets = {}
+    for i in range(players):
+        uid = f"user-{i}"
+        ws = CountingWebSocket()
+        sockets[uid] = ws
+        await manager.connect(uid, {"id": uid, "name": uid}, ws, "token")
+        # 입장 알림이 송신 큐에 쌓이지 않도록 접속마다 writer 태스크에 양보 (실제로도 접속은 하나씩 수신됨)
+        await asyncio.sleep(0)
+    # 틱 루프 태스크는 멈추고 벤치마크가 틱 경계마다 직접 flush
+    manager.stop()
+    await asyncio.sleep(0.05)
+    for ws in sockets.values():
+        ws.frames = ws.bytes = 0
+
+    rng = random.Random(7)
+    uids = list(sockets)
+    total_moves = players * MOVES_PER_SEC
+    # 1초 동안 고르게 분포된 이동 — 틱 경계마다 flush
+    ticks = int(tick_rate) if tick_rate else TICK_RATE
+    per_tick = total_moves // ticks
+
+    cpu0 = time.process_time()
+    for _ in range(ticks):
+        for _ in range(per_tick):
+            uid = rng.choice(uids)
+            pos = manager.positions[uid]
+            dx, dy = rng.choice(_STEPS)
+            await manager.handle_move(uid, {
+                "gridX": pos["gridX"] + dx,
+                "gridY": pos["gridY"] + dy,
+                "direction": "down",
+            })
+            # 실제로는 이동마다 별도 수신이므로 writer 태스크에 양보
+            await asyncio.sleep(0)
+        if tick_rate:
+            await manager.flush_tick()
+            await asyncio.sleep(0)
+    await asyncio.sleep(0.05)
+    cpu = time.process_time() - cpu0
+    # 큐가 넘쳐 끊긴 클라이언트가 있으면 프레임/바이트가 줄어든 인원 기준이 된다
+    dropped = sum(1 for conn in manager.active_connections.values() if conn.sender.closed)
+    assert not dropped, f"{dropped}/{players} clients dropped (send queue overflow)"
+
+    frames = sum(ws.frames for ws in sockets.values())
+    sent_bytes = sum(ws.bytes for ws in sockets.values())
+    return {"frames": frames, "bytes": sent_bytes, "cpu_ms": cpu * 1000}
+
+
+def main():
+    print(f"{'players':>8} {'mode':>10} {'frames/s':>12} {'KB/s':>10} {'cpu ms/s':>10}")
+    for n in PLAYER_COUNTS:
+        for label, rate in (("per-move", 0), (f"tick {TICK_RATE}Hz", TICK_RATE)):
+            r = asyncio.run(_run(n, rate))
+            print(f"{n:>8} {label:>10} {r['frames']:>12,} {r['bytes'] / 1024:>10,.0f} {r['cpu_ms']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
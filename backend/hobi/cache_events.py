@@ -0,0 +1,55 @@
+"""호비 도구 결과 캐시 무효화 — 도구가 읽는 데이터를 바꾸는 API 에서 호출.
+
+도구 캐시(``agent.cache``)는 워커 프로세스마다 따로 있으므로 (``uvicorn --workers``) 요청을 받은 워커에서
+바로 비우고, 같은 이름의 워커 알림을 WebSocket 백플레인으로 보내 나머지 워커도 비운다
+(``RoomRegistry.publish_worker_event``, 시작할 때 ``subscribe`` 로 핸들러 등록).
+백플레인 브로커 없이 워커를 여럿 띄운 경우에는 다른 워커의 캐시가 도구 TTL(식단 5분, 문서 검색 10분)까지 남는다.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+from agent.cache import invalidate
+from hobi.tools import DBQueryTool, RAGSearchTool
+
+if TYPE_CHECKING:
+    from ws.rooms import RoomRegistry
+
+logger = logging.getLogger(__name__)
+
+
+def menu_updated() -> None:
+    """주간 메뉴 저장 — 식단 조회 결과, 그리고 식단표 문서가 바뀌었으므로 문서 검색 결과도."""
+    _invalidate_menu()
+    _publish("menu_updated")
+
+
+def knowledge_updated() -> None:
+    """지식베이스 문서 추가/수정/삭제, 인덱스 재빌드, 검색 설정 변경."""
+    _invalidate_knowledge()
+    _publish("knowledge_updated")
+
+
+def subscribe(registry: RoomRegistry) -> None:
+    """다른 워커에서 온 무효화 알림을 이 워커의 캐시에 반영하도록 등록 (lifespan 시작 시)."""
+    registry.on_worker_event("menu_updated", _invalidate_menu)
+    registry.on_worker_event("knowledge_updated", _invalidate_knowledge)
+
+
+def _invalidate_menu() -> None:
+    removed = invalidate(DBQueryTool.name, lambda args: args.get("table") == "cafeteria_menus")
+    logger.info(f"도구 캐시 무효화: 식단 조회 {removed}건")
+    _invalidate_knowledge()
+
+
+def _invalidate_knowledge() -> None:
+    removed = invalidate(RAGSearchTool.name)
+    logger.info(f"도구 캐시 무효화: 문서 검색 {removed}건")
+
+
+def _publish(name: str) -> None:
+    from ws.rooms import rooms
+
+    rooms.publish_worker_event(name)
@@ -7,6 +7,7 @@ import logging
 
 from agent.tool import BaseTool
 from agent.types import ToolResult
+from lib.timezone import today_kst
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +44,12 @@ class DBQueryTool(BaseTool):
         },
         "required": ["table"],
     }
+    # 식단은 주간 메뉴 저장 시, 직원 정보는 TTL 로 갱신 (hobi.cache_events)
+    cache_ttl = 300
+
+    def cache_key(self, kwargs: dict) -> str:
+        # "오늘/내일" 메뉴는 날짜가 바뀌면 다른 답
+        return f"{today_kst().isoformat()}|{super().cache_key(kwargs)}"
 
     async def execute(self, *, table: str = "", filters: dict | None = None, **_) -> ToolResult:
         from rag.db_query import query_db
@@ -53,7 +60,8 @@ class DBQueryTool(BaseTool):
             return ToolResult(
                 content=result.get("answer", "조회 결과가 없습니다."),
                 metadata={"table": table, "filters": filters},
+                error=result.get("error", False),
             )
         except Exception as e:
             logger.error(f"DB 조회 실패: {e}")
-            return ToolResult(content=f"DB 조회 중 오류가 발생했습니다: {e}")
+            return ToolResult(content=f"DB 조회 중 오류가 발생했습니다: {e}", error=True)
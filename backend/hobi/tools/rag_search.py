@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 
@@ -32,6 +33,8 @@ class RAGSearchTool(BaseTool):
         },
         "required": ["query"],
     }
+    # 지식베이스 문서가 바뀌면 비움 (hobi.cache_events)
+    cache_ttl = 600
 
     async def execute(self, *, query: str = "", **_) -> ToolResult:
         from rag.vector_store import search_similar
@@ -41,10 +44,11 @@ class RAGSearchTool(BaseTool):
         settings = get_settings()
 
         try:
-            docs = search_similar(query, k=settings["retrieval_k"])
+            # 임베딩 + Supabase RPC 가 블로킹이라 스레드에서 (같은 라운드의 다른 도구와 동시에 진행)
+            docs = await asyncio.to_thread(search_similar, query, k=settings["retrieval_k"])
         except Exception as e:
             logger.error(f"RAG 검색 실패: {e}")
-            return ToolResult(content="문서 검색 중 오류가 발생했습니다.")
+            return ToolResult(content="문서 검색 중 오류가 발생했습니다.", error=True)
 
         if not docs:
             return ToolResult(
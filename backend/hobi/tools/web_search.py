@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 
 from agent.tool import BaseTool
@@ -31,16 +32,15 @@ class WebSearchTool(BaseTool):
         },
         "required": ["query"],
     }
+    cache_ttl = 300
 
     async def execute(self, *, query: str = "", **_) -> ToolResult:
-        from ddgs import DDGS
-
         try:
-            with DDGS() as ddgs:
-                results = list(ddgs.text(query, region="kr-kr", max_results=5))
+            # DDGS 는 동기 HTTP 라 스레드에서 (같은 라운드의 다른 도구와 동시에 진행)
+            results = await asyncio.to_thread(_search, query)
         except Exception as e:
             logger.warning(f"웹 검색 실패: {e}")
-            return ToolResult(content="웹 검색에 실패했습니다.")
+            return ToolResult(content="웹 검색에 실패했습니다.", error=True)
 
         if not results:
             return ToolResult(content="검색 결과가 없습니다.")
@@ -55,3 +55,10 @@ class WebSearchTool(BaseTool):
             content="\n\n".join(parts),
             metadata={"result_count": len(results)},
         )
+
+
+def _search(query: str) -> list[dict]:
+    from ddgs import DDGS
+
+    with DDGS() as ddgs:
+        return list(ddgs.text(query, region="kr-kr", max_results=5))
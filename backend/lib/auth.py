@@ -0,0 +1,192 @@
+"""인증 — Supabase JWT 로컬 검증 + 프로필 TTL 캐시
+
+요청마다 supabase.auth.get_user() 로 Supabase 에 왕복하지 않도록
+- HS256 토큰: 프로젝트 JWT 시크릿(SUPABASE_JWT_SECRET)으로 검증
+- RS256/ES256 토큰: 프로젝트 JWKS 를 받아 캐시해 두고 검증
+- 둘 다 불가능하면 기존처럼 get_user() 로 확인하되 결과를 토큰 만료 전까지 캐시
+
+프로필(username, status_message)도 TTL 동안 캐시하며
+프로필 수정 API 에서 invalidate_profile() 로 즉시 무효화한다.
+(캐시는 프로세스별이므로 다른 워커에는 TTL 이 지나야 반영된다.
+관리자 권한(is_admin)은 그래서 캐시하지 않고 admin_router 에서 service role 로 매번 조회한다)
+"""
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import jwt
+
+from lib.supabase import get_supabase_client
+
+logger = logging.getLogger(__name__)
+
+JWT_AUDIENCE = "authenticated"
+JWKS_CACHE_SECONDS = 3600  # JWKS 키 캐시 시간
+TOKEN_CACHE_SECONDS = 60  # get_user() 폴백 결과 캐시 최대 시간
+TOKEN_CACHE_SIZE = 1024
+REVOKE_SECONDS = 3600  # 삭제된 유저 차단 유지 시간 (Supabase access token 기본 수명)
+PROFILE_TTL = float(os.environ.get("AUTH_PROFILE_TTL", "60"))  # 프로필 캐시 시간 (초)
+
+PROFILE_FIELDS = ("username", "status_message")
+
+
+class AuthError(Exception):
+    """토큰이 없거나 유효하지 않음"""
+
+
+@dataclass(frozen=True)
+class AuthUser:
+    """검증된 사용자 — supabase User 에서 쓰던 필드(id, email, user_metadata)만 유지"""
+    id: str
+    email: str | None = None
+    user_metadata: dict = field(default_factory=dict)
+    app_metadata: dict = field(default_factory=dict)
+
+
+# ===== 토큰 검증 =====
+
+_jwks_client: jwt.PyJWKClient | None = None
+# {token: (만료 시각, AuthUser)} — get_user() 폴백 결과
+_token_cache: OrderedDict[str, tuple[float, AuthUser]] = OrderedDict()
+# {user_id: 차단 해제 시각} — 삭제된 유저의 아직 만료되지 않은 토큰 거부
+_revoked: dict[str, float] = {}
+
+
+def _get_jwks_client() -> jwt.PyJWKClient:
+    global _jwks_client
+    if _jwks_client is None:
+        supabase_url = os.environ.get("SUPABASE_URL")
+        if not supabase_url:
+            raise AuthError("SUPABASE_URL is not set")
+        _jwks_client = jwt.PyJWKClient(
+            f"{supabase_url}/auth/v1/.well-known/jwks.json",
+            cache_keys=True,
+            lifespan=JWKS_CACHE_SECONDS,
+        )
+    return _jwks_client
+
+
+def _user_from_claims(claims: dict) -> AuthUser:
+    return AuthUser(
+        id=claims["sub"],
+        email=claims.get("email"),
+        user_metadata=claims.get("user_metadata") or {},
+        app_metadata=claims.get("app_metadata") or {},
+    )
+
+
+def _verify_remote(token: str) -> AuthUser:
+    """로컬 검증 수단이 없을 때 — Supabase 에 확인하고 결과를 잠시 캐시."""
+    now = time.time()
+    cached = _token_cache.get(token)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    try:
+        user = get_supabase_client().auth.get_user(token).user
+    except Exception as e:
+        raise AuthError(f"Invalid or expired token: {e}") from e
+    if user is None:
+        raise AuthError("Invalid or expired token")
+    auth_user = AuthUser(
+        id=user.id,
+        email=user.email,
+        user_metadata=user.user_metadata or {},
+        app_metadata=user.app_metadata or {},
+    )
+
+    exp = jwt.decode(token, options={"verify_signature": False}).get("exp", now)
+    _token_cache[token] = (min(exp, now + TOKEN_CACHE_SECONDS), auth_user)
+    while len(_token_cache) > TOKEN_CACHE_SIZE:
+        _token_cache.popitem(last=False)
+    return auth_user
+
+
+def verify_token(token: str) -> AuthUser:
+    """Supabase access token 을 검증하고 사용자 정보를 반환한다. 실패 시 AuthError."""
+    if not token:
+        raise AuthError("Token is missing")
+    try:
+        alg = jwt.get_unverified_header(token).get("alg")
+    except jwt.PyJWTError as e:
+        raise AuthError(f"Malformed token: {e}") from e
+
+    try:
+        if alg == "HS256":
+            secret = os.environ.get("SUPABASE_JWT_SECRET")
+            if not secret:
+                return _verify_remote(token)
+            claims = jwt.decode(token, secret, algorithms=["HS256"], audience=JWT_AUDIENCE)
+        elif alg in ("RS256", "ES256"):
+            key = _get_jwks_client().get_signing_key_from_jwt(token)
+            claims = jwt.decode(token, key.key, algorithms=[alg], audience=JWT_AUDIENCE)
+        else:
+            raise AuthError(f"Unsupported token algorithm: {alg}")
+    except jwt.PyJWTError as e:
+        raise AuthError(f"Invalid or expired token: {e}") from e
+    user = _user_from_claims(claims)
+    if _revoked and _is_revoked(user.id):
+        raise AuthError("User has been deleted")
+    return user
+
+
+def _is_revoked(user_id: str) -> bool:
+    until = _revoked.get(user_id)
+    if until is None:
+        return False
+    if until < time.time():
+        del _revoked[user_id]
+        return False
+    return True
+
+
+def revoke_user(user_id: str) -> None:
+    """삭제된 유저의 토큰을 만료 전까지 거부하고 캐시를 비운다."""
+    _revoked[user_id] = time.time() + REVOKE_SECONDS
+    for token in [t for t, (_, u) in _token_cache.items() if u.id == user_id]:
+        del _token_cache[token]
+    invalidate_profile(user_id)
+
+
+# ===== 프로필 캐시 =====
+
+# {user_id: (만료 시각, {"username", "status_message"})}
+_profile_cache: dict[str, tuple[float, dict]] = {}
+
+
+def get_profile(user_id: str) -> dict:
+    """인증에 필요한 프로필 필드 (TTL 캐시). 프로필이 없으면 빈 값."""
+    now = time.monotonic()
+    cached = _profile_cache.get(user_id)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    profile = {"username": "", "status_message": ""}
+    try:
+        result = (
+            get_supabase_client()
+            .table("profiles")
+            .select(", ".join(PROFILE_FIELDS))
+            .eq("id", user_id)
+            .maybe_single()
+            .execute()
+        )
+        if result and result.data:
+            profile = {
+                "username": result.data.get("username") or "",
+                "status_message": result.data.get("status_message") or "",
+            }
+    except Exception as e:
+        # 조회 실패는 캐시하지 않음 (다음 요청에서 재시도)
+        logger.warning(f"Failed to fetch profile for {user_id}: {e}")
+        return profile
+
+    _profile_cache[user_id] = (now + PROFILE_TTL, profile)
+    return profile
+
+
+def invalidate_profile(user_id: str) -> None:
+    """프로필 수정 후 호출 — 다음 조회 시 DB 에서 다시 읽는다."""
+    _profile_cache.pop(user_id, None)
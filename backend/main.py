@@ -72,12 +72,17 @@ async def _daily_npc_refresh():
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """서버 라이프사이클 — 시작 시 NPC 상태 갱신 + 일일 스케줄러."""
-    # startup
+    # startup (NPC 상태 갱신이 룸 워커로 알림을 넘기므로 룸을 먼저 시작)
+    from hobi.cache_events import subscribe
+    from ws.rooms import rooms
+    subscribe(rooms)
+    await rooms.start()
     _refresh_npc_status()
     task = asyncio.create_task(_daily_npc_refresh())
     yield
     # shutdown
     task.cancel()
+    await rooms.shutdown()
 
 
 app = FastAPI(
@@ -1,4 +1,5 @@
 """범용 DB 쿼리 — 분류기가 추출한 table + filters로 자동 조회"""
+import asyncio
 import logging
 from lib.supabase import get_supabase_client
 from lib.timezone import today_kst
@@ -38,7 +39,8 @@ async def _query_profiles(filters: dict) -> dict:
     if filters.get("field"):
         query = query.ilike("field", f"%{filters['field']}%")
 
-    result = query.execute()
+    # supabase 클라이언트가 동기라 스레드에서 (에이전트가 다른 도구와 동시에 실행)
+    result = await asyncio.to_thread(query.execute)
 
     # 필터 없으면 전체 인원수
     has_filter = any(filters.get(k) for k in ("position", "department", "username", "field"))
@@ -73,15 +75,17 @@ async def _query_menu(filters: dict) -> dict:
     supabase = get_supabase_client()
 
     try:
-        result = (
+        query = (
             supabase.table("cafeteria_menus")
             .select("menus, week_title, period")
             .order("scraped_at", desc=True)
             .limit(1)
-            .execute()
         )
-    except Exception:
-        return {"answer": "식단 정보 시스템이 아직 설정되지 않았습니다."}
+        result = await asyncio.to_thread(query.execute)
+    except Exception as e:
+        # 조회 실패 — 호출한 도구가 실패 결과로 다루도록 (캐시하지 않음)
+        logger.warning(f"식단 조회 실패: {e}")
+        return {"answer": "식단 정보 시스템이 아직 설정되지 않았습니다.", "error": True}
 
     if not result.data:
         return {"answer": "아직 등록된 식단 정보가 없습니다."}
@@ -0,0 +1,209 @@
+"""도구 결과 캐시 — TTL/LRU/무효화, 그리고 백플레인 브로커를 통한 다른 워커 캐시 무효화."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import hobi.cache_events as cache_events
+from agent.cache import ToolCache, args_key, cache_stats, get_cache, invalidate
+from agent.tool import BaseTool
+from agent.types import ToolResult
+from hobi.tools import DBQueryTool, RAGSearchTool
+from ws.broker import Broker
+from ws.limits import UNLIMITED
+from ws.position_snapshot import PositionSnapshot
+from ws.rooms import RoomConfig, RoomRegistry
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def caches(monkeypatch):
+    """도구 이름별 캐시는 프로세스 전역 — 테스트마다 새로."""
+    monkeypatch.setattr("agent.cache._caches", {})
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """``agent.cache`` 가 보는 시계만 바꾼다 (이벤트 루프 시계는 그대로)."""
+    clock = Clock()
+    monkeypatch.setattr("agent.cache.time", SimpleNamespace(monotonic=clock))
+    return clock
+
+
+def result(text: str) -> ToolResult:
+    return ToolResult(content=text)
+
+
+def test_args_key_normalizes():
+    assert args_key({"q": "  오늘   점심 ", "day": None}) == args_key({"q": "오늘 점심", "filters": {}})
+    assert args_key({"a": 1, "b": "X"}) == args_key({"b": "x", "a": 1})
+    assert args_key({"q": "점심"}) != args_key({"q": "저녁"})
+
+
+def test_hit_and_ttl_expiry(clock):
+    cache = ToolCache(ttl=60, max_entries=10)
+    assert cache.get("k") is None
+    cache.put("k", {"q": "a"}, result("a"))
+
+    clock.now += 59
+    assert cache.get("k").content == "a"
+    clock.now += 1
+    assert cache.get("k") is None
+    stats = cache.stats()
+    assert (stats["entries"], stats["hits"], stats["misses"]) == (0, 1, 2)
+
+
+def test_put_refreshes_ttl(clock):
+    cache = ToolCache(ttl=60, max_entries=10)
+    cache.put("k", {}, result("old"))
+    clock.now += 50
+    cache.put("k", {}, result("new"))
+    clock.now += 50
+    assert cache.get("k").content == "new"
+
+
+def test_lru_eviction_order(clock):
+    cache = ToolCache(ttl=60, max_entries=2)
+    cache.put("a", {}, result("a"))
+    cache.put("b", {}, result("b"))
+    assert cache.get("a") is not None  # a 를 최근 사용으로
+    cache.put("c", {}, result("c"))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.evictions == 1
+
+    # 덮어쓰기도 최근 사용으로 옮긴다
+    cache.put("a", {}, result("a2"))
+    cache.put("d", {}, result("d"))
+    assert cache.get("c") is None
+    assert cache.get("a").content == "a2"
+
+
+def test_invalidate_match_uses_normalized_args(clock):
+    cache = ToolCache(ttl=60, max_entries=10)
+    cache.put("menu", {"table": " Cafeteria_Menus "}, result("menu"))
+    cache.put("users", {"table": "users"}, result("users"))
+    assert cache.invalidate(lambda args: args.get("table") == "cafeteria_menus") == 1
+    assert cache.get("menu") is None
+    assert cache.get("users") is not None
+    assert cache.invalidate() == 1
+    assert cache.invalidations == 2
+
+
+def test_get_cache_is_per_tool_and_follows_settings():
+    cache = get_cache("tool", 60, 10)
+    assert get_cache("tool", 30, 5) is cache
+    assert (cache.ttl, cache.max_entries) == (30, 5)
+    assert get_cache("other", 60, 10) is not cache
+    assert invalidate("missing") == 0
+    assert set(cache_stats()) == {"tool", "other"}
+
+
+class EchoTool(BaseTool):
+    name = "echo"
+    cache_ttl = 60
+
+    def __init__(self):
+        self.calls = 0
+
+    async def execute(self, **kwargs) -> ToolResult:
+        self.calls += 1
+        return ToolResult(content=kwargs["text"], error=kwargs.get("fail", False))
+
+
+def test_tool_run_caches_successes_only(clock):
+    async def main():
+        tool = EchoTool()
+        await tool.run(text="Hi")
+        await tool.run(text=" hi ")
+        await tool.run(text="x", fail=True)
+        await tool.run(text="x", fail=True)
+        return tool.calls
+
+    assert asyncio.run(main()) == 3
+
+
+# ----------------------------------------------------------------------
+# 다른 워커 무효화 (브로커로 연결된 RoomRegistry 두 개 = 워커 두 개)
+# ----------------------------------------------------------------------
+
+
+def fill_caches():
+    db = get_cache(DBQueryTool.name, 300, 10)
+    db.put("menu", {"table": "cafeteria_menus"}, result("menu"))
+    db.put("users", {"table": "users"}, result("users"))
+    rag = get_cache(RAGSearchTool.name, 600, 10)
+    rag.put("doc", {"query": "식단표"}, result("doc"))
+    return db, rag
+
+
+async def wait_until(condition, timeout: float = 2.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        assert loop.time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+def test_worker_event_invalidates_other_worker(tmp_path, monkeypatch):
+    async def main():
+        path = str(tmp_path / "broker.sock")
+        server = await Broker().serve(path)
+        workers = [
+            RoomRegistry(
+                [RoomConfig("main"), RoomConfig("cafe", grid_width=16, grid_height=8)],
+                backplane_url=f"unix://{path}",
+                snapshot=PositionSnapshot(""),
+                move_log_dir="",
+                limits=UNLIMITED,
+                heartbeat_interval=0,
+            )
+            for _ in range(2)
+        ]
+        sender, receiver = workers
+        cache_events.subscribe(receiver)
+        echoed = []
+        sender.on_worker_event("menu_updated", lambda: echoed.append("menu_updated"))
+        for worker in workers:
+            await worker.start()
+        try:
+            # 다른 워커가 보낸 알림 → 이 워커의 캐시에서 식단 조회와 문서 검색만 지움
+            db, rag = fill_caches()
+            sender.publish_worker_event("menu_updated")
+            await wait_until(lambda: db.get("menu") is None)
+            assert db.get("users") is not None
+            assert rag.get("doc") is None
+
+            # knowledge_updated 는 문서 검색만
+            db, rag = fill_caches()
+            sender.publish_worker_event("knowledge_updated")
+            await wait_until(lambda: rag.get("doc") is None)
+            assert db.get("menu") is not None
+
+            # menu_updated(): 보낸 워커는 바로 비우고, 같은 알림을 다른 워커로
+            monkeypatch.setattr("ws.rooms.rooms", sender)
+            received = []
+            receiver.on_worker_event("menu_updated", lambda: received.append("menu_updated"))
+            db, rag = fill_caches()
+            cache_events.menu_updated()
+            assert db.get("menu") is None and rag.get("doc") is None
+            await wait_until(lambda: received)
+            await asyncio.sleep(0.05)
+            assert received == ["menu_updated"]
+            # 보낸 워커는 자기 알림을 다시 받지 않는다
+            assert echoed == []
+        finally:
+            for worker in workers:
+                await worker.shutdown()
+            server.close()
+            await server.wait_closed()
+
+    asyncio.run(main())
@@ -0,0 +1,180 @@
+"""OccupancyGrid — 점유/이동 규칙과 빈 타일 목록(스폰 영역) 불변식."""
+
+import random
+
+import pytest
+
+from ws.collision import CollisionMap
+from ws.grid import OccupancyGrid
+
+
+def assert_free_list(grid: OccupancyGrid) -> None:
+    """빈 타일 목록 = 스폰 영역 안의 점유되지 않은 벽 아닌 타일, 역인덱스는 목록 위치와 일치."""
+    m = grid.margin
+    expected = {
+        gy * grid.width + gx
+        for gy in range(m, grid.height - m)
+        for gx in range(m, grid.width - m)
+        if grid.occupant(gx, gy) is None and not grid.is_wall(gx, gy)
+    }
+    assert len(grid._free) == len(expected) == grid.free_count()
+    assert set(grid._free) == expected
+    for slot, idx in enumerate(grid._free):
+        assert grid._free_slot[idx] == slot
+    assert sum(slot != -1 for slot in grid._free_slot) == len(expected)
+
+
+def assert_index(grid: OccupancyGrid) -> None:
+    """유저 → 타일 인덱스와 타일 → 유저 배열이 서로 맞는지."""
+    occupied = {idx: uid for idx, uid in enumerate(grid._cells) if uid is not None}
+    assert occupied == {idx: uid for uid, idx in grid._index_of.items()}
+    assert len(grid) == len(occupied)
+
+
+def test_move_places_and_relocates():
+    grid = OccupancyGrid(6, 5)
+    assert grid.move("a", 2, 2)
+    assert grid.occupant(2, 2) == "a"
+    assert grid.position_of("a") == (2, 2)
+    assert "a" in grid and len(grid) == 1
+
+    assert grid.move("a", 3, 2)
+    assert grid.occupant(2, 2) is None
+    assert grid.position_of("a") == (3, 2)
+    assert len(grid) == 1
+    assert_free_list(grid)
+
+
+def test_move_rejects_occupied_and_out_of_bounds():
+    grid = OccupancyGrid(6, 5)
+    grid.move("a", 2, 2)
+    grid.move("b", 3, 3)
+
+    assert not grid.move("b", 2, 2)
+    assert grid.position_of("b") == (3, 3)
+    assert grid.occupant(2, 2) == "a"
+    # 이미 서 있는 타일로의 이동은 성공 (변화 없음)
+    assert grid.move("a", 2, 2)
+
+    for gx, gy in ((-1, 0), (0, -1), (6, 0), (0, 5)):
+        assert not grid.move("b", gx, gy)
+        assert grid.occupant(gx, gy) is None
+    assert grid.position_of("b") == (3, 3)
+    assert_index(grid)
+    assert_free_list(grid)
+
+
+def test_remove_frees_tile():
+    grid = OccupancyGrid(6, 5)
+    grid.move("a", 2, 2)
+    grid.remove("a")
+    grid.remove("a")  # 없는 유저는 무시
+    assert "a" not in grid
+    assert grid.is_free(2, 2)
+    assert grid.move("b", 2, 2)
+    assert_free_list(grid)
+
+
+def test_is_free_walls_npcs_and_ignore():
+    grid = OccupancyGrid(6, 5)
+    grid.set_walls(CollisionMap(6, 5, [(1, 1)]))
+    grid.set_npc_tiles([2 * 6 + 4])  # (4, 2)
+    grid.move("a", 3, 3)
+
+    assert not grid.is_free(1, 1)
+    assert grid.is_wall(1, 1)
+    assert not grid.is_free(4, 2)
+    assert grid.is_npc(4, 2)
+    assert not grid.is_free(3, 3)
+    assert grid.is_free(3, 3, ignore="a")
+    assert not grid.is_free(6, 0)
+    assert grid.is_free(2, 2)
+
+
+def test_claim_checks_blocked_tiles_move_does_not():
+    grid = OccupancyGrid(6, 5)
+    grid.set_walls(CollisionMap(6, 5, [(1, 1)]))
+    grid.set_npc_tiles([2 * 6 + 4])
+    grid.move("a", 2, 2)
+
+    assert not grid.claim("a", 1, 1)
+    assert not grid.claim("a", 4, 2)
+    assert grid.position_of("a") == (2, 2)
+    assert grid.claim("a", 3, 2)
+    assert grid.position_of("a") == (3, 2)
+
+    # move 는 확정된 위치를 옮겨 적는 용도 — 벽/NPC 타일도 그대로 받아들인다
+    assert grid.move("b", 1, 1)
+    assert grid.move("c", 4, 2)
+    assert_free_list(grid)
+
+
+def test_set_walls_keeps_users_on_blocked_tiles():
+    grid = OccupancyGrid(6, 5)
+    grid.move("a", 2, 2)
+    grid.set_walls(CollisionMap(6, 5, [(2, 2), (3, 3)]))
+    assert grid.position_of("a") == (2, 2)
+    assert_free_list(grid)
+
+    grid.remove("a")
+    assert not grid.is_free(2, 2)
+    assert_free_list(grid)
+
+    grid.set_walls(None)
+    assert grid.is_free(2, 2) and grid.is_free(3, 3)
+    assert_free_list(grid)
+
+
+def test_set_walls_size_mismatch():
+    grid = OccupancyGrid(6, 5)
+    with pytest.raises(ValueError):
+        grid.set_walls(CollisionMap(5, 5))
+
+
+def test_random_free_stays_in_spawn_area():
+    grid = OccupancyGrid(5, 4, margin=1)
+    grid.set_walls(CollisionMap(5, 4, [(1, 1)]))
+    spawnable = {(2, 1), (3, 1), (1, 2), (2, 2), (3, 2)}
+    assert grid.free_count() == len(spawnable)
+    for _ in range(50):
+        assert grid.random_free() in spawnable
+
+    for n, (gx, gy) in enumerate(sorted(spawnable)):
+        grid.move(f"u{n}", gx, gy)
+    assert grid.free_count() == 0
+    assert grid.random_free() is None
+
+    # 가장자리 타일은 비어 있어도 목록에 들어가지 않는다
+    grid.move("edge", 0, 0)
+    grid.remove("edge")
+    assert grid.free_count() == 0
+    assert_free_list(grid)
+
+
+def test_random_operations_keep_invariants():
+    rng = random.Random(7)
+    width, height = 9, 7
+    grid = OccupancyGrid(width, height)
+    users = [f"u{n}" for n in range(20)]
+    for step in range(3000):
+        op = rng.random()
+        uid = rng.choice(users)
+        if op < 0.6:
+            gx, gy = rng.randrange(-1, width + 1), rng.randrange(-1, height + 1)
+            before = grid.position_of(uid)
+            occupant = grid.occupant(gx, gy)
+            moved = grid.move(uid, gx, gy)
+            assert moved == (grid.in_bounds(gx, gy) and occupant in (None, uid))
+            assert grid.position_of(uid) == ((gx, gy) if moved else before)
+        elif op < 0.75:
+            tile = grid.random_free()
+            if tile is not None:
+                assert grid.occupant(*tile) is None and not grid.is_wall(*tile)
+                assert grid.claim(uid, *tile)
+        elif op < 0.95:
+            grid.remove(uid)
+        else:
+            blocked = [(rng.randrange(width), rng.randrange(height)) for _ in range(rng.randrange(8))]
+            grid.set_walls(CollisionMap(width, height, blocked) if blocked else None)
+        assert_index(grid)
+        assert_free_list(grid)
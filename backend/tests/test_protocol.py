@@ -0,0 +1,76 @@
+"""바이너리 프로토콜 — 클라이언트 이동 / 서버 이동 묶음 프레임 인코딩·디코딩 왕복."""
+
+import pytest
+
+from ws import protocol
+from ws.session import Position
+
+
+@pytest.mark.parametrize("direction", protocol.DIRECTIONS)
+@pytest.mark.parametrize("grid_x, grid_y", [(0, 0), (23, 11), (0xFFFF, 0xFFFF)])
+def test_client_move_round_trip(grid_x, grid_y, direction):
+    data = protocol.encode_client_move(grid_x, grid_y, direction)
+    assert len(data) == 6
+    assert data[0] == protocol.OP_CLIENT_MOVE
+    assert protocol.decode_client_move(data) == (grid_x, grid_y, direction)
+
+
+def test_client_move_layout():
+    # [0x01][gridX u16][gridY u16][direction u8], little-endian
+    assert protocol.encode_client_move(0x0102, 3, "left") == b"\x01\x02\x01\x03\x00\x02"
+
+
+def test_unknown_direction_encodes_as_down():
+    data = protocol.encode_client_move(1, 2, "sideways")
+    assert protocol.decode_client_move(data) == (1, 2, "down")
+
+
+@pytest.mark.parametrize("data", [
+    b"",
+    b"\x01\x00\x00\x00\x00",  # 짧음
+    b"\x01\x00\x00\x00\x00\x00\x00",  # 김
+    b"\x02\x00\x00\x00\x00\x00",  # 서버 opcode
+    b"\x01\x00\x00\x00\x00\x04",  # 방향 코드 범위 밖
+])
+def test_decode_client_move_rejects_malformed(data):
+    assert protocol.decode_client_move(data) is None
+
+
+def test_moves_round_trip():
+    positions = [
+        (0, {"gridX": 1, "gridY": 2, "direction": "up"}),
+        (7, {"gridX": 23, "gridY": 11}),  # direction 없으면 down
+        (0xFFFF, Position(0xFFFF, 0, "right")),  # 매니저는 Position 을 그대로 넘긴다
+    ]
+    records = [protocol.encode_move_record(idx, pos) for idx, pos in positions]
+    assert all(len(r) == protocol.MOVE_RECORD_SIZE == 7 for r in records)
+
+    data = protocol.encode_moves(records)
+    assert len(data) == 3 + 7 * len(records)
+    assert protocol.decode_moves(data) == [
+        (0, 1, 2, "up"),
+        (7, 23, 11, "down"),
+        (0xFFFF, 0xFFFF, 0, "right"),
+    ]
+
+
+def test_moves_layout():
+    # [0x02][count u16] + [player_index u16][gridX u16][gridY u16][direction u8]
+    data = protocol.encode_moves([protocol.encode_move_record(0x0201, {"gridX": 3, "gridY": 4, "direction": "left"})])
+    assert data == b"\x02\x01\x00" + b"\x01\x02\x03\x00\x04\x00\x02"
+
+
+def test_empty_moves():
+    data = protocol.encode_moves([])
+    assert data == b"\x02\x00\x00"
+    assert protocol.decode_moves(data) == []
+
+
+def test_decode_moves_ignores_trailing_bytes():
+    record = protocol.encode_move_record(1, {"gridX": 2, "gridY": 3, "direction": "up"})
+    assert protocol.decode_moves(protocol.encode_moves([record]) + b"\xff\xff") == [(1, 2, 3, "up")]
+
+
+def test_decode_moves_rejects_wrong_opcode():
+    with pytest.raises(ValueError):
+        protocol.decode_moves(protocol.encode_client_move(1, 2, "up"))
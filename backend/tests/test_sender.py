@@ -0,0 +1,206 @@
+"""ConnectionSender — 프레임 seq, 재접속(resume) 재전송, 재개 불가 판정, 위치 메시지 합치기."""
+
+import asyncio
+import json
+
+from ws.sender import OVERFLOW_COALESCE, ConnectionSender
+
+
+class FakeWebSocket:
+    def __init__(self, fail: bool = False):
+        self.frames: list[str | bytes] = []
+        self.fail = fail
+
+    async def send_text(self, data: str):
+        if self.fail:
+            raise ConnectionError("socket closed")
+        self.frames.append(data)
+
+    async def send_bytes(self, data: bytes):
+        if self.fail:
+            raise ConnectionError("socket closed")
+        self.frames.append(data)
+
+    async def close(self, code: int = 1000, reason: str = ""):
+        pass
+
+
+async def drain():
+    """writer 태스크가 큐를 비울 때까지 루프를 몇 번 돌린다."""
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
+def test_seq_counts_frames_not_controls():
+    async def main():
+        ws = FakeWebSocket()
+        sender = ConnectionSender(ws)
+        sender.start()
+        sender.send_control({"type": "init"})
+        sender.send("a")
+        sender.send(b"\x02\x00\x00")
+        sender.send_control('{"type": "pong"}')
+        await drain()
+        sender.stop()
+        return ws.frames, sender.seq
+
+    frames, seq = asyncio.run(main())
+    assert seq == 2
+    assert json.loads(frames[0]) == {"type": "init", "seq": 0}
+    assert frames[1:3] == ["a", b"\x02\x00\x00"]
+    assert json.loads(frames[3]) == {"type": "pong", "seq": 2}
+
+
+def test_resume_replays_missed_frames_then_queue():
+    async def main():
+        ws = FakeWebSocket()
+        sender = ConnectionSender(ws)
+        sender.start()
+        for message in ("m1", "m2", "m3"):
+            sender.send(message)
+        await drain()
+
+        # 끊긴 동안 보낼 메시지는 큐에 쌓인다
+        sender.detach()
+        sender.send("m4")
+        sender.send("m5")
+        await drain()
+        assert ws.frames == ["m1", "m2", "m3"]
+
+        # 클라이언트는 m2 까지 받았음
+        new_ws = FakeWebSocket()
+        ok = sender.attach(new_ws, 2, {"type": "resumed"})
+        await drain()
+        sender.stop()
+        return ok, new_ws.frames, sender.seq
+
+    ok, frames, seq = asyncio.run(main())
+    assert ok
+    assert json.loads(frames[0]) == {"type": "resumed", "seq": 3}
+    assert frames[1:] == ["m3", "m4", "m5"]
+    assert seq == 5
+
+
+def test_resume_with_nothing_missed():
+    async def main():
+        sender = ConnectionSender(FakeWebSocket())
+        sender.start()
+        sender.send("m1")
+        await drain()
+        sender.detach()
+        new_ws = FakeWebSocket()
+        ok = sender.attach(new_ws, 1, {"type": "resumed"})
+        await drain()
+        sender.stop()
+        return ok, new_ws.frames
+
+    ok, frames = asyncio.run(main())
+    assert ok
+    assert [json.loads(f) for f in frames] == [{"type": "resumed", "seq": 1}]
+
+
+def test_resume_fails_when_gap_exceeds_replay_buffer(monkeypatch):
+    monkeypatch.setattr("ws.sender.REPLAY_BUFFER_SIZE", 4)
+
+    async def main():
+        sender = ConnectionSender(FakeWebSocket())
+        sender.start()
+        for n in range(10):
+            sender.send(f"m{n + 1}")
+        await drain()
+        sender.detach()
+        sender.send("queued")
+        new_ws = FakeWebSocket()
+        too_old = sender.attach(new_ws, 5, {"type": "resumed"})
+        await drain()
+        sender.detach()
+        oldest = sender.attach(FakeWebSocket(), 6, {"type": "resumed"})
+        sender.stop()
+        return too_old, new_ws.frames, oldest
+
+    too_old, frames, oldest = asyncio.run(main())
+    # m6 은 링 버퍼(m7~m10) 밖 → 재개 불가, 대기 큐도 버림 (호출자가 전체 스냅샷을 보냄)
+    assert not too_old
+    assert frames == []
+    # m6 까지 받았으면 m7 부터 버퍼에 있으므로 재개 가능
+    assert oldest
+
+
+def test_resume_fails_without_last_seq_or_from_future():
+    async def main():
+        sender = ConnectionSender(FakeWebSocket())
+        sender.start()
+        sender.send("m1")
+        await drain()
+        results = []
+        for last_seq in (None, 2):
+            sender.detach()
+            results.append(sender.attach(FakeWebSocket(), last_seq, {"type": "resumed"}))
+        sender.stop()
+        return results
+
+    assert asyncio.run(main()) == [False, False]
+
+
+def test_overflow_while_detached_marks_lost():
+    async def main():
+        sender = ConnectionSender(FakeWebSocket(), maxsize=3)
+        sender.start()
+        sender.send("m1")
+        await drain()
+        sender.detach()
+        for n in range(5):
+            assert sender.send(f"q{n}")
+        lost = sender.lost
+        ok = sender.attach(FakeWebSocket(), 1, {"type": "resumed"})
+        closed = sender.closed
+        sender.stop()
+        return lost, ok, closed
+
+    lost, ok, closed = asyncio.run(main())
+    # 연결은 끊지 않고 재개 시 전체 스냅샷으로 대체
+    assert lost
+    assert not ok
+    assert not closed
+
+
+def test_send_failure_detaches_and_frame_is_replayed():
+    async def main():
+        ws = FakeWebSocket(fail=True)
+        sender = ConnectionSender(ws)
+        sender.start()
+        sender.send("m1")
+        await drain()
+        detached = sender.detached
+        new_ws = FakeWebSocket()
+        # 전송 도중 끊긴 m1 은 이미 seq 1 로 기록됨 — 클라이언트는 아무것도 못 받음
+        ok = sender.attach(new_ws, 0, {"type": "resumed"})
+        await drain()
+        sender.stop()
+        return detached, ok, new_ws.frames
+
+    detached, ok, frames = asyncio.run(main())
+    assert detached
+    assert ok
+    assert json.loads(frames[0]) == {"type": "resumed", "seq": 1}
+    assert frames[1:] == ["m1"]
+
+
+def test_keyed_messages_coalesce_until_unkeyed():
+    async def main():
+        ws = FakeWebSocket()
+        sender = ConnectionSender(ws, policy=OVERFLOW_COALESCE)
+        sender.send("a1", key="move:a")
+        sender.send("b1", key="move:b")
+        sender.send("a2", key="move:a")
+        sender.send("joined")
+        sender.send("a3", key="move:a")
+        sender.start()
+        await drain()
+        sender.stop()
+        return ws.frames, sender.coalesced, sender.seq
+
+    frames, coalesced, seq = asyncio.run(main())
+    assert frames == ["a2", "b1", "joined", "a3"]
+    assert coalesced == 1
+    assert seq == 4
@@ -0,0 +1,480 @@
+"""워커 간 백플레인 — 여러 uvicorn 워커/인스턴스가 하나의 마을을 공유하도록.
+
+각 워커의 ConnectionManager 는 자기 소켓에 붙은 플레이어만 직접 관리하고,
+입장/이동/퇴장 이벤트는 백플레인을 통해 다른 워커로 전달된다.
+타일 점유의 최종 판정(권위 상태)은 백플레인 쪽의 ``TownState`` 가 한다.
+권위 상태도 룸의 충돌 레이어(벽/가구)를 받아 두어 희망 위치 검사와 무작위 스폰에서 막힌 타일을 피한다.
+
+구현:
+- ``InMemoryBackplane``: 같은 프로세스 안의 허브 공유 (단일 워커 기본값, 테스트용)
+- ``UnixSocketBackplane``: 별도 브로커 프로세스(``python -m ws.broker``)에 Unix 소켓으로 연결
+
+환경변수 ``WS_BACKPLANE``:
+- 비어 있거나 ``memory`` → InMemoryBackplane
+- ``unix:///tmp/cgtown-ws.sock`` → UnixSocketBackplane
+
+룸(맵)마다 백플레인을 따로 만든다. 브로커는 연결 하나를 룸 하나에 묶어
+룸별 권위 상태를 따로 들고, 같은 룸의 워커끼리만 이벤트를 중계한다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING
+
+from ws.grid import OccupancyGrid
+
+if TYPE_CHECKING:
+    from ws.collision import CollisionMap
+
+logger = logging.getLogger(__name__)
+
+# 다른 워커에서 온 이벤트 처리기: {"type": "join" | "move" | "leave" | "broadcast", ...}
+EventHandler = Callable[[dict], Awaitable[None]]
+
+STREAM_LIMIT = 2 ** 24  # 스냅샷 한 줄 최대 크기 (bytes)
+REQUEST_TIMEOUT = 5.0
+RECONNECT_MIN = 0.5  # 브로커 재접속 대기 (초) — 실패할 때마다 두 배, 최대 RECONNECT_MAX
+RECONNECT_MAX = 10.0
+
+
+class TownState:
+    """권위 있는 마을 상태 — 플레이어별 소유 워커 + 타일 점유 (+ 룸 충돌 레이어)."""
+
+    def __init__(self, grid_width: int, grid_height: int):
+        self.grid = OccupancyGrid(grid_width, grid_height)
+        # {user_id: {"owner": 워커 식별 객체, "user_info": dict, "position": dict}}
+        self.players: dict[str, dict] = {}
+
+    def set_walls(self, walls: CollisionMap | None) -> None:
+        """충돌 레이어 교체 — 워커가 맵을 (다시) 읽을 때마다 보낸다."""
+        self.grid.set_walls(walls)
+
+    def join(self, owner, user_id: str, user_info: dict, preferred: dict | None) -> tuple[dict, object | None]:
+        """플레이어 등록. 희망 위치가 비어 있으면(벽도 아니면) 그대로, 아니면 벽이 아닌 빈 타일에 무작위 스폰.
+
+        (실제 위치, 이전 소유 워커) 반환 — 다른 워커에서 중복 접속한 경우 이전 소유자가 있다.
+        """
+        prev = self.players.get(user_id)
+        position = None
+        if preferred is not None and self.grid.is_free(preferred["gridX"], preferred["gridY"], ignore=user_id):
+            position = preferred
+        if position is None:
+            tile = self.grid.random_free()
+            gx, gy = tile if tile is not None else (1, 1)
+            position = {"gridX": gx, "gridY": gy, "direction": "down"}
+        if not self.grid.claim(user_id, position["gridX"], position["gridY"]):
+            # 빈 타일이 하나도 없는 경우 — 격자에는 올리지 않고 위치만 기록
+            self.grid.remove(user_id)
+        # 위치는 복사해 두고 move 가 제자리에서 갱신한다 (이벤트로 나간 dict 와 공유하지 않음)
+        self.players[user_id] = {"owner": owner, "user_info": user_info, "position": dict(position)}
+        prev_owner = prev["owner"] if prev is not None and prev["owner"] is not owner else None
+        return position, prev_owner
+
+    def move(self, owner, user_id: str, gx: int, gy: int, direction: str) -> bool:
+        player = self.players.get(user_id)
+        if player is None or player["owner"] is not owner:
+            return False
+        if not self.grid.claim(user_id, gx, gy):
+            return False
+        position = player["position"]
+        position["gridX"] = gx
+        position["gridY"] = gy
+        position["direction"] = direction
+        return True
+
+    def leave(self, owner, user_id: str) -> bool:
+        player = self.players.get(user_id)
+        if player is None or player["owner"] is not owner:
+            return False
+        del self.players[user_id]
+        self.grid.remove(user_id)
+        return True
+
+    def update_info(self, user_id: str, changes: dict) -> None:
+        """프로필 변경 반영 — 나중에 붙는 워커의 스냅샷이 최신 user_info 를 받도록."""
+        player = self.players.get(user_id)
+        if player is not None:
+            player["user_info"] = {**player["user_info"], **changes}
+
+    def drop_owner(self, owner) -> list[str]:
+        """워커 연결이 끊겼을 때 그 워커 소유 플레이어를 모두 제거."""
+        gone = [uid for uid, p in self.players.items() if p["owner"] is owner]
+        for uid in gone:
+            self.leave(owner, uid)
+        return gone
+
+    def snapshot(self, exclude_owner=None) -> list[dict]:
+        return [
+            {"user_id": uid, "user_info": p["user_info"], "position": p["position"]}
+            for uid, p in self.players.items()
+            if p["owner"] is not exclude_owner
+        ]
+
+
+class Backplane(ABC):
+    """ConnectionManager 가 사용하는 워커 간 중계 인터페이스.
+
+    join/move/leave 는 권위 상태를 갱신하고, 성공하면 다른 워커에 같은 이벤트를 전달한다.
+    """
+
+    @abstractmethod
+    async def start(self, handler: EventHandler) -> list[dict]:
+        """이벤트 수신 시작. 다른 워커에 이미 있는 플레이어 목록을 반환."""
+
+    @abstractmethod
+    async def join(self, user_id: str, user_info: dict, preferred: dict | None) -> dict:
+        """플레이어 입장 — 확정된 스폰 위치 반환."""
+
+    @abstractmethod
+    async def move(self, user_id: str, gx: int, gy: int, direction: str) -> bool:
+        """이동 — 권위 상태에서 타일을 차지했으면 True."""
+
+    @abstractmethod
+    async def leave(self, user_id: str) -> None:
+        """퇴장 (응답을 기다리지 않음)."""
+
+    @abstractmethod
+    async def publish(self, event: dict) -> None:
+        """임의 이벤트를 다른 워커에 전달 (예: {"type": "broadcast", "message": ...})."""
+
+    @abstractmethod
+    def set_walls(self, walls: CollisionMap | None) -> None:
+        """룸 충돌 레이어를 권위 상태에 알린다 (기다리지 않음)."""
+
+    @abstractmethod
+    async def close(self) -> None:
+        ...
+
+
+# ----------------------------------------------------------------------
+# 인메모리 구현
+# ----------------------------------------------------------------------
+
+
+class InMemoryHub:
+    """같은 프로세스 안의 여러 InMemoryBackplane 이 공유하는 권위 상태 + 중계기."""
+
+    def __init__(self, grid_width: int, grid_height: int):
+        self.state = TownState(grid_width, grid_height)
+        self.members: list[InMemoryBackplane] = []
+
+    def relay(self, sender: InMemoryBackplane, event: dict) -> None:
+        for member in self.members:
+            if member is not sender:
+                member._deliver(event)
+
+
+class InMemoryBackplane(Backplane):
+    """프로세스 내 허브를 통한 구현. 허브를 공유하면 한 프로세스에서 여러 워커를 흉내낼 수 있다."""
+
+    def __init__(self, grid_width: int, grid_height: int, hub: InMemoryHub | None = None):
+        self.hub = hub or InMemoryHub(grid_width, grid_height)
+        self._handler: EventHandler | None = None
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+
+    async def start(self, handler: EventHandler) -> list[dict]:
+        self._handler = handler
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._dispatch_loop())
+        self.hub.members.append(self)
+        return self.hub.state.snapshot(exclude_owner=self)
+
+    def _deliver(self, event: dict) -> None:
+        if self._queue is not None:
+            self._queue.put_nowait(event)
+
+    async def _dispatch_loop(self) -> None:
+        # 워커마다 이벤트를 도착 순서대로 처리
+        while True:
+            event = await self._queue.get()
+            try:
+                await self._handler(event)
+            except Exception as e:
+                logger.error(f"Backplane event failed: {e}")
+
+    async def join(self, user_id: str, user_info: dict, preferred: dict | None) -> dict:
+        position, _ = self.hub.state.join(self, user_id, user_info, preferred)
+        self.hub.relay(self, {"type": "join", "user_id": user_id, "user_info": user_info, "position": position})
+        return position
+
+    async def move(self, user_id: str, gx: int, gy: int, direction: str) -> bool:
+        if not self.hub.state.move(self, user_id, gx, gy, direction):
+            return False
+        # 단일 워커(허브에 자기 하나)면 이벤트를 만들지 않음 — 이동마다 dict 두 개를 아낀다
+        if len(self.hub.members) > 1:
+            self.hub.relay(self, {
+                "type": "move",
+                "user_id": user_id,
+                "position": {"gridX": gx, "gridY": gy, "direction": direction},
+            })
+        return True
+
+    async def leave(self, user_id: str) -> None:
+        if self.hub.state.leave(self, user_id):
+            self.hub.relay(self, {"type": "leave", "user_id": user_id})
+
+    async def publish(self, event: dict) -> None:
+        if event.get("type") == "player_updated":
+            self.hub.state.update_info(event["user_id"], event["changes"])
+        self.hub.relay(self, event)
+
+    def set_walls(self, walls: CollisionMap | None) -> None:
+        self.hub.state.set_walls(walls)
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self in self.hub.members:
+            self.hub.members.remove(self)
+        for uid in self.hub.state.drop_owner(self):
+            self.hub.relay(self, {"type": "leave", "user_id": uid})
+
+
+# ----------------------------------------------------------------------
+# Unix 소켓 브로커 클라이언트
+# ----------------------------------------------------------------------
+
+
+class UnixSocketBackplane(Backplane):
+    """``ws.broker`` 프로세스와 줄 단위 JSON 으로 통신하는 구현.
+
+    요청(``id`` 포함)은 응답을 기다리고, 브로커가 밀어주는 이벤트는
+    ``{"op": "event", "event": {...}}`` 로 도착해 수신 순서대로 처리된다.
+    첫 요청(snapshot)에 룸 이름과 격자 크기, 충돌 레이어를 실어 보내 이 연결을 그 룸에 묶는다.
+
+    브로커 연결이 끊기면 백오프로 다시 붙는다 (``_reconnect``). 브로커는 끊긴 연결의 플레이어를 지우므로
+    이 워커의 플레이어(``_local``)를 마지막 위치로 다시 입장시키고, 끊긴 사이 놓친 다른 워커 플레이어
+    변화는 새 스냅샷과 알고 있던 목록(``_remote``)을 비교해 이벤트로 맞춘다. 다시 붙기 전까지
+    join 은 ConnectionError, move 는 거절.
+    """
+
+    def __init__(self, path: str, room: str = "main", grid_width: int | None = None, grid_height: int | None = None):
+        self.path = path
+        self.room = room
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._handler: EventHandler | None = None
+        self._task: asyncio.Task | None = None
+        self._pending: dict[int, asyncio.Future] = {}
+        self._next_id = 0
+        self._closed = False
+        # 접속 전에 받은 충돌 레이어 (막힌 타일 좌표) — snapshot 요청에 실어 보낸다 (재접속 때도)
+        self._blocked: list[tuple[int, int]] = []
+        # 재접속 때 다시 맞출 상태: 이 워커 플레이어 {user_id: {"user_info", "position"}}, 다른 워커 플레이어 id
+        self._local: dict[str, dict] = {}
+        self._remote: set[str] = set()
+        self._connected = False
+        self._reconnect_task: asyncio.Task | None = None
+        # 재접속 직후 스냅샷을 반영할 때까지 새 연결의 이벤트 처리를 미룬다 (순서 보장)
+        self._synced = asyncio.Event()
+        self._synced.set()
+
+    async def start(self, handler: EventHandler) -> list[dict]:
+        self._handler = handler
+        players = await self._connect()
+        self._remote = {p["user_id"] for p in players}
+        logger.info(f"Connected to WS broker at {self.path} for room {self.room} ({len(players)} remote players)")
+        return players
+
+    async def _connect(self) -> list[dict]:
+        """새 연결을 열고 이 룸에 묶는다 — 다른 워커 플레이어 스냅샷 반환."""
+        self._reader, self._writer = await asyncio.open_unix_connection(self.path, limit=STREAM_LIMIT)
+        self._connected = True
+        self._task = asyncio.create_task(self._read_loop())
+        reply = await self._request({
+            "op": "snapshot", "room": self.room, "width": self.grid_width, "height": self.grid_height,
+            "blocked": self._blocked,
+        })
+        return reply["players"]
+
+    def _disconnect(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _dispatch(self, event: dict) -> None:
+        try:
+            await self._handler(event)
+        except Exception as e:
+            logger.error(f"Backplane event failed: {e}")
+
+    async def _read_loop(self) -> None:
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                msg = json.loads(line)
+                if msg.get("op") == "event":
+                    await self._synced.wait()
+                    event = msg["event"]
+                    etype = event.get("type")
+                    if etype == "join":
+                        self._remote.add(event["user_id"])
+                        # 다른 워커로 재접속한 이 워커의 플레이어 — 재입장 대상에서 뺀다
+                        self._local.pop(event["user_id"], None)
+                    elif etype == "leave":
+                        self._remote.discard(event["user_id"])
+                    await self._dispatch(event)
+                    continue
+                future = self._pending.pop(msg.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(msg)
+        finally:
+            self._connected = False
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("broker connection lost"))
+            self._pending.clear()
+            if not self._closed and self._reconnect_task is None:
+                logger.error(f"WS broker connection lost ({self.path}), reconnecting")
+                self._synced.clear()
+                self._reconnect_task = asyncio.create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        """브로커에 백오프로 다시 붙어 상태를 맞춘다.
+
+        새 연결의 snapshot 요청이 충돌 레이어를 다시 등록한다. 스냅샷에 없는 다른 워커 플레이어는
+        leave, 있는 플레이어는 join 이벤트로 다시 알리고 (끊긴 사이 프로필/위치 변화 반영), 이 워커의
+        플레이어는 마지막 위치로 다시 입장시킨다. 그 타일이 그새 차지됐으면 브로커가 정한 위치를
+        move 이벤트로 넘긴다.
+        """
+        delay = RECONNECT_MIN
+        try:
+            while not self._closed:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX)
+                self._synced.clear()
+                try:
+                    players = await self._connect()
+                    await self._resync_remote(players)
+                    self._synced.set()
+                    await self._rejoin_local()
+                except (OSError, asyncio.TimeoutError) as e:
+                    logger.warning(f"WS broker reconnect failed ({self.path}): {e}")
+                    self._disconnect()
+                    continue
+                if self._connected:
+                    logger.info(
+                        f"Reconnected to WS broker at {self.path} for room {self.room} "
+                        f"({len(self._local)} local, {len(self._remote)} remote players)"
+                    )
+                    return
+        finally:
+            self._reconnect_task = None
+            self._synced.set()
+
+    async def _resync_remote(self, players: list[dict]) -> None:
+        current = {p["user_id"]: p for p in players}
+        gone = self._remote - current.keys()
+        self._remote = set(current)
+        for user_id in gone:
+            await self._dispatch({"type": "leave", "user_id": user_id})
+        for player in players:
+            await self._dispatch({"type": "join", **player})
+
+    async def _rejoin_local(self) -> None:
+        for user_id, player in list(self._local.items()):
+            if self._local.get(user_id) is not player:
+                continue  # 그새 퇴장/재입장
+            previous = player["position"]
+            reply = await self._request({
+                "op": "join", "user_id": user_id, "user_info": player["user_info"], "position": previous,
+            })
+            position = reply["position"]
+            if self._local.get(user_id) is not player:
+                continue
+            player["position"] = dict(position)
+            if (position["gridX"], position["gridY"]) != (previous["gridX"], previous["gridY"]):
+                await self._dispatch({"type": "move", "user_id": user_id, "position": position})
+
+    def _write(self, msg: dict) -> None:
+        if self._writer is None or self._writer.is_closing():
+            raise ConnectionError("broker not connected")
+        self._writer.write((json.dumps(msg) + "\n").encode())
+
+    async def _request(self, msg: dict) -> dict:
+        self._next_id += 1
+        msg["id"] = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[self._next_id] = future
+        try:
+            self._write(msg)
+            await self._writer.drain()
+            return await asyncio.wait_for(future, REQUEST_TIMEOUT)
+        finally:
+            self._pending.pop(msg["id"], None)
+
+    async def _send(self, msg: dict) -> None:
+        try:
+            self._write(msg)
+            await self._writer.drain()
+        except Exception as e:
+            logger.warning(f"Backplane send failed: {e}")
+
+    async def join(self, user_id: str, user_info: dict, preferred: dict | None) -> dict:
+        reply = await self._request({
+            "op": "join", "user_id": user_id, "user_info": user_info, "position": preferred,
+        })
+        self._local[user_id] = {"user_info": user_info, "position": dict(reply["position"])}
+        return reply["position"]
+
+    async def move(self, user_id: str, gx: int, gy: int, direction: str) -> bool:
+        position = {"gridX": gx, "gridY": gy, "direction": direction}
+        try:
+            reply = await self._request({"op": "move", "user_id": user_id, "position": position})
+        except Exception as e:
+            logger.warning(f"Backplane move failed for {user_id}: {e}")
+            return False
+        player = self._local.get(user_id)
+        if reply["ok"] and player is not None:
+            player["position"] = position
+        return reply["ok"]
+
+    async def leave(self, user_id: str) -> None:
+        self._local.pop(user_id, None)
+        await self._send({"op": "leave", "user_id": user_id})
+
+    async def publish(self, event: dict) -> None:
+        if event.get("type") == "player_updated":
+            player = self._local.get(event["user_id"])
+            if player is not None:
+                player["user_info"] = {**player["user_info"], **event["changes"]}
+        await self._send({"op": "publish", "event": event})
+
+    def set_walls(self, walls: CollisionMap | None) -> None:
+        self._blocked = walls.tiles() if walls is not None else []
+        if self._writer is None:
+            return  # start() 의 snapshot 요청으로 보냄
+        try:
+            self._write({"op": "walls", "blocked": self._blocked})
+        except ConnectionError as e:
+            logger.warning(f"Backplane walls update failed: {e}")
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        self._disconnect()
+
+
+def create_backplane(url: str, grid_width: int, grid_height: int, room: str = "main") -> Backplane:
+    """``WS_BACKPLANE`` 설정값으로 룸 하나의 백플레인 생성."""
+    if not url or url == "memory":
+        return InMemoryBackplane(grid_width, grid_height)
+    if url.startswith("unix://"):
+        return UnixSocketBackplane(url[len("unix://"):], room, grid_width, grid_height)
+    raise ValueError(f"Unknown WS_BACKPLANE: {url}")
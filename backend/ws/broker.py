@@ -0,0 +1,152 @@
+"""WebSocket 워커 간 브로커 — UnixSocketBackplane 이 접속하는 별도 프로세스.
+
+룸(맵)별로 권위 있는 타일 점유 상태(``TownState``)를 들고, 한 워커의 입장/이동/퇴장을
+같은 룸의 나머지 워커에 중계한다. 워커 연결이 끊기면 그 연결의 플레이어는 모두 퇴장 처리.
+워커는 룸마다 연결을 하나씩 열고 첫 ``snapshot`` 요청의 ``room``/``width``/``height`` 로
+그 연결을 룸에 묶는다 (룸 이름이 없으면 ``main``, 크기가 없으면 ``--width``/``--height``).
+같은 요청의 ``blocked`` (막힌 타일 좌표) 와 맵을 다시 읽을 때 오는 ``walls`` 요청으로
+룸 충돌 레이어를 받아 희망 위치 검사/무작위 스폰에서 벽/가구를 피한다.
+
+실행::
+
+    cd backend && python -m ws.broker --path /tmp/cgtown-ws.sock
+    WS_BACKPLANE=unix:///tmp/cgtown-ws.sock uvicorn main:app --workers 4
+
+프로토콜: 줄 단위 JSON. 요청 ``{"id", "op", ...}`` 에는 같은 ``id`` 로 응답하고,
+다른 워커로 가는 이벤트는 ``{"op": "event", "event": {...}}`` 로 보낸다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+
+from ws.backplane import STREAM_LIMIT, TownState
+from ws.collision import CollisionMap
+from ws.manager import DEFAULT_ROOM, GRID_HEIGHT, GRID_WIDTH
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = "/tmp/cgtown-ws.sock"
+
+
+class Broker:
+    def __init__(self, grid_width: int = GRID_WIDTH, grid_height: int = GRID_HEIGHT):
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        # {룸 이름: 권위 상태}
+        self.rooms: dict[str, TownState] = {}
+        # {워커 연결: 룸 이름}
+        self.workers: dict[asyncio.StreamWriter, str] = {}
+
+    def _state(self, writer: asyncio.StreamWriter) -> TownState:
+        return self._bind(writer, self.workers.get(writer, DEFAULT_ROOM))
+
+    def _bind(
+        self,
+        writer: asyncio.StreamWriter,
+        room: str,
+        width: int | None = None,
+        height: int | None = None,
+    ) -> TownState:
+        self.workers[writer] = room
+        state = self.rooms.get(room)
+        if state is None:
+            state = self.rooms[room] = TownState(width or self.grid_width, height or self.grid_height)
+        return state
+
+    async def serve(self, path: str) -> asyncio.AbstractServer:
+        if os.path.exists(path):
+            os.unlink(path)
+        server = await asyncio.start_unix_server(self._handle, path, limit=STREAM_LIMIT)
+        logger.info(f"WS broker listening on {path}")
+        return server
+
+    def _send(self, writer: asyncio.StreamWriter, msg: dict) -> None:
+        if not writer.is_closing():
+            writer.write((json.dumps(msg) + "\n").encode())
+
+    def _relay(self, sender: asyncio.StreamWriter, event: dict) -> None:
+        line = (json.dumps({"op": "event", "event": event}) + "\n").encode()
+        room = self.workers.get(sender, DEFAULT_ROOM)
+        for worker, worker_room in self.workers.items():
+            if worker is not sender and worker_room == room and not worker.is_closing():
+                worker.write(line)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.workers[writer] = DEFAULT_ROOM
+        logger.info(f"Worker connected ({len(self.workers)} total)")
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                self._dispatch(writer, json.loads(line))
+                await writer.drain()
+        except (ConnectionError, json.JSONDecodeError) as e:
+            logger.warning(f"Worker connection error: {e}")
+        finally:
+            for uid in self._state(writer).drop_owner(writer):
+                self._relay(writer, {"type": "leave", "user_id": uid})
+            self.workers.pop(writer, None)
+            writer.close()
+            logger.info(f"Worker disconnected ({len(self.workers)} total)")
+
+    def _dispatch(self, writer: asyncio.StreamWriter, msg: dict) -> None:
+        op = msg.get("op")
+        if op == "snapshot" and "room" in msg:
+            self._bind(writer, msg["room"] or DEFAULT_ROOM, msg.get("width"), msg.get("height"))
+        state = self._state(writer)
+        if op in ("snapshot", "walls") and "blocked" in msg:
+            grid = state.grid
+            state.set_walls(CollisionMap(grid.width, grid.height, msg["blocked"]) if msg["blocked"] else None)
+        if op == "move":
+            position = msg["position"]
+            ok = state.move(writer, msg["user_id"], position["gridX"], position["gridY"], position.get("direction", "down"))
+            self._send(writer, {"id": msg["id"], "ok": ok})
+            if ok:
+                self._relay(writer, {"type": "move", "user_id": msg["user_id"], "position": msg["position"]})
+        elif op == "join":
+            position, prev_owner = state.join(writer, msg["user_id"], msg["user_info"], msg.get("position"))
+            if prev_owner is not None:
+                logger.info(f"{msg['user_id']} moved to another worker (duplicate connect)")
+            self._send(writer, {"id": msg["id"], "position": position})
+            self._relay(writer, {
+                "type": "join",
+                "user_id": msg["user_id"],
+                "user_info": msg["user_info"],
+                "position": position,
+            })
+        elif op == "leave":
+            if state.leave(writer, msg["user_id"]):
+                self._relay(writer, {"type": "leave", "user_id": msg["user_id"]})
+        elif op == "publish":
+            event = msg["event"]
+            if event.get("type") == "player_updated":
+                state.update_info(event["user_id"], event["changes"])
+            self._relay(writer, event)
+        elif op == "snapshot":
+            self._send(writer, {"id": msg["id"], "players": state.snapshot(exclude_owner=writer)})
+
+
+async def _main(path: str, grid_width: int, grid_height: int) -> None:
+    server = await Broker(grid_width, grid_height).serve(path)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CG Town WebSocket 워커 간 브로커")
+    parser.add_argument("--path", default=DEFAULT_PATH)
+    parser.add_argument("--width", type=int, default=GRID_WIDTH)
+    parser.add_argument("--height", type=int, default=GRID_HEIGHT)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(args.path, args.width, args.height))
+
+
+if __name__ == "__main__":
+    main()
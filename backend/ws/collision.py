@@ -0,0 +1,121 @@
+"""정적 충돌 레이어 — 프론트 Phaser 가 그리는 Tiled 맵(JSON)에서 벽/가구 타일을 읽어 비트셋으로 보관.
+
+Tiled 맵 타일(16px)은 게임 격자 타일(64px) 하나에 ``scale x scale`` 개(기본 4x4)가 들어간다.
+충돌 레이어의 맵 타일이 게임 타일 면적의 ``coverage`` 이상을 덮으면 그 게임 타일을 막힌 것으로 본다.
+
+- 레이어 이름이 ``collision`` 이거나 레이어 속성 ``collides`` 가 참이면 그 레이어를 우선 사용
+- 없으면 ``WS_COLLISION_LAYERS`` (쉼표 구분, 기본 가구/장식 레이어) 를 사용
+- NPC 자리처럼 맵에 그려지지 않는 고정 장애물은 룸 설정의 ``blocked`` 로 추가
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import os
+from collections.abc import Iterable
+
+COLLISION_LAYERS = tuple(
+    name.strip() for name in os.environ.get("WS_COLLISION_LAYERS", "deco,deco 2").split(",") if name.strip()
+)
+# 게임 타일 면적 중 이 비율 이상이 충돌 레이어로 덮이면 막힌 타일
+COLLISION_COVERAGE = float(os.environ.get("WS_COLLISION_COVERAGE", "0.5"))
+
+
+class CollisionMap:
+    """width x height 격자의 막힌 타일 비트셋 (타일당 1비트, 조회 O(1))."""
+
+    __slots__ = ("width", "height", "_bits")
+
+    def __init__(self, width: int, height: int, blocked: Iterable[tuple[int, int]] = ()):
+        self.width = width
+        self.height = height
+        self._bits = bytearray((width * height + 7) // 8)
+        for gx, gy in blocked:
+            self.block(gx, gy)
+
+    def block(self, gx: int, gy: int) -> None:
+        if 0 <= gx < self.width and 0 <= gy < self.height:
+            idx = gy * self.width + gx
+            self._bits[idx >> 3] |= 1 << (idx & 7)
+
+    def blocked_index(self, idx: int) -> bool:
+        return bool(self._bits[idx >> 3] >> (idx & 7) & 1)
+
+    def blocked(self, gx: int, gy: int) -> bool:
+        """범위 밖도 막힌 것으로 본다."""
+        if not (0 <= gx < self.width and 0 <= gy < self.height):
+            return True
+        return self.blocked_index(gy * self.width + gx)
+
+    def count(self) -> int:
+        return sum(bin(b).count("1") for b in self._bits)
+
+    def tiles(self) -> list[tuple[int, int]]:
+        """막힌 타일 좌표 목록 (브로커로 보내는 와이어 형식, ``CollisionMap(w, h, tiles)`` 로 복원)."""
+        return [(i % self.width, i // self.width) for i in range(self.width * self.height) if self.blocked_index(i)]
+
+    def encode(self) -> str:
+        """클라이언트용 와이어 형식 — 비트셋 그대로 base64 (타일 ``y * width + x`` 의 비트, 바이트 안에서는 낮은 비트부터)."""
+        return base64.b64encode(self._bits).decode()
+
+    def to_bytemap(self) -> bytearray:
+        """타일당 1바이트 (경로 탐색 내부 루프용)."""
+        return bytearray(self.blocked_index(i) for i in range(self.width * self.height))
+
+    def rows(self) -> list[str]:
+        """디버그용 ``#``/``.`` 그림."""
+        return [
+            "".join("#" if self.blocked_index(y * self.width + x) else "." for x in range(self.width))
+            for y in range(self.height)
+        ]
+
+
+def _collision_layers(tiled: dict, layer_names: Iterable[str]) -> list[list[int]]:
+    tile_layers = [layer for layer in tiled["layers"] if layer.get("type") == "tilelayer"]
+    explicit = [
+        layer for layer in tile_layers
+        if layer.get("name") == "collision"
+        or any(p.get("name") == "collides" and p.get("value") for p in layer.get("properties") or ())
+    ]
+    if explicit:
+        return [layer["data"] for layer in explicit]
+    names = set(layer_names)
+    return [layer["data"] for layer in tile_layers if layer.get("name") in names]
+
+
+def load_collision_map(
+    path: str,
+    grid_width: int,
+    grid_height: int,
+    blocked: Iterable[tuple[int, int]] = (),
+    layer_names: Iterable[str] = COLLISION_LAYERS,
+    coverage: float = COLLISION_COVERAGE,
+) -> CollisionMap:
+    """Tiled JSON 맵을 읽어 게임 격자 크기의 충돌 비트셋을 만든다."""
+    with open(path, encoding="utf-8") as f:
+        tiled = json.load(f)
+    map_w, map_h = tiled["width"], tiled["height"]
+    if map_w % grid_width or map_h % grid_height or map_w // grid_width != map_h // grid_height:
+        raise ValueError(f"{path}: map {map_w}x{map_h} does not tile grid {grid_width}x{grid_height}")
+    scale = map_w // grid_width
+    threshold = max(1, round(coverage * scale * scale))
+
+    # 충돌 레이어 중 하나라도 그려진 맵 타일
+    layers = _collision_layers(tiled, layer_names)
+    solid = bytearray(map_w * map_h)
+    for data in layers:
+        for i, gid in enumerate(data):
+            if gid:
+                solid[i] = 1
+
+    collision = CollisionMap(grid_width, grid_height, blocked)
+    for gy in range(grid_height):
+        for gx in range(grid_width):
+            covered = 0
+            for y in range(gy * scale, (gy + 1) * scale):
+                row = y * map_w + gx * scale
+                covered += sum(solid[row:row + scale])
+            if covered >= threshold:
+                collision.block(gx, gy)
+    return collision
@@ -1,41 +1,36 @@
+import json
 import logging
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
 
-from ws.manager import manager
-from lib.supabase import get_supabase_client
+from ws.rooms import rooms
+from ws.protocol import SUBPROTOCOL_BINARY
+from lib.auth import get_profile, verify_token
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
 @router.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket, token: str = Query(...)):
-    # Verify JWT token
+async def websocket_endpoint(
+    websocket: WebSocket,
+    token: str = Query(...),
+    view_radius: int | None = Query(None),
+    resume: str | None = Query(None),
+    last_seq: int | None = Query(None),
+    room: str | None = Query(None),
+):
+    # Verify JWT token (로컬 검증 + 프로필 캐시 — Supabase 왕복 없음)
     try:
-        supabase = get_supabase_client()
-        user_response = supabase.auth.get_user(token)
-        user = user_response.user
+        user = verify_token(token)
         user_id = user.id
         user_metadata = user.user_metadata or {}
         # 이메일 @ 앞부분을 캐릭터 폴더명으로 사용
         email_prefix = user.email.split("@")[0] if user.email else ""
 
-        # profiles 테이블에서 username, status_message 조회
-        profile_name = ""
-        status_message = ""
-        try:
-            profile_result = (
-                supabase.table("profiles")
-                .select("username, status_message")
-                .eq("id", user.id)
-                .single()
-                .execute()
-            )
-            if profile_result.data:
-                profile_name = profile_result.data.get("username", "") or ""
-                status_message = profile_result.data.get("status_message", "") or ""
-        except Exception as profile_err:
-            logger.warning(f"Failed to fetch profile for {user.id}: {profile_err}")
+        # profiles 테이블의 username, status_message (TTL 캐시)
+        profile = get_profile(user.id)
+        profile_name = profile["username"]
+        status_message = profile["status_message"]
 
         user_info = {
             "id": user.id,
@@ -44,23 +39,54 @@ async def websocket_endpoint(websocket: WebSocket, token: str = Query(...)):
             "name": profile_name or user_metadata.get("username") or user_metadata.get("name") or email_prefix or "Unknown",
             "status_message": status_message,
         }
-        saved_position = user_metadata.get("last_position")
+        # 토큰의 user_metadata 는 발급 시점 값이므로 이 서버가 최근 저장한 위치를 우선
+        saved_position = rooms.persistence.last_known(user_id) or user_metadata.get("last_position")
         logger.info(f"WS auth OK: {user_id} ({email_prefix}), saved_pos: {saved_position}")
     except Exception as e:
         logger.error(f"WS auth failed: {e}")
         await websocket.close(code=4001, reason="Authentication failed")
         return
 
-    await manager.connect(user_id, user_info, websocket, token, saved_position)
+    # view_radius: 화면에 보이는 타일 반경 (모바일 등 작은 화면만 지정, 없으면 맵 전체)
+    # 바이너리 서브프로토콜을 요청한 클라이언트는 위치 트래픽을 바이너리로 주고받음
+    binary = SUBPROTOCOL_BINARY in websocket.scope.get("subprotocols", [])
+    # resume: 잠깐 끊겼던 클라이언트는 기존 세션을 이어받고 놓친 이벤트만 받음 (입장 브로드캐스트 없음)
+    # room: 접속할 룸(맵). 없으면 진행 중인 세션 → 저장된 위치의 룸 → 기본 룸
+    # (입장/재개도 룸 워커 큐에서 처리되므로 이미 들어와 있던 이동/채팅 명령 뒤에 실행됨)
+    if not (resume and await rooms.resume(user_id, websocket, resume, last_seq, binary, view_radius)):
+        await rooms.connect(user_id, user_info, websocket, token, room, saved_position, view_radius, binary)
 
     try:
         while True:
-            data = await websocket.receive_json()
-            if data.get("type") == "move":
-                await manager.handle_move(user_id, data)
-    except WebSocketDisconnect:
-        await manager.disconnect(user_id)
-        await manager.broadcast_disconnect(user_id)
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            # 문을 지나 룸이 바뀔 수 있으므로 메시지마다 현재 룸을 찾는다
+            current = rooms.room_of(user_id)
+            if current is None:
+                continue
+            manager = current.manager
+            # 무엇이든 받으면 살아 있는 연결 (heartbeat 의 pong 은 이것 외에 따로 처리할 것 없음)
+            manager.mark_alive(user_id)
+            # 연결별 토큰 버킷 — 초과한 메시지는 처리하지 않음
+            if not manager.allow_message(user_id):
+                continue
+            # 룸 상태를 바꾸는 처리는 룸 워커 태스크가 순서대로 실행
+            if message.get("bytes") is not None:
+                current.submit(manager.handle_binary, user_id, message["bytes"])
+                continue
+            data = json.loads(message.get("text") or "{}")
+            msg_type = data.get("type")
+            if msg_type == "move":
+                current.submit(manager.handle_move, user_id, data)
+            elif msg_type == "move_to":
+                current.submit(manager.handle_move_to, user_id, data)
+            elif msg_type == "chat":
+                current.submit(manager.handle_chat, user_id, data)
+            elif msg_type == "view":
+                current.submit(manager.set_view_radius, user_id, data.get("radius"))
+    except WebSocketDisconnect as e:
+        # 정상 종료(페이지 이탈 등)는 바로 퇴장, 그 외에는 재접속을 잠시 기다림
+        rooms.leave(user_id, websocket, e.code)
     except Exception:
-        await manager.disconnect(user_id)
-        await manager.broadcast_disconnect(user_id)
+        rooms.leave(user_id, websocket)
@@ -0,0 +1,181 @@
+"""타일 점유 인덱스 — 충돌 검사/스폰 위치 탐색을 O(1)로 처리."""
+
+from __future__ import annotations
+
+import random
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ws.collision import CollisionMap
+
+
+class OccupancyGrid:
+    """width x height 격자의 타일 점유 상태를 배열로 관리한다.
+
+    - ``_cells[y * width + x]`` 에 해당 타일을 점유한 user_id 저장 (없으면 None)
+    - ``walls`` (정적 충돌 비트셋) 의 막힌 타일은 빈 타일로 보지 않는다 (이동/스폰 모두)
+    - 서버 시뮬레이션 NPC 가 서 있는 타일(``set_npc_tiles``)도 ``is_free`` 에서 막힌 것으로 본다
+    - 스폰 가능 영역(가장자리 ``margin`` 칸 제외)의 빈 타일 목록을 유지하여
+      스폰 시 전체 스캔 없이 무작위 빈 타일을 바로 뽑는다.
+      (목록 + 역인덱스로 swap-remove → 추가/삭제 모두 O(1))
+    """
+
+    def __init__(self, width: int, height: int, margin: int = 1):
+        self.width = width
+        self.height = height
+        self.margin = margin
+        self._cells: list[str | None] = [None] * (width * height)
+        self.walls: CollisionMap | None = None
+        # NPC 가 서 있는 타일 인덱스 (NPC 틱마다 교체)
+        self._npc_tiles: set[int] = set()
+        # {user_id: 타일 인덱스}
+        self._index_of: dict[str, int] = {}
+        # 스폰 가능한 빈 타일 목록 + 각 타일의 목록 내 위치 (-1 이면 목록에 없음)
+        self._free: list[int] = []
+        self._free_slot: list[int] = [-1] * (width * height)
+        for gy in range(margin, height - margin):
+            for gx in range(margin, width - margin):
+                self._push_free(gy * width + gx)
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    def in_bounds(self, gx: int, gy: int) -> bool:
+        return 0 <= gx < self.width and 0 <= gy < self.height
+
+    def occupant(self, gx: int, gy: int) -> str | None:
+        """해당 타일을 점유한 user_id (범위 밖이거나 비어 있으면 None)."""
+        if not self.in_bounds(gx, gy):
+            return None
+        return self._cells[gy * self.width + gx]
+
+    def occupant_at(self, idx: int) -> str | None:
+        """타일 인덱스(``y * width + x``)로 점유자 조회 — 경로 탐색 내부 루프용."""
+        return self._cells[idx]
+
+    def is_free(self, gx: int, gy: int, ignore: str | None = None) -> bool:
+        """타일이 비어 있는지 (``ignore`` 유저가 점유한 경우도 빈 것으로 간주)."""
+        if not self.in_bounds(gx, gy):
+            return False
+        idx = gy * self.width + gx
+        if self.walls is not None and self.walls.blocked_index(idx):
+            return False
+        if idx in self._npc_tiles:
+            return False
+        uid = self._cells[idx]
+        return uid is None or uid == ignore
+
+    def is_wall(self, gx: int, gy: int) -> bool:
+        return self.walls is not None and self.walls.blocked(gx, gy)
+
+    def is_npc(self, gx: int, gy: int) -> bool:
+        return self.in_bounds(gx, gy) and gy * self.width + gx in self._npc_tiles
+
+    def position_of(self, user_id: str) -> tuple[int, int] | None:
+        idx = self._index_of.get(user_id)
+        if idx is None:
+            return None
+        return idx % self.width, idx // self.width
+
+    def occupied_indices(self) -> Iterable[int]:
+        """점유된 타일 인덱스들 (NPC 시뮬레이션이 피할 타일, 복사하지 않은 뷰)."""
+        return self._index_of.values()
+
+    def free_count(self) -> int:
+        """스폰 가능 영역의 빈 타일 수."""
+        return len(self._free)
+
+    def random_free(self) -> tuple[int, int] | None:
+        """스폰 가능 영역에서 무작위 빈 타일 하나 (없으면 None)."""
+        if not self._free:
+            return None
+        idx = self._free[random.randrange(len(self._free))]
+        return idx % self.width, idx // self.width
+
+    def __len__(self) -> int:
+        return len(self._index_of)
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._index_of
+
+    # ------------------------------------------------------------------
+    # 갱신
+    # ------------------------------------------------------------------
+
+    def claim(self, user_id: str, gx: int, gy: int) -> bool:
+        """이동을 결정하는 쪽(권위 상태)의 이동 — ``is_free`` (벽/NPC/다른 유저) 확인과 ``move`` 를 한 번에."""
+        return self.is_free(gx, gy, ignore=user_id) and self.move(user_id, gx, gy)
+
+    def move(self, user_id: str, gx: int, gy: int) -> bool:
+        """유저를 (gx, gy)로 옮긴다. 아직 격자에 없으면 새로 배치.
+
+        대상 타일이 범위 밖이거나 다른 유저가 점유 중이면 아무것도 바꾸지 않고
+        False 를 반환한다 (확인과 이동이 한 번에 이뤄지는 원자적 연산).
+        벽/NPC 타일은 보지 않는다 — 이미 확정된 위치(권위 상태가 받아들인 이동, 다른 워커의 플레이어)를
+        사본에 옮겨 적는 용도이고, 이동을 결정하는 쪽은 ``claim`` 을 쓴다.
+        """
+        if not self.in_bounds(gx, gy):
+            return False
+        new_idx = gy * self.width + gx
+        uid = self._cells[new_idx]
+        if uid is not None:
+            return uid == user_id
+        old_idx = self._index_of.get(user_id)
+        if old_idx is not None:
+            self._cells[old_idx] = None
+            self._push_free(old_idx)
+        self._cells[new_idx] = user_id
+        self._index_of[user_id] = new_idx
+        self._pop_free(new_idx)
+        return True
+
+    def set_npc_tiles(self, tiles: Iterable[int]) -> None:
+        """NPC 가 서 있는 타일 교체 — 플레이어 이동 검사(``is_free``)에서 막힌 것으로 본다."""
+        self._npc_tiles = set(tiles)
+
+    def remove(self, user_id: str) -> None:
+        idx = self._index_of.pop(user_id, None)
+        if idx is None:
+            return
+        self._cells[idx] = None
+        self._push_free(idx)
+
+    def set_walls(self, walls: CollisionMap | None) -> None:
+        """정적 충돌 레이어 교체 (맵 핫 리로드). 이미 막힌 타일에 서 있는 유저는 그대로 둔다."""
+        if walls is not None and (walls.width, walls.height) != (self.width, self.height):
+            raise ValueError("collision map size does not match grid")
+        self.walls = walls
+        for idx in range(self.width * self.height):
+            if self._cells[idx] is None:
+                self._push_free(idx)
+            if walls is not None and walls.blocked_index(idx):
+                self._pop_free(idx)
+
+    # ------------------------------------------------------------------
+    # 빈 타일 목록 (스폰 영역만, 벽 제외)
+    # ------------------------------------------------------------------
+
+    def _in_spawn_area(self, idx: int) -> bool:
+        gx, gy = idx % self.width, idx // self.width
+        m = self.margin
+        return m <= gx < self.width - m and m <= gy < self.height - m
+
+    def _push_free(self, idx: int) -> None:
+        if self._free_slot[idx] != -1 or not self._in_spawn_area(idx):
+            return
+        if self.walls is not None and self.walls.blocked_index(idx):
+            return
+        self._free_slot[idx] = len(self._free)
+        self._free.append(idx)
+
+    def _pop_free(self, idx: int) -> None:
+        slot = self._free_slot[idx]
+        if slot == -1:
+            return
+        last = self._free.pop()
+        if last != idx:
+            self._free[slot] = last
+            self._free_slot[last] = slot
+        self._free_slot[idx] = -1
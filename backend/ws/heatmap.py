@@ -0,0 +1,175 @@
+"""이동 로그 분석 — 사람들이 어디에 모이는지 (점유 히트맵, 머문 시간, 함께 있던 횟수).
+
+``ws.movelog`` 가 남긴 일별 바이너리 로그를 ``numpy.memmap`` 으로 열어 벡터 연산으로 집계한다.
+서버 이동 처리와는 무관한 오프라인 분석이며, 관리자 API 는 스레드에서 호출한다.
+같은 날의 워커별 파일은 player 핸들 앞에 파일 번호를 붙여(``merge_logs``) 한 배열로 합친 뒤 집계한다 —
+핸들은 워커마다 따로 매겨서 파일이 다르면 같은 번호라도 다른 사람이다.
+
+- 머문 시간(dwell): 플레이어의 레코드 하나가 다음 레코드(이동/퇴장)까지 그 타일에 있던 시간.
+  다음 레코드가 ``max_gap`` 초보다 늦으면(로그 누락, 비정상 종료) ``max_gap`` 으로 자른다
+- 방문(visits): 타일에 들어온 횟수
+- 함께 있음(colocation): ``bucket`` 초 단위 시점마다 ``cell`` x ``cell`` 타일 영역에 함께 있던 플레이어 쌍 수
+
+실행 (로그 디렉터리의 오늘 main 룸)::
+
+    cd backend && python -m ws.heatmap main [YYYY-MM-DD]
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from datetime import date
+
+import numpy as np
+
+from ws.movelog import LEAVE, MOVE_LOG_DIR, RECORD_SIZE, log_files
+
+RECORD_DTYPE = np.dtype([("ms", "<u4"), ("player", "<u2"), ("x", "<u2"), ("y", "<u2")])
+assert RECORD_DTYPE.itemsize == RECORD_SIZE
+# 워커별 파일을 합친 배열 — player 는 (파일 번호 << 16) | 핸들
+MERGED_DTYPE = np.dtype([("ms", "<u4"), ("player", "<i8"), ("x", "<u2"), ("y", "<u2")])
+
+MAX_GAP = 60.0  # 초 — 이보다 긴 무이동 구간은 여기까지만 머문 것으로 봄
+BUCKET = 60.0  # 초 — 함께 있음 집계 시점 간격
+CELL = 3  # 타일 — 함께 있음 집계 영역 한 변
+
+
+def open_log(path: str) -> np.ndarray:
+    """로그 파일을 읽기 전용 memmap 으로 (쓰는 중 잘린 마지막 레코드는 제외)."""
+    count = os.path.getsize(path) // RECORD_SIZE
+    if count == 0:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+    return np.memmap(path, dtype=RECORD_DTYPE, mode="r", shape=(count,))
+
+
+def merge_logs(logs: list[np.ndarray]) -> np.ndarray:
+    """워커별 로그 → 한 배열. 파일마다 player 핸들을 구분해 다른 워커의 같은 핸들이 이어지지 않게."""
+    merged = np.zeros(sum(len(log) for log in logs), dtype=MERGED_DTYPE)
+    offset = 0
+    for index, log in enumerate(logs):
+        part = merged[offset:offset + len(log)]
+        for name in ("ms", "x", "y"):
+            part[name] = log[name]
+        part["player"] = (index << 16) | log["player"].astype(np.int64)
+        offset += len(log)
+    return merged
+
+
+def _intervals(records: np.ndarray, max_gap: float) -> tuple[np.ndarray, ...]:
+    """플레이어별 시간순으로 정렬한 (player, start_ms, 머문 ms, x, y) — 퇴장 레코드는 구간 끝으로만 쓰임."""
+    order = np.lexsort((records["ms"], records["player"]))
+    player = records["player"][order].astype(np.int64)
+    ms = records["ms"][order].astype(np.int64)
+    x = records["x"][order].astype(np.int64)
+    y = records["y"][order].astype(np.int64)
+
+    duration = np.full(len(ms), int(max_gap * 1000), dtype=np.int64)
+    same = player[1:] == player[:-1]
+    duration[:-1][same] = np.minimum(ms[1:][same] - ms[:-1][same], duration[:-1][same])
+    keep = x != LEAVE
+    return player[keep], ms[keep], duration[keep], x[keep], y[keep]
+
+
+def analyze(
+    records: np.ndarray,
+    width: int,
+    height: int,
+    max_gap: float = MAX_GAP,
+    bucket: float = BUCKET,
+    cell: int = CELL,
+) -> dict[str, np.ndarray]:
+    """레코드 배열 → {"dwell": 초 (h, w), "visits": (h, w), "colocation": (ceil(h/cell), ceil(w/cell))}."""
+    cells_w, cells_h = -(-width // cell), -(-height // cell)
+    if len(records) == 0:
+        return {
+            "dwell": np.zeros((height, width)),
+            "visits": np.zeros((height, width), dtype=np.int64),
+            "colocation": np.zeros((cells_h, cells_w), dtype=np.int64),
+        }
+    player, ms, duration, x, y = _intervals(records, max_gap)
+    inside = (x < width) & (y < height)
+    player, ms, duration, x, y = player[inside], ms[inside], duration[inside], x[inside], y[inside]
+    tile = y * width + x
+    dwell = np.bincount(tile, weights=duration / 1000.0, minlength=width * height)
+    visits = np.bincount(tile, minlength=width * height)
+
+    # 함께 있음: 구간이 걸친 모든 시점(bucket)에 그 플레이어를 영역에 올린 뒤, 시점 x 영역별 인원으로 쌍 수
+    bucket_ms = int(bucket * 1000)
+    first = ms // bucket_ms
+    last = (ms + np.maximum(duration, 1) - 1) // bucket_ms
+    spans = last - first + 1
+    rep = np.repeat(np.arange(len(ms)), spans)
+    offsets = np.arange(len(rep)) - np.repeat(np.cumsum(spans) - spans, spans)
+    when = first[rep] + offsets
+    area = (y[rep] // cell) * cells_w + (x[rep] // cell)
+    # 한 시점에 같은 플레이어가 여러 영역을 지났으면 마지막 영역만 (레코드가 시간순이라 뒤의 것)
+    who = when * (int(player.max()) + 1) + player[rep]
+    _, last_index = np.unique(who[::-1], return_index=True)
+    last_index = len(who) - 1 - last_index
+    key = when[last_index] * (cells_w * cells_h) + area[last_index]
+    keys, together = np.unique(key, return_counts=True)
+    pairs = together * (together - 1) // 2
+    colocation = np.bincount(keys % (cells_w * cells_h), weights=pairs, minlength=cells_w * cells_h)
+
+    return {
+        "dwell": dwell.reshape(height, width),
+        "visits": visits.reshape(height, width),
+        "colocation": colocation.astype(np.int64).reshape(cells_h, cells_w),
+    }
+
+
+def room_heatmap(
+    room: str,
+    width: int,
+    height: int,
+    days: list[date],
+    directory: str = MOVE_LOG_DIR,
+    **options,
+) -> dict:
+    """여러 날짜 로그를 합친 히트맵 (JSON 으로 보낼 수 있는 형태)."""
+    files = log_files(directory, room)
+    total = None
+    used = []
+    records = 0
+    for day in days:
+        paths = files.get(day)
+        if not paths:
+            continue
+        log = merge_logs([open_log(path) for path in paths])
+        result = analyze(log, width, height, **options)
+        records += len(log)
+        used.append(day.isoformat())
+        total = result if total is None else {k: total[k] + result[k] for k in total}
+    if total is None:
+        total = analyze(np.zeros(0, dtype=RECORD_DTYPE), width, height, **options)
+    visits = total["visits"]
+    dwell = total["dwell"]
+    mean_dwell = np.divide(dwell, visits, out=np.zeros_like(dwell), where=visits > 0)
+    return {
+        "room": room,
+        "width": width,
+        "height": height,
+        "days": used,
+        "records": records,
+        "dwell_seconds": np.round(dwell, 1).tolist(),
+        "mean_dwell_seconds": np.round(mean_dwell, 1).tolist(),
+        "visits": visits.tolist(),
+        "colocation_cell": options.get("cell", CELL),
+        "colocation": total["colocation"].tolist(),
+    }
+
+
+def main():
+    room = sys.argv[1] if len(sys.argv) > 1 else "main"
+    day = date.fromisoformat(sys.argv[2]) if len(sys.argv) > 2 else date.today()
+    from ws.manager import GRID_HEIGHT, GRID_WIDTH
+
+    result = room_heatmap(room, GRID_WIDTH, GRID_HEIGHT, [day])
+    print(f"{room} {result['days']} records={result['records']}")
+    for row in result["dwell_seconds"]:
+        print(" ".join(f"{v:6.0f}" for v in row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""관심 영역(AOI) 관리 — 셀 단위로 이동 이벤트 수신자를 필터링."""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Iterable, Iterator
+
+AOI_CELL_SIZE = 4  # 관심 영역 셀 한 변의 타일 수
+
+
+class InterestGrid:
+    """격자를 ``cell_size`` x ``cell_size`` 타일 셀로 나눠 플레이어를 색인한다.
+
+    각 연결은 시야 반경(타일 단위)을 가지며, 셀 단위 체비셰프 거리로
+    "관찰자의 시야가 대상 셀을 포함하는지" 를 판정한다.
+    반경이 None 이면 맵 전체를 본다 (데스크톱 기본값).
+    """
+
+    def __init__(self, grid_width: int, grid_height: int, cell_size: int = AOI_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells_w = -(-grid_width // cell_size)
+        self.cells_h = -(-grid_height // cell_size)
+        self._members: list[set[str]] = [set() for _ in range(self.cells_w * self.cells_h)]
+        # {user_id: 셀 인덱스}
+        self._cell_of: dict[str, int] = {}
+        # {user_id: 셀 단위 시야 반경}
+        self._radius: dict[str, int] = {}
+        # 반경별 인원 (최대 반경 추적용)
+        self._radius_counts: Counter[int] = Counter()
+
+    # ------------------------------------------------------------------
+    # 좌표 변환
+    # ------------------------------------------------------------------
+
+    def cell_index(self, gx: int, gy: int) -> int:
+        return (gy // self.cell_size) * self.cells_w + (gx // self.cell_size)
+
+    def _to_cells(self, radius_tiles: int | None) -> int:
+        if radius_tiles is None:
+            return max(self.cells_w, self.cells_h)
+        return max(0, -(-radius_tiles // self.cell_size))
+
+    def _distance(self, a: int, b: int) -> int:
+        return max(
+            abs(a % self.cells_w - b % self.cells_w),
+            abs(a // self.cells_w - b // self.cells_w),
+        )
+
+    def cells_within(self, cell: int, radius: int) -> Iterator[int]:
+        """``cell`` 로부터 ``radius`` 셀 이내의 셀 인덱스들."""
+        cx, cy = cell % self.cells_w, cell // self.cells_w
+        for y in range(max(0, cy - radius), min(self.cells_h, cy + radius + 1)):
+            row = y * self.cells_w
+            for x in range(max(0, cx - radius), min(self.cells_w, cx + radius + 1)):
+                yield row + x
+
+    # ------------------------------------------------------------------
+    # 등록/갱신
+    # ------------------------------------------------------------------
+
+    def add(self, user_id: str, gx: int, gy: int, radius_tiles: int | None = None) -> int:
+        self.remove(user_id)
+        cell = self.cell_index(gx, gy)
+        self._members[cell].add(user_id)
+        self._cell_of[user_id] = cell
+        radius = self._to_cells(radius_tiles)
+        self._radius[user_id] = radius
+        self._radius_counts[radius] += 1
+        return cell
+
+    def move(self, user_id: str, gx: int, gy: int) -> tuple[int | None, int]:
+        """유저의 셀을 갱신하고 (이전 셀, 새 셀) 을 반환."""
+        old = self._cell_of.get(user_id)
+        new = self.cell_index(gx, gy)
+        if old != new:
+            if old is not None:
+                self._members[old].discard(user_id)
+            self._members[new].add(user_id)
+            self._cell_of[user_id] = new
+        return old, new
+
+    def set_radius(self, user_id: str, radius_tiles: int | None) -> int | None:
+        """시야 반경을 바꾸고 이전 반경(셀 단위)을 반환."""
+        old = self._radius.get(user_id)
+        if old is None:
+            return None
+        new = self._to_cells(radius_tiles)
+        self._radius_counts[old] -= 1
+        if not self._radius_counts[old]:
+            del self._radius_counts[old]
+        self._radius[user_id] = new
+        self._radius_counts[new] += 1
+        return old
+
+    def remove(self, user_id: str) -> None:
+        cell = self._cell_of.pop(user_id, None)
+        if cell is not None:
+            self._members[cell].discard(user_id)
+        radius = self._radius.pop(user_id, None)
+        if radius is not None:
+            self._radius_counts[radius] -= 1
+            if not self._radius_counts[radius]:
+                del self._radius_counts[radius]
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    def cell_of(self, user_id: str) -> int | None:
+        return self._cell_of.get(user_id)
+
+    def radius_of(self, user_id: str) -> int | None:
+        return self._radius.get(user_id)
+
+    def sees(self, observer: str, cell: int, radius: int | None = None, from_cell: int | None = None) -> bool:
+        """관찰자의 시야가 ``cell`` 을 포함하는지 (반경/위치를 덮어써서 판정 가능)."""
+        origin = self._cell_of.get(observer) if from_cell is None else from_cell
+        if origin is None:
+            return False
+        r = self._radius.get(observer, 0) if radius is None else radius
+        return self._distance(origin, cell) <= r
+
+    def members_near(self, gx: int, gy: int, radius_tiles: int) -> Iterator[str]:
+        """타일 ``(gx, gy)`` 를 중심으로 한 변 ``2 * radius_tiles + 1`` 정사각형과 겹치는 셀의 유저들.
+
+        정확한 거리 판정은 호출한 쪽이 좌표로 한다 (후보만 좁혀 줌).
+        """
+        size = self.cell_size
+        x0, x1 = max(0, (gx - radius_tiles) // size), min(self.cells_w - 1, (gx + radius_tiles) // size)
+        y0, y1 = max(0, (gy - radius_tiles) // size), min(self.cells_h - 1, (gy + radius_tiles) // size)
+        for y in range(y0, y1 + 1):
+            row = y * self.cells_w
+            for x in range(x0, x1 + 1):
+                yield from self._members[row + x]
+
+    def members_within(self, cell: int, radius: int) -> Iterator[str]:
+        """``cell`` 로부터 ``radius`` 셀 이내에 있는 유저들."""
+        for c in self.cells_within(cell, radius):
+            yield from self._members[c]
+
+    def observers_of(self, cell: int) -> set[str]:
+        """시야에 ``cell`` 이 들어오는 유저 집합."""
+        max_radius = max(self._radius_counts, default=0)
+        out: set[str] = set()
+        for c in self.cells_within(cell, max_radius):
+            members = self._members[c]
+            if not members:
+                continue
+            d = self._distance(c, cell)
+            for uid in members:
+                if d <= self._radius[uid]:
+                    out.add(uid)
+        return out
+
+    def visible_from(self, user_id: str) -> Iterable[str]:
+        """유저의 현재 시야 안에 있는 다른 유저들."""
+        cell = self._cell_of.get(user_id)
+        if cell is None:
+            return ()
+        return (uid for uid in self.members_within(cell, self._radius[user_id]) if uid != user_id)
+
+    def view_diff(
+        self,
+        user_id: str,
+        old_cell: int | None,
+        old_radius: int,
+        new_cell: int,
+        new_radius: int,
+    ) -> tuple[list[str], list[str]]:
+        """시야(셀/반경)가 바뀔 때 새로 보이게 된 유저와 안 보이게 된 유저."""
+        before: set[str] = set()
+        if old_cell is not None:
+            before = set(self.members_within(old_cell, old_radius))
+        after = set(self.members_within(new_cell, new_radius))
+        before.discard(user_id)
+        after.discard(user_id)
+        return list(after - before), list(before - after)
@@ -0,0 +1,114 @@
+"""수신 메시지 속도 제한 + 이동 검증 — 한 클라이언트가 전체 브로드캐스트를 부풀리지 않도록."""
+
+from __future__ import annotations
+
+import os
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ws.session import Position
+
+# 거부 사유 (counters 키)
+REJECT_THROTTLED = "throttled"  # 수신 메시지 속도 초과
+REJECT_DISTANCE = "distance"  # 한 번에 허용 거리보다 멀리 이동 (순간이동)
+REJECT_SPEED = "speed"  # 이동 속도 초과
+REJECT_BLOCKED = "blocked"  # 범위 밖 / 점유된 타일
+REJECT_NO_PATH = "no_path"  # move_to 목적지까지 갈 수 있는 경로 없음
+REJECT_CHAT_THROTTLED = "chat_throttled"  # 채팅 전송 속도 초과
+REJECT_CHAT_TOO_LONG = "chat_too_long"  # 채팅 길이 초과
+
+FLOOD_CLOSE_CODE = 1008  # policy violation
+
+
+@dataclass(frozen=True)
+class RateLimits:
+    """연결별 제한값. rate/max_step 이 0 이면 해당 검사를 끈다."""
+
+    message_rate: float = float(os.environ.get("WS_MSG_RATE", "30"))  # 초당 수신 메시지
+    message_burst: float = float(os.environ.get("WS_MSG_BURST", "60"))
+    move_rate: float = float(os.environ.get("WS_MOVE_RATE", "10"))  # 초당 이동 타일 수
+    move_burst: float = float(os.environ.get("WS_MOVE_BURST", "4"))
+    max_step: int = int(os.environ.get("WS_MAX_MOVE_STEP", "1"))  # 이동 1회 최대 맨해튼 거리
+    # 연속으로 이만큼 제한에 걸리면 연결 종료 (0 이면 끊지 않음)
+    flood_close_after: int = int(os.environ.get("WS_FLOOD_CLOSE", "300"))
+    chat_rate: float = float(os.environ.get("WS_CHAT_RATE", "1"))  # 초당 채팅 메시지
+    chat_burst: float = float(os.environ.get("WS_CHAT_BURST", "5"))
+    chat_max_length: int = int(os.environ.get("WS_CHAT_MAX_LENGTH", "200"))  # 글자 수
+
+
+UNLIMITED = RateLimits(0, 0, 0, 0, 0, 0, 0, 0, 0)
+
+
+class TokenBucket:
+    """초당 ``rate`` 개씩 채워지고 최대 ``burst`` 개까지 쌓이는 토큰 버킷."""
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+
+    def take(self, amount: float = 1.0) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < amount:
+            return False
+        self.tokens -= amount
+        return True
+
+
+class ConnectionLimiter:
+    """연결 하나의 수신 제한 상태 + 거부 카운터."""
+
+    def __init__(self, limits: RateLimits):
+        self.limits = limits
+        self._messages = TokenBucket(limits.message_rate, limits.message_burst) if limits.message_rate else None
+        self._moves = TokenBucket(limits.move_rate, limits.move_burst) if limits.move_rate else None
+        self._chats = TokenBucket(limits.chat_rate, limits.chat_burst) if limits.chat_rate else None
+        self.received = 0
+        self.rejected: dict[str, int] = {}
+        self._consecutive_throttled = 0
+
+    def allow_message(self) -> bool:
+        self.received += 1
+        if self._messages is None or self._messages.take():
+            self._consecutive_throttled = 0
+            return True
+        self._consecutive_throttled += 1
+        self.reject(REJECT_THROTTLED)
+        return False
+
+    @property
+    def flooding(self) -> bool:
+        close_after = self.limits.flood_close_after
+        return bool(close_after) and self._consecutive_throttled >= close_after
+
+    def check_move(self, current: Position | None, grid_x: int, grid_y: int) -> str | None:
+        """이동 검증. 통과하면 None, 아니면 거부 사유."""
+        if current is None:
+            return None
+        distance = abs(grid_x - current.x) + abs(grid_y - current.y)
+        if self.limits.max_step and distance > self.limits.max_step:
+            return REJECT_DISTANCE
+        if distance and self._moves is not None and not self._moves.take(distance):
+            return REJECT_SPEED
+        return None
+
+    def check_chat(self, message: str) -> str | None:
+        """채팅 검증 (길이 → 속도). 통과하면 None, 아니면 거부 사유."""
+        if self.limits.chat_max_length and len(message) > self.limits.chat_max_length:
+            return REJECT_CHAT_TOO_LONG
+        if self._chats is not None and not self._chats.take():
+            return REJECT_CHAT_THROTTLED
+        return None
+
+    def reject(self, reason: str) -> None:
+        self.rejected[reason] = self.rejected.get(reason, 0) + 1
+
+    def stats(self) -> dict:
+        return {"received": self.received, "rejected": dict(self.rejected)}
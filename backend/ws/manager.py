@@ -1,41 +1,221 @@
 import asyncio
+import heapq
 import json
 import logging
 import os
-import random
+import secrets
+import time
+from collections import deque
+from datetime import datetime, timezone
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import asdict
+from typing import TYPE_CHECKING
+import numpy as np
 from fastapi import WebSocket
-import httpx
+
+from ws.backplane import Backplane, create_backplane
+from ws.grid import OccupancyGrid
+from ws.interest import InterestGrid
+from ws.pathfinding import PathPlanner
+from ws.movelog import MoveLog
+from ws.npc import NpcSimulation
+from ws.limits import (
+    FLOOD_CLOSE_CODE,
+    REJECT_BLOCKED,
+    REJECT_NO_PATH,
+    REJECT_THROTTLED,
+    ConnectionLimiter,
+    RateLimits,
+)
+from ws.persistence import PositionStore
+from ws.sender import ConnectionSender, OVERFLOW_POLICY
+from ws.session import Position, Session, freeze_info
+from ws import protocol
+
+if TYPE_CHECKING:
+    from ws.collision import CollisionMap
+    from ws.rooms import Door
 
 logger = logging.getLogger(__name__)
 
 TILE_SIZE = 64  # pixels per tile
-GRID_WIDTH = 24  # number of tiles horizontally
+GRID_WIDTH = 24  # number of tiles horizontally (기본 맵, 룸별 크기는 ws.rooms 설정)
 GRID_HEIGHT = 12  # number of tiles vertically
+DEFAULT_ROOM = "main"
+
+# 틱 모드 주기 (Hz). 0 이면 이동 메시지마다 즉시 전송하는 기존 방식
+TICK_RATE = float(os.environ.get("WS_TICK_RATE", "0"))
+
+# 워커 간 백플레인 (비어 있으면 단일 프로세스 인메모리, 예: unix:///tmp/cgtown-ws.sock)
+BACKPLANE_URL = os.environ.get("WS_BACKPLANE", "")
+
+# 연결이 끊긴 뒤 resume 토큰으로 재접속을 기다리는 시간 (초). 그 안에는 퇴장 처리하지 않음
+RESUME_GRACE = float(os.environ.get("WS_RESUME_GRACE", "30"))
+
+# 애플리케이션 레벨 heartbeat (초). 간격마다 ping 을 보내고, timeout 동안 아무 메시지도
+# 받지 못한 연결(절전 노트북 같은 half-open TCP)은 정리한다. 간격이 0 이면 끔
+HEARTBEAT_INTERVAL = float(os.environ.get("WS_HEARTBEAT_INTERVAL", "15"))
+HEARTBEAT_TIMEOUT = float(os.environ.get("WS_HEARTBEAT_TIMEOUT", "45"))
+HEARTBEAT_CLOSE_CODE = 4004
+
+_PING = json.dumps({"type": "ping"})
+
+# 근접 채팅 — 보낸 사람으로부터 반경(타일) 안의 플레이어에게만 전달.
+# 거리 기준은 "manhattan"(|dx| + |dy|, 마름모) 또는 "chebyshev"(max(|dx|, |dy|), 정사각형)
+CHAT_RADIUS = int(os.environ.get("WS_CHAT_RADIUS", "4"))
+CHAT_METRIC = os.environ.get("WS_CHAT_METRIC", "manhattan")
+CHAT_METRICS = ("manhattan", "chebyshev")
+
+# move_to 경로를 서버가 한 칸씩 진행하는 간격 (초). 프론트 MOVE_DURATION 과 맞춘다
+PATH_STEP = float(os.environ.get("WS_PATH_STEP", "0.15"))
+
+# 스폰 위치가 NPC 타일일 때 빈 타일을 찾아보는 횟수
+NPC_RESPAWN_TRIES = 8
 
 
 class ConnectionManager:
-    def __init__(self):
-        # {user_id: {"ws": WebSocket, "user_info": {...}, "token": str}}
-        self.active_connections: dict[str, dict] = {}
-        # {user_id: {"gridX": int, "gridY": int, "direction": str}}
-        self.positions: dict[str, dict] = {}
-
-    def _find_spawn_position(self) -> dict:
-        """Find a random non-overlapping spawn tile."""
-        occupied = {
-            (pos["gridX"], pos["gridY"]) for pos in self.positions.values()
-        }
-        for _ in range(200):
-            gx = random.randint(1, GRID_WIDTH - 2)
-            gy = random.randint(1, GRID_HEIGHT - 2)
-            if (gx, gy) not in occupied:
-                return {"gridX": gx, "gridY": gy, "direction": "down"}
-        # Fallback: scan for any free tile
-        for gx in range(1, GRID_WIDTH - 1):
-            for gy in range(1, GRID_HEIGHT - 1):
-                if (gx, gy) not in occupied:
-                    return {"gridX": gx, "gridY": gy, "direction": "down"}
-        return {"gridX": 1, "gridY": 1, "direction": "down"}
+    def __init__(
+        self,
+        grid_width: int = GRID_WIDTH,
+        grid_height: int = GRID_HEIGHT,
+        overflow_policy: str = OVERFLOW_POLICY,
+        tick_rate: float = TICK_RATE,
+        backplane: Backplane | None = None,
+        limits: RateLimits | None = None,
+        heartbeat_interval: float = HEARTBEAT_INTERVAL,
+        heartbeat_timeout: float = HEARTBEAT_TIMEOUT,
+        room: str = DEFAULT_ROOM,
+        persistence: PositionStore | None = None,
+        chat_radius: int = CHAT_RADIUS,
+        chat_metric: str = CHAT_METRIC,
+        path_step: float = PATH_STEP,
+        move_log: MoveLog | None = None,
+        npcs: NpcSimulation | None = None,
+    ):
+        if chat_metric not in CHAT_METRICS:
+            raise ValueError(f"Unknown chat metric: {chat_metric}")
+        # 룸(맵) 하나 = ConnectionManager 하나. 점유 상태/브로드캐스트 범위가 룸마다 따로
+        self.room = room
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.overflow_policy = overflow_policy
+        self.tick_rate = tick_rate
+        # 틱 모드: 이번 틱에 위치가 바뀐 유저 (dict 를 순서 있는 집합으로 사용)
+        self._dirty: dict[str, None] = {}
+        self._tick_seq = 0
+        self._tick_task: asyncio.Task | None = None
+        # {user_id: Session} — 이 워커에 접속한 플레이어
+        self.active_connections: dict[str, Session] = {}
+        # {user_id: Position} — 로컬/원격 플레이어 위치. 이동은 레코드를 제자리에서 갱신한다
+        self.positions: dict[str, Position] = {}
+        # positions 와 항상 동기화되는 타일 점유 인덱스 (충돌 검사 O(1))
+        self.grid = OccupancyGrid(grid_width, grid_height)
+        # 클라이언트에 보내는 충돌 레이어 (CollisionMap.encode, 없으면 None) — 클라이언트가 벽으로 가는 이동을 미리 막음
+        self._collision: str | None = None
+        # 관심 영역(AOI) 색인 — 이동 이벤트를 시야 안의 클라이언트에게만 전송
+        self.interest = InterestGrid(grid_width, grid_height)
+        # 바이너리 프로토콜용 세션별 작은 정수 인덱스 (반납된 번호는 작은 것부터 재사용)
+        self.player_index: dict[str, int] = {}
+        self._free_indices: list[int] = []
+        self._next_index = 0
+        # 위치 저장 write-behind (연결 종료가 Supabase 응답을 기다리지 않음). 룸끼리 공유할 수 있음
+        self._owns_persistence = persistence is None
+        self.persistence = persistence or PositionStore()
+        # 워커 간 중계 + 권위 있는 점유 상태. 다른 워커 소속 플레이어는 remote_players 에
+        # {user_id: user_info (읽기 전용)} 로 두고 positions/grid/interest 에는 로컬 플레이어와 똑같이 올린다.
+        self.backplane = backplane or create_backplane(BACKPLANE_URL, grid_width, grid_height)
+        self.remote_players: dict[str, Mapping] = {}
+        self._backplane_started = False
+        # 연결별 수신 속도 제한 / 이동 검증 설정과 전체 거부 카운터
+        self.limits = limits or RateLimits()
+        self.rejected_totals: dict[str, int] = {}
+        # heartbeat — 연결마다 Session.last_seen (마지막 수신 시각, monotonic) 을 갱신
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self._heartbeat_task: asyncio.Task | None = None
+        self.reaped_total = 0
+        # 문 타일 {(gridX, gridY): Door} — 밟으면 on_door(user_id, door) 로 다른 룸으로 이동
+        self.doors: dict[tuple[int, int], "Door"] = {}
+        self.on_door: Callable[[str, "Door"], Awaitable[None]] | None = None
+        # 다른 워커가 보낸 룸과 무관한 알림 (캐시 무효화 등) — on_worker_event(이름)
+        self.on_worker_event: Callable[[str], None] | None = None
+        # 근접 채팅 범위
+        self.chat_radius = chat_radius
+        self.chat_metric = chat_metric
+        # move_to — 서버가 A* 로 경로를 계획하고 경로 전체를 한 번만 알린 뒤 직접 한 칸씩 진행.
+        # {user_id: {"goal": (x, y), "path": deque[(x, y)]}} (이 워커 소속 플레이어)
+        self.path_step = path_step
+        self.planner = PathPlanner(grid_width, grid_height)
+        self._walks: dict[str, dict] = {}
+        self._walk_task: asyncio.Task | None = None
+        # 다른 워커 소속 플레이어의 남은 경로 — 그 워커가 보내는 한 칸 이동은 다시 알리지 않음
+        self._remote_paths: dict[str, deque] = {}
+        self.path_reroutes = 0
+        # 미리 인코딩해 둔 플레이어 JSON 조각 — init/view_enter/player_joined 를 조각 이어붙이기로 조립
+        # {user_id: user_info JSON} 은 입장(또는 정보 변경) 때만, {user_id: players 항목 조각} 은
+        # 위치가 바뀌면 버렸다가 다음에 필요할 때 다시 만든다.
+        self._info_json: dict[str, str] = {}
+        self._entry_json: dict[str, str] = {}
+        # 확정된 로컬 이동을 남기는 분석용 로그 (없으면 기록 안 함, 닫는 것은 만든 쪽)
+        self.move_log = move_log
+        # 서버 시뮬레이션 NPC — 자체 고정 주기 틱으로 움직이고, 틱마다 움직인 NPC 를 한 메시지로 전송
+        self.npcs = npcs
+        self._npc_task: asyncio.Task | None = None
+
+    def _assign_index(self, user_id: str) -> int:
+        idx = self.player_index.get(user_id)
+        if idx is None:
+            if self._free_indices:
+                idx = heapq.heappop(self._free_indices)
+            else:
+                idx = self._next_index
+                self._next_index += 1
+            self.player_index[user_id] = idx
+        # 입장 때마다 호출되므로 user_info 가 바뀌었을 수 있음
+        self._invalidate_player(user_id)
+        return idx
+
+    def _release_index(self, user_id: str):
+        idx = self.player_index.pop(user_id, None)
+        if idx is not None:
+            heapq.heappush(self._free_indices, idx)
+        self._invalidate_player(user_id)
+
+    def _set_position(self, user_id: str, gx: int, gy: int, direction: str) -> Position:
+        """백플레인이 확정한 위치를 positions 와 로컬 점유 인덱스에 반영 (기존 레코드는 제자리 갱신).
+
+        로컬 인덱스는 권위 상태의 사본이라 다른 워커의 이동 이벤트가 아직 도착하지 않아
+        대상 타일이 점유된 것으로 보일 수 있다. 그 경우 이전 점유자를 격자에서 먼저 내린다
+        (그 점유자의 위치는 곧 도착할 이벤트로 다시 올라간다).
+        """
+        if not self.grid.move(user_id, gx, gy):
+            stale = self.grid.occupant(gx, gy)
+            if stale is not None:
+                self.grid.remove(stale)
+            if not self.grid.move(user_id, gx, gy):
+                # 빈 타일이 하나도 없는 경우 — 격자에는 올리지 않고 위치만 기록
+                self.grid.remove(user_id)
+        position = self.positions.get(user_id)
+        if position is None:
+            position = self.positions[user_id] = Position(gx, gy, direction)
+        else:
+            position.set(gx, gy, direction)
+        self._entry_json.pop(user_id, None)
+        return position
+
+    def _user_info(self, user_id: str) -> Mapping | None:
+        conn = self.active_connections.get(user_id)
+        if conn is not None:
+            return conn.user_info
+        return self.remote_players.get(user_id)
+
+    async def start(self):
+        """백플레인 구독 시작 — 다른 워커에 이미 있는 플레이어를 불러온다."""
+        if self._backplane_started:
+            return
+        self._backplane_started = True
+        for player in await self.backplane.start(self._on_backplane_event):
+            self._add_remote(player["user_id"], player["user_info"], player["position"])
 
     async def connect(
         self,
@@ -43,122 +223,341 @@ class ConnectionManager:
         user_info: dict,
         websocket: WebSocket,
         token: str,
-        saved_position: dict | None = None,
+        saved_position: Mapping | None = None,
+        view_radius: int | None = None,
+        binary: bool = False,
     ):
+        await self.start()
         # 같은 user_id로 이미 연결되어 있으면 기존 연결 끊기 (중복 연결 방지)
         if user_id in self.active_connections:
             old_conn = self.active_connections[user_id]
-            old_ws = old_conn.get("ws")
+            old_ws = old_conn.ws
             logger.info(f"Closing existing connection for {user_id} (duplicate connect)")
-            try:
-                await old_ws.close(code=4002, reason="duplicate_connection")
-            except Exception:
-                pass
+            old_conn.sender.stop()
+            self._cancel_expiry(old_conn)
+            if old_ws is not None:
+                try:
+                    await old_ws.close(code=4002, reason="duplicate_connection")
+                except Exception:
+                    pass
             # 기존 위치는 유지 (saved_position으로 사용)
             if user_id in self.positions and saved_position is None:
                 saved_position = self.positions[user_id]
             # 기존 연결 정보 제거 (위치는 유지)
             self.active_connections.pop(user_id, None)
+        elif user_id in self.remote_players:
+            # 다른 워커에 남아 있던 세션 — 그 워커는 백플레인 join 이벤트를 받고 연결을 끊는다
+            if saved_position is None:
+                saved_position = self.positions.get(user_id)
+            self.remote_players.pop(user_id, None)
 
-        await websocket.accept()
-        self.active_connections[user_id] = {
-            "ws": websocket,
-            "user_info": user_info,
-            "token": token,
-        }
+        # binary: 클라이언트가 cgtown.bin.v1 서브프로토콜을 요청한 경우 위치 트래픽을 바이너리로
+        await websocket.accept(subprotocol=protocol.SUBPROTOCOL_BINARY if binary else None)
+        sender = ConnectionSender(websocket, policy=self.overflow_policy)
+        sender.start()
+        conn = Session(
+            websocket,
+            sender,
+            user_info,
+            token,
+            ConnectionLimiter(self.limits),
+            resume_token=secrets.token_urlsafe(24),
+            last_seen=time.monotonic(),
+            binary=binary,
+        )
+        await self.admit(user_id, conn, saved_position, view_radius)
+
+    async def admit(
+        self,
+        user_id: str,
+        conn: Session,
+        saved_position: Mapping | None = None,
+        view_radius: int | None = None,
+    ):
+        """연결을 이 룸에 올린다 — 스폰 위치 확정, init 전송, 입장 알림.
+
+        새 접속(connect)과 다른 룸에서 문을 통해 넘어온 연결(release 로 받은 conn)이 공용으로 쓴다.
+        """
+        self._ensure_tick_loop()
+        self._ensure_heartbeat_loop()
+        self._ensure_npc_loop()
+        self.active_connections[user_id] = conn
+        # 타일 단위 시야 반경 (룸을 옮길 때 그대로 가져감)
+        conn.view_radius = view_radius
+        conn.handle = self._assign_index(user_id)
         # Use saved position if available and not occupied, else random spawn
-        spawn = None
+        # (점유/벽 판정과 무작위 스폰은 충돌 레이어를 함께 가진 백플레인 권위 상태가 한다)
+        preferred = None
         if saved_position:
             gx = saved_position.get("gridX", saved_position.get("x"))
             gy = saved_position.get("gridY", saved_position.get("y"))
-            if gx is not None and gy is not None:
-                occupied = {
-                    (pos["gridX"], pos["gridY"]) for pos in self.positions.values()
+            # 저장된 위치가 벽/가구 위(맵이 바뀐 경우)면 버림
+            if isinstance(gx, int) and isinstance(gy, int) and self.grid.in_bounds(gx, gy) and not self.grid.is_wall(gx, gy):
+                preferred = {
+                    "gridX": gx,
+                    "gridY": gy,
+                    "direction": saved_position.get("direction", "down"),
                 }
-                if (gx, gy) not in occupied:
-                    spawn = {
-                        "gridX": gx,
-                        "gridY": gy,
-                        "direction": saved_position.get("direction", "down"),
-                    }
-                    logger.info(f"Restored position for {user_id}: ({gx}, {gy})")
-        if spawn is None:
-            spawn = self._find_spawn_position()
+        restored = preferred is not None
+        spawn = await self.backplane.join(user_id, dict(conn.user_info), preferred)
+        spawn = await self._step_off_npc(user_id, spawn)
+        if restored and spawn == preferred:
+            logger.info(f"Restored position for {user_id}: ({spawn['gridX']}, {spawn['gridY']})")
+        else:
             logger.info(f"Random spawn for {user_id}: ({spawn['gridX']}, {spawn['gridY']})")
-        self.positions[user_id] = spawn
-        # Send current state to new player
-        await websocket.send_json({
+        position = self._set_position(user_id, spawn["gridX"], spawn["gridY"], spawn.get("direction", "down"))
+        if self.move_log is not None:
+            self.move_log.append(conn.handle, position.x, position.y)
+        cell = self.interest.add(user_id, position.x, position.y, view_radius)
+        # Send current state to new player (시야 안의 플레이어만)
+        conn.sender.send_control(self._init_message(user_id))
+        # Notify others about new player (스폰 셀이 시야에 들어오는 클라이언트만)
+        observers = self.interest.observers_of(cell)
+        observers.discard(user_id)
+        await self.send_to(observers, self._joined_message(user_id))
+
+    def _init_message(self, user_id: str) -> str:
+        """전체 스냅샷 — 처음 접속 또는 resume 간격이 재전송 버퍼보다 클 때.
+
+        players 는 플레이어별로 캐시된 JSON 조각을 이어붙여 만든다 (방 전체를 다시 직렬화하지 않음).
+        """
+        conn = self.active_connections[user_id]
+        user_info = conn.user_info
+        head = json.dumps({
             "type": "init",
-            "your_position": spawn,
+            "your_id": user_id,
+            "your_index": conn.handle,
+            "your_position": self.positions[user_id].as_dict(),
             "your_email_prefix": user_info.get("email_prefix", ""),
             "your_status_message": user_info.get("status_message", ""),
-            "players": {
-                uid: {
-                    "position": self.positions[uid],
-                    "user_info": conn["user_info"],
-                }
-                for uid, conn in self.active_connections.items()
-                if uid != user_id
+            "resume_token": conn.resume_token,
+            "room": {
+                "name": self.room,
+                "width": self.grid_width,
+                "height": self.grid_height,
+                "collision": self._collision,
             },
         })
-        # Notify others about new player
-        await self.broadcast(
-            json.dumps({
-                "type": "player_joined",
-                "user_id": user_id,
-                "user_info": user_info,
-                "position": spawn,
-            }),
-            exclude=user_id,
+        players = self._players_json(self.interest.visible_from(user_id))
+        if self.npcs is None:
+            return f'{head[:-1]}, "players": {players}}}'
+        return f'{head[:-1]}, "players": {players}, "npcs": {json.dumps(self.npcs.entries())}}}'
+
+    # ------------------------------------------------------------------
+    # 세션 재개 (resume)
+    # ------------------------------------------------------------------
+
+    async def resume(
+        self,
+        user_id: str,
+        websocket: WebSocket,
+        resume_token: str,
+        last_seq: int | None,
+        binary: bool = False,
+        view_radius: int | None = None,
+    ) -> bool:
+        """resume 토큰이 맞으면 기존 세션에 새 소켓을 이어 붙인다 (입장 브로드캐스트 없음).
+
+        끊긴 동안 놓친 프레임만 다시 보내고, 간격이 재전송 버퍼보다 크면 init 스냅샷을 보낸다.
+        세션이 없거나 토큰이 다르면 False — 호출자는 일반 connect 로 진행.
+        """
+        conn = self.active_connections.get(user_id)
+        if conn is None or conn.sender.closed:
+            return False
+        if not secrets.compare_digest(conn.resume_token, resume_token):
+            return False
+
+        await websocket.accept(subprotocol=protocol.SUBPROTOCOL_BINARY if binary else None)
+        self._cancel_expiry(conn)
+        old_ws = conn.ws
+        conn.ws = websocket
+        conn.last_seen = time.monotonic()
+        if old_ws is not None:
+            # 이전 소켓이 아직 살아 있음 (중복 연결) — 세션은 새 소켓이 이어받음
+            try:
+                await old_ws.close(code=4002, reason="duplicate_connection")
+            except Exception:
+                pass
+
+        sender = conn.sender
+        resumed = {"type": "resumed", "resume_token": conn.resume_token}
+        # 프로토콜이 바뀌면 보관된 프레임 형식이 맞지 않으므로 스냅샷
+        replay_from = last_seq if conn.binary == binary else None
+        conn.binary = binary
+        if sender.attach(websocket, replay_from, resumed):
+            logger.info(f"Resumed session for {user_id} from seq {last_seq}")
+        else:
+            logger.info(f"Resumed session for {user_id} with full snapshot (seq {last_seq})")
+            sender.send_control(self._init_message(user_id))
+        # 재접속 사이 화면 크기가 바뀌었을 수 있음
+        await self.set_view_radius(user_id, view_radius)
+        return True
+
+    def suspend(self, user_id: str, websocket: WebSocket) -> bool:
+        """소켓이 끊겼지만 세션은 ``RESUME_GRACE`` 초 동안 유지 (재접속 대기).
+
+        세션을 유지하면 True, 이미 정리할 상태면 False (호출자가 disconnect).
+        """
+        conn = self.active_connections.get(user_id)
+        if conn is None or conn.ws is not websocket:
+            return False
+        if RESUME_GRACE <= 0 or conn.sender.closed:
+            return False
+        conn.sender.detach()
+        conn.ws = None
+        conn.expiry = asyncio.create_task(self._expire_session(user_id, conn.sender))
+        return True
+
+    async def _expire_session(self, user_id: str, sender: ConnectionSender):
+        await asyncio.sleep(RESUME_GRACE)
+        conn = self.active_connections.get(user_id)
+        if conn is None or conn.sender is not sender or conn.ws is not None:
+            return
+        conn.expiry = None  # 자기 자신을 취소하지 않도록
+        logger.info(f"Resume grace expired for {user_id}")
+        if await self.disconnect(user_id):
+            await self.broadcast_disconnect(user_id)
+
+    def _cancel_expiry(self, conn: Session):
+        task = conn.expiry
+        if task is not None:
+            task.cancel()
+            conn.expiry = None
+
+    # ------------------------------------------------------------------
+    # 플레이어 JSON 조각 캐시
+    # ------------------------------------------------------------------
+
+    def _invalidate_player(self, user_id: str) -> None:
+        """user_info 가 바뀌거나 플레이어가 빠졌을 때 캐시된 조각을 버린다."""
+        self._info_json.pop(user_id, None)
+        self._entry_json.pop(user_id, None)
+
+    def _user_info_json(self, user_id: str) -> str | None:
+        info = self._info_json.get(user_id)
+        if info is None:
+            user_info = self._user_info(user_id)
+            if user_info is None:
+                return None
+            info = self._info_json[user_id] = json.dumps(dict(user_info))
+        return info
+
+    def _player_entry(self, user_id: str) -> str | None:
+        """players 객체의 한 항목 ``"uid": {"index", "position", "user_info"}`` (캐시)."""
+        entry = self._entry_json.get(user_id)
+        if entry is None:
+            position = self.positions.get(user_id)
+            info = self._user_info_json(user_id)
+            if position is None or info is None:
+                return None
+            entry = self._entry_json[user_id] = (
+                f'{json.dumps(user_id)}: {{"index": {json.dumps(self.player_index.get(user_id))}, '
+                f'"position": {position.json()}, "user_info": {info}}}'
+            )
+        return entry
+
+    def _players_json(self, user_ids) -> str:
+        """init / view_enter 메시지의 players 객체 — 캐시된 항목을 이어붙이기만 한다."""
+        entries = [entry for entry in map(self._player_entry, user_ids) if entry is not None]
+        return "{" + ", ".join(entries) + "}"
+
+    def _players_message(self, msg_type: str, user_ids) -> str:
+        return f'{{"type": "{msg_type}", "players": {self._players_json(user_ids)}}}'
+
+    def _joined_message(self, user_id: str) -> str:
+        return (
+            f'{{"type": "player_joined", "user_id": {json.dumps(user_id)}, '
+            f'"index": {self.player_index[user_id]}, "user_info": {self._user_info_json(user_id)}, '
+            f'"position": {self.positions[user_id].json()}}}'
         )
 
-    async def save_position(self, user_id: str):
-        """Save user's current position to Supabase user_metadata."""
+    async def update_player_info(self, user_id: str, changes: dict, relay: bool = True) -> bool:
+        """user_info 일부(상태 메시지 등)가 바뀜 — 그 플레이어가 보이는 클라이언트에게 바뀐 필드만 전송.
+
+        이 워커가 모르는 플레이어면 False. ``relay`` 면 다른 워커의 관찰자 몫은 백플레인으로 넘긴다.
+        """
+        user_info = self._user_info(user_id)
+        if user_info is None:
+            return False
+        changes = {key: value for key, value in changes.items() if user_info.get(key) != value}
+        if not changes:
+            return True
+        # user_info 는 읽기 전용 — 바뀐 필드를 합친 새 매핑으로 교체
+        user_info = freeze_info({**user_info, **changes})
+        conn = self.active_connections.get(user_id)
+        if conn is not None:
+            conn.user_info = user_info
+        else:
+            self.remote_players[user_id] = user_info
+        self._invalidate_player(user_id)
+        cell = self.interest.cell_of(user_id)
+        observers = self.interest.observers_of(cell) if cell is not None else set()
+        # 본인에게도 (다른 탭/기기에서 바꾼 경우)
+        observers.add(user_id)
+        await self.send_to(observers, json.dumps({
+            "type": "player_updated",
+            "user_id": user_id,
+            "user_info": changes,
+        }))
+        if relay:
+            await self.backplane.publish({"type": "player_updated", "user_id": user_id, "changes": changes})
+        return True
+
+    def save_position(self, user_id: str):
+        """현재 위치를 write-behind 저장소에 기록 (Supabase 저장은 백그라운드 flush 에서)."""
         conn = self.active_connections.get(user_id)
         pos = self.positions.get(user_id)
         if not conn or not pos:
             return
+        # 재접속 때 같은 룸으로 돌아올 수 있도록 룸 이름도 함께 저장
+        self.persistence.mark_dirty(user_id, conn.token, {**pos, "room": self.room})
 
-        token = conn.get("token")
-        if not token:
-            return
-
-        supabase_url = os.environ.get("SUPABASE_URL")
-        supabase_key = os.environ.get("SUPABASE_KEY")
-        if not supabase_url or not supabase_key:
-            return
-
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.put(
-                    f"{supabase_url}/auth/v1/user",
-                    headers={
-                        "Authorization": f"Bearer {token}",
-                        "apikey": supabase_key,
-                        "Content-Type": "application/json",
-                    },
-                    json={
-                        "data": {
-                            "last_position": {
-                                "gridX": pos["gridX"],
-                                "gridY": pos["gridY"],
-                                "direction": pos.get("direction", "down"),
-                            }
-                        }
-                    },
-                    timeout=5.0,
-                )
-                if response.status_code == 200:
-                    logger.info(f"Saved position for {user_id}: ({pos['gridX']}, {pos['gridY']})")
-                else:
-                    logger.warning(f"Failed to save position for {user_id}: {response.status_code}")
-        except Exception as e:
-            logger.error(f"Error saving position for {user_id}: {e}")
+    async def disconnect(self, user_id: str, websocket: WebSocket | None = None) -> bool:
+        """연결 정리. ``websocket`` 을 주면 그 소켓이 현재 연결일 때만 정리한다.
 
-    async def disconnect(self, user_id: str):
-        await self.save_position(user_id)
+        중복 연결로 교체된 이전 소켓의 수신 루프가 늦게 끝나면서
+        새 연결을 지워버리지 않도록 하기 위함. 정리했으면 True.
+        """
+        conn = self.active_connections.get(user_id)
+        if conn is None or (websocket is not None and conn.ws is not websocket):
+            return False
+        conn.sender.stop()
+        self._cancel_expiry(conn)
+        self.save_position(user_id)
         self.active_connections.pop(user_id, None)
         self.positions.pop(user_id, None)
+        self.grid.remove(user_id)
+        self.interest.remove(user_id)
+        self._dirty.pop(user_id, None)
+        self._walks.pop(user_id, None)
+        self._remote_paths.pop(user_id, None)
+        self._log_leave(user_id)
+        self._release_index(user_id)
+        await self.backplane.leave(user_id)
+        return True
+
+    def _log_leave(self, user_id: str) -> None:
+        """이동 로그에 퇴장 표시 — 같은 핸들을 다음 유저가 재사용해도 머문 시간이 이어지지 않게."""
+        idx = self.player_index.get(user_id)
+        if self.move_log is not None and idx is not None:
+            self.move_log.append_leave(idx)
+
+    async def release(self, user_id: str) -> Session | None:
+        """소켓은 그대로 두고 이 룸에서만 내보낸다 (문을 통한 룸 이동). 떼어낸 conn 반환."""
+        conn = self.active_connections.pop(user_id, None)
+        if conn is None:
+            return None
+        self.positions.pop(user_id, None)
+        self.grid.remove(user_id)
+        self.interest.remove(user_id)
+        self._dirty.pop(user_id, None)
+        self._walks.pop(user_id, None)
+        self._remote_paths.pop(user_id, None)
+        self._log_leave(user_id)
+        self._release_index(user_id)
+        await self.backplane.leave(user_id)
+        await self.broadcast_disconnect(user_id)
+        return conn
 
     async def broadcast_disconnect(self, user_id: str):
         await self.broadcast(
@@ -169,43 +568,852 @@ class ConnectionManager:
         )
 
     async def broadcast(self, message: str, exclude: str = None):
-        disconnected = []
-        for uid, conn in self.active_connections.items():
-            if uid == exclude:
+        await self.send_to(
+            [uid for uid in self.active_connections if uid != exclude],
+            message,
+        )
+
+    async def send_to(
+        self,
+        user_ids,
+        message: str,
+        key: str | None = None,
+        binary: bytes | None = None,
+    ):
+        """지정한 유저들의 송신 큐에 메시지를 넣는다 (전송 완료를 기다리지 않음).
+
+        ``key`` 가 있으면 같은 key 의 대기 중인 메시지를 최신 것으로 교체할 수 있다.
+        ``binary`` 가 있으면 바이너리 프로토콜 클라이언트에게는 그것을 보낸다.
+        전송 실패/큐 초과 시 해당 소켓만 닫히고, 정리는 엔드포인트 수신 루프가 한다.
+        """
+        for uid in user_ids:
+            conn = self.active_connections.get(uid)
+            if conn is None:
                 continue
+            if binary is not None and conn.binary:
+                conn.sender.send(binary, key)
+            else:
+                conn.sender.send(message, key)
+
+    def connection_metrics(self) -> dict:
+        """연결별 송신 큐 깊이 / 전송 지연 / 수신 제한 / 마지막 수신 후 경과 시간."""
+        now = time.monotonic()
+        return {
+            uid: {
+                **conn.sender.stats(),
+                "inbound": conn.limiter.stats(),
+                "idle_s": round(now - conn.last_seen, 1),
+            }
+            for uid, conn in self.active_connections.items()
+        }
+
+    def limit_metrics(self) -> dict:
+        """수신 제한 설정값 + 사유별 누적 거부 수."""
+        return {"limits": asdict(self.limits), "rejected": dict(self.rejected_totals)}
+
+    # ------------------------------------------------------------------
+    # heartbeat / 죽은 연결 정리
+    # ------------------------------------------------------------------
+
+    def mark_alive(self, user_id: str) -> None:
+        """클라이언트에게서 무엇이든 받으면 호출 (pong 포함)."""
+        conn = self.active_connections.get(user_id)
+        if conn is not None:
+            conn.last_seen = time.monotonic()
+
+    def _ensure_heartbeat_loop(self):
+        if self.heartbeat_interval and (self._heartbeat_task is None or self._heartbeat_task.done()):
+            self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+
+    async def _heartbeat_loop(self):
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
             try:
-                await conn["ws"].send_text(message)
-            except Exception:
-                disconnected.append(uid)
-        for uid in disconnected:
-            await self.disconnect(uid)
+                await self.reap_stale()
+                for conn in self.active_connections.values():
+                    if conn.ws is not None:
+                        conn.sender.send_control(_PING)
+            except Exception as e:
+                logger.error(f"Heartbeat failed: {e}")
+
+    async def reap_stale(self) -> list[str]:
+        """timeout 동안 아무것도 보내지 않은 연결을 한꺼번에 정리한다.
+
+        퇴장 알림은 정리한 유저를 모아 ``players_left`` 한 번으로 보낸다.
+        재접속 대기 중인(소켓이 없는) 세션은 resume 만료가 따로 처리하므로 건드리지 않는다.
+        """
+        deadline = time.monotonic() - self.heartbeat_timeout
+        stale = [
+            uid for uid, conn in self.active_connections.items()
+            if conn.ws is not None and conn.last_seen < deadline
+        ]
+        reaped = []
+        for uid in stale:
+            conn = self.active_connections.get(uid)
+            if conn is None or conn.ws is None:
+                continue
+            conn.sender.abort(code=HEARTBEAT_CLOSE_CODE, reason="heartbeat_timeout")
+            if await self.disconnect(uid):
+                reaped.append(uid)
+        if not reaped:
+            return reaped
+        self.reaped_total += len(reaped)
+        logger.info(f"Reaped {len(reaped)} stale WS connections (no heartbeat for {self.heartbeat_timeout}s)")
+        await self.broadcast(json.dumps({
+            "type": "players_left",
+            "user_ids": reaped,
+        }))
+        return reaped
+
+    def heartbeat_metrics(self) -> dict:
+        """누적 정리 수 + 현재 좀비(ping 에 두 번 이상 응답 없이 아직 정리 전) / 재접속 대기 수."""
+        zombie_after = time.monotonic() - self.heartbeat_interval * 2
+        attached = [conn for conn in self.active_connections.values() if conn.ws is not None]
+        return {
+            "interval": self.heartbeat_interval,
+            "timeout": self.heartbeat_timeout,
+            "reaped": self.reaped_total,
+            "zombies": sum(1 for conn in attached if conn.last_seen < zombie_after),
+            "suspended": len(self.active_connections) - len(attached),
+        }
+
+    # ------------------------------------------------------------------
+    # 수신 제한 / 이동 검증
+    # ------------------------------------------------------------------
+
+    def allow_message(self, user_id: str) -> bool:
+        """수신 메시지 토큰 버킷 검사. 초과하면 메시지를 버리고 현재 위치로 보정."""
+        conn = self.active_connections.get(user_id)
+        if conn is None:
+            return False
+        limiter = conn.limiter
+        if limiter.allow_message():
+            return True
+        self._count_reject(REJECT_THROTTLED)
+        # 버려진 메시지가 이동이었을 수 있으므로 위치 보정
+        self._send_correction(user_id, REJECT_THROTTLED)
+        if limiter.flooding and not conn.sender.closed:
+            logger.warning(f"Closing {user_id}: inbound message flood")
+            conn.sender.abort(code=FLOOD_CLOSE_CODE, reason="rate_limited")
+        return False
+
+    def _reject_move(self, user_id: str, reason: str):
+        conn = self.active_connections.get(user_id)
+        if conn is None:
+            return
+        conn.limiter.reject(reason)
+        self._count_reject(reason)
+        self._send_correction(user_id, reason)
+
+    def _count_reject(self, reason: str):
+        self.rejected_totals[reason] = self.rejected_totals.get(reason, 0) + 1
+
+    def _send_correction(self, user_id: str, reason: str):
+        """서버가 알고 있는 위치를 본인에게 다시 알려준다 (대기 중인 보정은 최신 것 하나만)."""
+        conn = self.active_connections.get(user_id)
+        pos = self.positions.get(user_id)
+        if conn is None or pos is None:
+            return
+        conn.sender.send(json.dumps({
+            "type": "correction",
+            "position": pos.as_dict(),
+            "reason": reason,
+        }), key="correction")
 
     async def handle_move(self, user_id: str, data: dict):
-        grid_x = data.get("gridX", 0)
-        grid_y = data.get("gridY", 0)
-        direction = data.get("direction", "down")
+        await self.apply_move(
+            user_id,
+            data.get("gridX", 0),
+            data.get("gridY", 0),
+            data.get("direction", "down"),
+        )
+
+    async def handle_chat(self, user_id: str, data: dict):
+        """근접 채팅 — 보낸 사람 주변 ``chat_radius`` 타일 안의 플레이어에게만 전달.
+
+        보낸 사람에게도 같은 메시지를 돌려준다 (주변에 아무도 없어도) — 클라이언트는 서버가
+        받아들인 메시지만 채팅 목록에 올린다.
 
+        수신자 후보는 AOI 색인에서 반경을 덮는 셀만 훑어 얻으므로 비용은 룸 인원이 아니라
+        주변 인원에 비례한다. 다른 워커 소속 수신자 몫은 백플레인으로 한 번만 넘긴다.
+        """
+        conn = self.active_connections.get(user_id)
+        position = self.positions.get(user_id)
+        message = data.get("message")
+        if conn is None or position is None or not isinstance(message, str):
+            return
+        message = message.strip()
+        if not message:
+            return
+        reason = conn.limiter.check_chat(message)
+        if reason is not None:
+            conn.limiter.reject(reason)
+            self._count_reject(reason)
+            conn.sender.send(json.dumps({"type": "chat_rejected", "reason": reason}))
+            return
+
+        recipients = self.chat_recipients(user_id, position.x, position.y)
+        chat_message = json.dumps({
+            "type": "chat_message",
+            "user_id": user_id,
+            "user_name": conn.user_info.get("name", ""),
+            "message": message,
+            "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        })
+        await self.send_to([user_id, *recipients], chat_message)
+        remote = [uid for uid in recipients if uid in self.remote_players]
+        if remote:
+            await self.backplane.publish({"type": "chat", "user_ids": remote, "message": chat_message})
+
+    def chat_recipients(self, user_id: str, grid_x: int, grid_y: int) -> list[str]:
+        """``(grid_x, grid_y)`` 로부터 채팅 반경 안에 있는 다른 플레이어 (로컬/원격 공통)."""
+        radius = self.chat_radius
+        manhattan = self.chat_metric == "manhattan"
+        recipients = []
+        for uid in self.interest.members_near(grid_x, grid_y, radius):
+            pos = self.positions.get(uid)
+            if uid == user_id or pos is None:
+                continue
+            dx = abs(pos.x - grid_x)
+            dy = abs(pos.y - grid_y)
+            if (dx + dy if manhattan else max(dx, dy)) <= radius:
+                recipients.append(uid)
+        return recipients
+
+    async def handle_binary(self, user_id: str, data: bytes):
+        """바이너리 프레임 수신 (디코드 fast path)."""
+        move = protocol.decode_client_move(data)
+        if move is not None:
+            await self.apply_move(user_id, *move)
+
+    async def apply_move(self, user_id: str, grid_x, grid_y, direction: str):
+        conn = self.active_connections.get(user_id)
+        if conn is None:
+            return
+        # 직접 이동하면 진행 중인 move_to 는 취소 (관찰자는 다음 player_moved 로 따라옴)
+        self._walks.pop(user_id, None)
         # Validate bounds
-        if not (0 <= grid_x <= GRID_WIDTH - 1):
+        if (
+            not isinstance(grid_x, int)
+            or not isinstance(grid_y, int)
+            or not (0 <= grid_x <= self.grid_width - 1)
+            or not (0 <= grid_y <= self.grid_height - 1)
+        ):
+            self._reject_move(user_id, REJECT_BLOCKED)
             return
-        if not (0 <= grid_y <= GRID_HEIGHT - 1):
+
+        # 순간이동 / 속도 초과 검사
+        reason = conn.limiter.check_move(self.positions.get(user_id), grid_x, grid_y)
+        if reason is not None:
+            self._reject_move(user_id, reason)
             return
 
-        # Collision check: reject move if tile is occupied by another player
-        for uid, pos in self.positions.items():
-            if uid != user_id and pos["gridX"] == grid_x and pos["gridY"] == grid_y:
-                return
+        # Collision check — 로컬 점유 인덱스로 먼저 거르고 (O(1)) 백플레인 권위 상태로 확정
+        if not self.grid.is_free(grid_x, grid_y, ignore=user_id):
+            self._reject_move(user_id, REJECT_BLOCKED)
+            return
+        if not await self.backplane.move(user_id, grid_x, grid_y, direction):
+            self._reject_move(user_id, REJECT_BLOCKED)
+            return
+        if user_id not in self.active_connections:
+            return  # 확정을 기다리는 사이 연결이 끊김
+        position = self._set_position(user_id, grid_x, grid_y, direction)
+        if self.move_log is not None:
+            self.move_log.append(conn.handle, grid_x, grid_y)
+        await self._publish_move(user_id, position)
+        door = self.doors.get((grid_x, grid_y))
+        if door is not None and self.on_door is not None:
+            await self.on_door(user_id, door)
 
-        position = {"gridX": grid_x, "gridY": grid_y, "direction": direction}
-        self.positions[user_id] = position
-        await self.broadcast(
-            json.dumps({
-                "type": "player_moved",
-                "user_id": user_id,
-                "position": position,
-            }),
-            exclude=user_id,
+    async def _publish_move(self, user_id: str, position: Position, walking: bool = False):
+        """확정된 이동을 이 워커의 관찰자들에게 전송 (로컬/원격 플레이어 공통).
+
+        ``walking`` 이면 move_to 경로의 한 칸 — 관찰자는 이미 경로를 받아 보간하고 있으므로
+        시야 경계를 넘은 관찰자에게만 enter/leave 와 남은 경로를 보낸다.
+        """
+        old_cell, new_cell = self.interest.move(user_id, position.x, position.y)
+        if walking:
+            if old_cell != new_cell:
+                entered = await self._handle_cell_change(user_id, old_cell, new_cell, None)
+                if entered and self._remaining_path(user_id):
+                    await self.send_to(entered, self._path_message(user_id))
+            return
+        if self.tick_rate:
+            # 틱 모드: 위치 전송은 다음 틱 프레임에 모아서
+            self._dirty[user_id] = None
+            if old_cell != new_cell:
+                await self._handle_cell_change(user_id, old_cell, new_cell, None)
+            return
+        moved_message = (
+            f'{{"type": "player_moved", "user_id": {json.dumps(user_id)}, "position": {position.json()}}}'
         )
+        moved_binary = protocol.encode_moves([
+            protocol.encode_move_record(self.player_index[user_id], position)
+        ])
+        if old_cell == new_cell:
+            observers = self.interest.observers_of(new_cell)
+            observers.discard(user_id)
+            await self.send_to(observers, moved_message, key=f"move:{user_id}", binary=moved_binary)
+            return
+        await self._handle_cell_change(user_id, old_cell, new_cell, moved_message, moved_binary)
+
+    async def _handle_cell_change(
+        self,
+        user_id: str,
+        old_cell: int | None,
+        new_cell: int,
+        moved_message: str | None,
+        moved_binary: bytes | None = None,
+    ) -> list[str]:
+        """이동으로 셀이 바뀌었을 때 시야 경계를 넘은 관찰자에게 enter/leave 전송.
+
+        ``moved_message`` 가 None 이면(틱 모드, move_to) 계속 보이는 관찰자에게는 보내지 않는다.
+        새로 보이게 된 관찰자 목록을 반환.
+        """
+        observers = self.interest.observers_of(new_cell)
+        if old_cell is not None:
+            observers |= self.interest.observers_of(old_cell)
+        observers.discard(user_id)
+
+        moved_to, entered_to, left_to = [], [], []
+        for uid in observers:
+            saw = old_cell is not None and self.interest.sees(uid, old_cell)
+            sees = self.interest.sees(uid, new_cell)
+            if saw and sees:
+                moved_to.append(uid)
+            elif sees:
+                entered_to.append(uid)
+            else:
+                left_to.append(uid)
+
+        if moved_message is not None:
+            await self.send_to(moved_to, moved_message, key=f"move:{user_id}", binary=moved_binary)
+        if entered_to:
+            await self.send_to(entered_to, self._players_message("view_enter", [user_id]))
+        if left_to:
+            await self.send_to(left_to, json.dumps({
+                "type": "view_leave",
+                "user_ids": [user_id],
+            }))
+
+        # 이동한 본인의 시야 변화
+        if user_id in self.active_connections:
+            radius = self.interest.radius_of(user_id)
+            entered, left = self.interest.view_diff(user_id, old_cell, radius, new_cell, radius)
+            await self._send_view_diff(user_id, entered, left)
+            self._send_npc_view(user_id, old_cell, radius, new_cell, radius)
+        return entered_to
+
+    async def _send_view_diff(self, user_id: str, entered: list[str], left: list[str]):
+        if entered:
+            await self.send_to([user_id], self._players_message("view_enter", entered))
+        if left:
+            await self.send_to([user_id], json.dumps({
+                "type": "view_leave",
+                "user_ids": left,
+            }))
+
+    async def set_view_radius(self, user_id: str, radius: int | None):
+        """클라이언트 시야 반경(타일 단위) 변경 — 화면 크기 변경 시 호출."""
+        if radius is not None and (not isinstance(radius, int) or radius < 0):
+            return
+        old_radius = self.interest.set_radius(user_id, radius)
+        if old_radius is None:
+            return
+        if user_id in self.active_connections:
+            self.active_connections[user_id].view_radius = radius
+        cell = self.interest.cell_of(user_id)
+        new_radius = self.interest.radius_of(user_id)
+        entered, left = self.interest.view_diff(user_id, cell, old_radius, cell, new_radius)
+        await self._send_view_diff(user_id, entered, left)
+        if user_id in self.active_connections:
+            self._send_npc_view(user_id, cell, old_radius, cell, new_radius)
+
+
+    # ------------------------------------------------------------------
+    # 정적 충돌 레이어 (벽/가구)
+    # ------------------------------------------------------------------
+
+    def set_collision(self, walls: "CollisionMap | None") -> None:
+        """충돌 레이어 교체 (시작 시 + 맵 핫 리로드). 연결은 그대로 두고 이후 이동/스폰부터 적용.
+
+        진행 중인 move_to 는 다음 칸이 새로 막혔으면 그 자리에서 다시 경로를 계획한다.
+        접속 중인 클라이언트에는 새 충돌 레이어를 ``collision`` 메시지로 보낸다.
+        """
+        self.grid.set_walls(walls)
+        self.backplane.set_walls(walls)
+        self._collision = walls.encode() if walls is not None else None
+        if self.active_connections:
+            message = json.dumps({
+                "type": "collision",
+                "width": self.grid_width,
+                "height": self.grid_height,
+                "collision": self._collision,
+            })
+            for conn in self.active_connections.values():
+                conn.sender.send(message)
+        size = self.grid_width * self.grid_height
+        self.planner.set_static(walls.to_bytemap() if walls is not None else bytearray(size))
+        if self.npcs is not None:
+            self.npcs.set_walls(walls)
+
+    # ------------------------------------------------------------------
+    # move_to (서버 경로 탐색)
+    # ------------------------------------------------------------------
+
+    async def handle_move_to(self, user_id: str, data: dict):
+        """목적지까지 경로를 계획해 한 번만 알리고, 이후 서버가 ``path_step`` 마다 한 칸씩 진행."""
+        position = self.positions.get(user_id)
+        if user_id not in self.active_connections or position is None:
+            return
+        goal = (data.get("gridX"), data.get("gridY"))
+        if not all(isinstance(v, int) for v in goal) or not self.grid.in_bounds(*goal):
+            self._reject_move(user_id, REJECT_BLOCKED)
+            return
+        path = self._plan_path(user_id, position, goal)
+        if path is None:
+            self._walks.pop(user_id, None)
+            self._reject_move(user_id, REJECT_NO_PATH)
+            return
+        if path:
+            self._walks[user_id] = {"goal": goal, "path": deque(path)}
+            self._ensure_walk_loop()
+        else:
+            self._walks.pop(user_id, None)
+        await self._announce_path(user_id)
+
+    def _plan_path(self, user_id: str, position: Position, goal: tuple[int, int]) -> list[tuple[int, int]] | None:
+        grid = self.grid
+
+        def occupied(idx: int) -> bool:
+            uid = grid.occupant_at(idx)
+            return uid is not None and uid != user_id
+
+        return self.planner.plan((position.x, position.y), goal, occupied)
+
+    def _remaining_path(self, user_id: str) -> deque | None:
+        walk = self._walks.get(user_id)
+        return walk["path"] if walk is not None else self._remote_paths.get(user_id)
+
+    def _path_message(self, user_id: str) -> str:
+        path = self._remaining_path(user_id) or ()
+        position = self.positions.get(user_id)
+        return json.dumps({
+            "type": "player_path",
+            "user_id": user_id,
+            "position": position.as_dict() if position is not None else None,
+            "path": [list(tile) for tile in path],
+            "step_ms": round(self.path_step * 1000),
+        })
+
+    async def _announce_path(self, user_id: str):
+        """(남은) 경로를 본인 + 관찰자에게 한 번 전송. 빈 경로는 정지를 뜻한다."""
+        message = self._path_message(user_id)
+        cell = self.interest.cell_of(user_id)
+        observers = self.interest.observers_of(cell) if cell is not None else set()
+        observers.add(user_id)
+        await self.send_to(observers, message, key=f"path:{user_id}")
+        path = self._remaining_path(user_id) or ()
+        await self.backplane.publish({
+            "type": "path",
+            "user_id": user_id,
+            "path": [list(tile) for tile in path],
+            "message": message,
+        })
+
+    def _ensure_walk_loop(self):
+        if self._walk_task is None or self._walk_task.done():
+            self._walk_task = asyncio.create_task(self._walk_loop())
+
+    async def _walk_loop(self):
+        """진행 중인 move_to 를 모두 한 태스크에서 ``path_step`` 마다 한 칸씩 진행 (없으면 종료)."""
+        loop = asyncio.get_running_loop()
+        next_step = loop.time()
+        while self._walks:
+            next_step += self.path_step
+            await asyncio.sleep(max(0.0, next_step - loop.time()))
+            for user_id in list(self._walks):
+                try:
+                    await self._walk_step(user_id)
+                except Exception as e:
+                    logger.error(f"Path step failed for {user_id}: {e}")
+                    self._walks.pop(user_id, None)
+
+    async def _walk_step(self, user_id: str):
+        walk = self._walks.get(user_id)
+        current = self.positions.get(user_id)
+        if walk is None or current is None:
+            self._walks.pop(user_id, None)
+            return
+        path = walk["path"]
+        gx, gy = path[0]
+        direction = _direction(current, gx, gy)
+        # 다음 칸이 막혔으면 (다른 플레이어가 들어옴) 현재 위치에서 다시 계획
+        if not self.grid.is_free(gx, gy, ignore=user_id) or not await self.backplane.move(user_id, gx, gy, direction):
+            await self._reroute(user_id, walk)
+            return
+        if self._walks.get(user_id) is not walk:
+            return  # 확정을 기다리는 사이 취소/새 목적지/퇴장
+        path.popleft()
+        if not path:
+            del self._walks[user_id]
+        position = self._set_position(user_id, gx, gy, direction)
+        if self.move_log is not None:
+            self.move_log.append(self.player_index[user_id], gx, gy)
+        await self._publish_move(user_id, position, walking=True)
+        door = self.doors.get((gx, gy))
+        if door is not None and self.on_door is not None:
+            self._walks.pop(user_id, None)
+            await self.on_door(user_id, door)
+
+    async def _reroute(self, user_id: str, walk: dict):
+        self.path_reroutes += 1
+        path = self._plan_path(user_id, self.positions[user_id], walk["goal"])
+        if path:
+            walk["path"] = deque(path)
+        else:
+            # 더 갈 수 없음 — 그 자리에 멈춤
+            self._walks.pop(user_id, None)
+        await self._announce_path(user_id)
+
+    def path_metrics(self) -> dict:
+        return {**self.planner.stats(), "walking": len(self._walks), "reroutes": self.path_reroutes}
+
+    # ------------------------------------------------------------------
+    # 백플레인 (다른 워커의 플레이어)
+    # ------------------------------------------------------------------
+
+    async def _on_backplane_event(self, event: dict):
+        etype = event.get("type")
+        user_id = event.get("user_id")
+        if etype == "move":
+            if user_id in self.remote_players:
+                data = event["position"]
+                gx, gy = data["gridX"], data["gridY"]
+                # 이미 알린 경로의 다음 칸이면 다시 알리지 않음
+                remaining = self._remote_paths.get(user_id)
+                walking = bool(remaining) and remaining[0] == (gx, gy)
+                if walking:
+                    remaining.popleft()
+                else:
+                    self._remote_paths.pop(user_id, None)
+                position = self._set_position(user_id, gx, gy, data.get("direction", "down"))
+                await self._publish_move(user_id, position, walking)
+            elif user_id in self.active_connections:
+                # 브로커 재접속 후 재입장에서 권위 상태가 이 워커 플레이어를 다른 타일에 놓음
+                self._walks.pop(user_id, None)
+                data = event["position"]
+                position = self._set_position(user_id, data["gridX"], data["gridY"], data.get("direction", "down"))
+                await self._publish_move(user_id, position)
+                self._send_correction(user_id, REJECT_BLOCKED)
+        elif etype == "path":
+            if user_id in self.remote_players:
+                if event["path"]:
+                    self._remote_paths[user_id] = deque(tuple(tile) for tile in event["path"])
+                else:
+                    self._remote_paths.pop(user_id, None)
+                cell = self.interest.cell_of(user_id)
+                await self.send_to(self.interest.observers_of(cell), event["message"], key=f"path:{user_id}")
+        elif etype == "join":
+            if user_id in self.active_connections:
+                self._drop_local(user_id)
+            self._remove_remote(user_id)
+            cell = self._add_remote(user_id, event["user_info"], event["position"])
+            await self.send_to(self.interest.observers_of(cell), self._joined_message(user_id))
+        elif etype == "leave":
+            if self._remove_remote(user_id):
+                await self.broadcast_disconnect(user_id)
+        elif etype == "broadcast":
+            await self.broadcast(event["message"], exclude=event.get("exclude"))
+        elif etype == "player_updated":
+            await self.update_player_info(user_id, event["changes"], relay=False)
+        elif etype == "chat":
+            # 다른 워커에서 보낸 근접 채팅 — 수신자 중 이 워커 소속만 받는다 (send_to 가 거름)
+            await self.send_to(event["user_ids"], event["message"])
+        elif etype == "worker_event":
+            if self.on_worker_event is not None:
+                self.on_worker_event(event["name"])
+
+    def _add_remote(self, user_id: str, user_info: Mapping, position: Mapping) -> int:
+        # 읽기 전용 복사본 보관 — 인메모리 백플레인은 이벤트 dict 를 그대로 넘기므로 소유 워커의 것과 공유되지 않게
+        self.remote_players[user_id] = freeze_info(user_info)
+        self._assign_index(user_id)
+        pos = self._set_position(user_id, position["gridX"], position["gridY"], position.get("direction", "down"))
+        # 원격 플레이어는 관찰자가 아니므로 시야 반경 0
+        return self.interest.add(user_id, pos.x, pos.y, 0)
+
+    def _remove_remote(self, user_id: str) -> bool:
+        if self.remote_players.pop(user_id, None) is None:
+            return False
+        self.positions.pop(user_id, None)
+        self.grid.remove(user_id)
+        self.interest.remove(user_id)
+        self._dirty.pop(user_id, None)
+        self._walks.pop(user_id, None)
+        self._remote_paths.pop(user_id, None)
+        self._release_index(user_id)
+        return True
+
+    def _drop_local(self, user_id: str):
+        """다른 워커로 재접속한 유저의 이 워커 쪽 연결을 닫는다 (위치 저장/퇴장 중계 없음)."""
+        conn = self.active_connections.pop(user_id)
+        logger.info(f"Closing connection for {user_id} (reconnected on another worker)")
+        self._cancel_expiry(conn)
+        conn.sender.abort(code=4002, reason="duplicate_connection")
+        self._log_leave(user_id)
+        self.positions.pop(user_id, None)
+        self.grid.remove(user_id)
+        self.interest.remove(user_id)
+        self._dirty.pop(user_id, None)
+        self._walks.pop(user_id, None)
+        self._remote_paths.pop(user_id, None)
+        self._release_index(user_id)
+
+    async def broadcast_all(self, message: str, exclude: str = None):
+        """모든 워커의 클라이언트에게 전송."""
+        await self.broadcast(message, exclude)
+        await self.backplane.publish({"type": "broadcast", "message": message, "exclude": exclude})
+
+    # ------------------------------------------------------------------
+    # 틱 모드 (이동을 모아 틱마다 델타 스냅샷 전송)
+    # ------------------------------------------------------------------
+
+    def _ensure_tick_loop(self):
+        if self.tick_rate and (self._tick_task is None or self._tick_task.done()):
+            self._tick_task = asyncio.create_task(self._tick_loop())
+
+    async def _tick_loop(self):
+        interval = 1.0 / self.tick_rate
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while True:
+            next_tick += interval
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+            try:
+                await self.flush_tick()
+            except Exception as e:
+                logger.error(f"Tick flush failed: {e}")
+
+    def stop(self):
+        """백그라운드 태스크 중단 (서버 종료 시)."""
+        if self._tick_task is not None:
+            self._tick_task.cancel()
+            self._tick_task = None
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+        if self._walk_task is not None:
+            self._walk_task.cancel()
+            self._walk_task = None
+        if self._npc_task is not None:
+            self._npc_task.cancel()
+            self._npc_task = None
+
+    async def shutdown(self):
+        """서버 종료 — 접속 중인 유저 위치까지 포함해 마지막으로 저장한다."""
+        self.stop()
+        for user_id in list(self.active_connections):
+            self.save_position(user_id)
+        await self.backplane.close()
+        if self._owns_persistence:
+            await self.persistence.close()
+
+    async def flush_tick(self):
+        """이번 틱에 바뀐 플레이어만 담은 ``tick`` 프레임을 클라이언트별로 한 번 전송.
+
+        변경된 플레이어 조각은 틱마다 한 번만 인코딩하고, 같은 셀/시야 반경의
+        클라이언트는 조립된 프레임 문자열을 그대로 공유한다.
+        """
+        if not self._dirty:
+            return
+        dirty, self._dirty = self._dirty, {}
+        self._tick_seq += 1
+
+        # {셀: [(user_id, JSON 조각, 바이너리 레코드)]}
+        by_cell: dict[int, list[tuple[str, str, bytes]]] = {}
+        for uid in dirty:
+            pos = self.positions.get(uid)
+            cell = self.interest.cell_of(uid)
+            if pos is None or cell is None:
+                continue
+            by_cell.setdefault(cell, []).append((
+                uid,
+                f"{json.dumps(uid)}:{json.dumps(pos.as_dict(), separators=(',', ':'))}",
+                protocol.encode_move_record(self.player_index[uid], pos),
+            ))
+        if not by_cell:
+            return
+
+        shared: dict[tuple[int, int, bool], str | bytes | None] = {}
+        for uid, conn in self.active_connections.items():
+            cell = self.interest.cell_of(uid)
+            if cell is None:
+                continue
+            radius = self.interest.radius_of(uid)
+            binary = conn.binary
+            if uid in dirty:
+                # 자기 자신은 제외해야 하므로 공유 프레임을 쓰지 않음
+                frame = self._build_tick_frame(by_cell, cell, radius, binary, exclude=uid)
+            else:
+                group = (cell, radius, binary)
+                if group not in shared:
+                    shared[group] = self._build_tick_frame(by_cell, cell, radius, binary)
+                frame = shared[group]
+            if frame is not None:
+                conn.sender.send(frame)
+
+    def _build_tick_frame(
+        self,
+        by_cell: dict,
+        cell: int,
+        radius: int,
+        binary: bool,
+        exclude: str | None = None,
+    ) -> str | bytes | None:
+        parts = []
+        for c in self.interest.cells_within(cell, radius):
+            for uid, fragment, record in by_cell.get(c, ()):
+                if uid != exclude:
+                    parts.append(record if binary else fragment)
+        if not parts:
+            return None
+        if binary:
+            return protocol.encode_moves(parts)
+        return f'{{"type":"tick","seq":{self._tick_seq},"players":{{{",".join(parts)}}}}}'
+
+    # ------------------------------------------------------------------
+    # 서버 시뮬레이션 NPC
+    # ------------------------------------------------------------------
+
+    def _ensure_npc_loop(self):
+        if self.npcs is None or (self._npc_task is not None and not self._npc_task.done()):
+            return
+        if not self.npcs.placed:
+            try:
+                self.npcs.place(self.grid.occupied_indices())
+            except ValueError as e:
+                logger.error(f"Room {self.room}: NPC simulation disabled: {e}")
+                self.npcs = None
+                return
+            self.grid.set_npc_tiles(self.npcs.tiles().tolist())
+        self._npc_task = asyncio.create_task(self._npc_loop())
+
+    async def _npc_loop(self):
+        """NPC 틱 — 룸에 접속자가 있는 동안만 돈다 (아무도 없으면 NPC 는 그 자리에 멈춤)."""
+        interval = 1.0 / self.npcs.tick_rate
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while self.active_connections:
+            next_tick += interval
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+            try:
+                self.npc_tick()
+            except Exception as e:
+                logger.error(f"NPC tick failed: {e}")
+
+    def npc_tick(self) -> int:
+        """NPC 한 틱 진행 + 로컬 클라이언트마다 시야 안에서 움직인 NPC 를 묶어 전송. 움직인 수 반환.
+
+        플레이어 이동처럼 이동 전/후 셀 중 하나라도 보이는 관찰자만 받는다 (시야 밖으로 나가는 마지막 칸 포함).
+        관찰자는 (AOI 셀, 시야 반경) 으로 묶어 묶음 x NPC 가시성 행렬을 한 번에 계산하고, NPC 마다 JSON 조각을
+        한 번만 만들어 묶음별 메시지는 조각을 잇기만 한다. 맵 전체를 보는 관찰자들은 메시지 하나를 같이 쓴다.
+        """
+        if self.npcs is None:
+            return 0
+        old_cells = self._npc_cells()
+        moved = self.npcs.step(self.grid.occupied_indices())
+        if len(moved) == 0:
+            return 0
+        self.grid.set_npc_tiles(self.npcs.tiles().tolist())
+        cells_w = self.interest.cells_w
+        whole_map = max(cells_w, self.interest.cells_h) - 1
+        rows = self.npcs.move_rows(moved)
+        everything: list[Session] = []
+        # {(셀, 셀 단위 반경): 관찰자들}
+        groups: dict[tuple[int, int], list[Session]] = {}
+        for uid, conn in self.active_connections.items():
+            cell, radius = self.interest.cell_of(uid), self.interest.radius_of(uid)
+            if cell is None:
+                continue
+            if radius >= whole_map:
+                everything.append(conn)
+            else:
+                groups.setdefault((cell, radius), []).append(conn)
+        if groups:
+            # InterestGrid.sees 와 같은 셀 단위 체비셰프 거리 — (묶음, NPC) 행렬 하나로
+            old, new = old_cells[moved], self._npc_cells()[moved]
+            keys = np.array(list(groups), dtype=np.int64)
+            cx, cy, radius = keys[:, :1] % cells_w, keys[:, :1] // cells_w, keys[:, 1:]
+            visible = (
+                (np.abs(old % cells_w - cx) <= radius) & (np.abs(old // cells_w - cy) <= radius)
+            ) | (
+                (np.abs(new % cells_w - cx) <= radius) & (np.abs(new // cells_w - cy) <= radius)
+            )
+            counts = visible.sum(axis=1).tolist()
+            for conns, row, count in zip(groups.values(), visible, counts):
+                if count == 0:
+                    continue
+                if count == len(rows):
+                    everything.extend(conns)
+                    continue
+                message = self.npcs.rows_message([rows[i] for i in np.flatnonzero(row).tolist()])
+                for conn in conns:
+                    conn.sender.send(message)
+        if everything:
+            message = self.npcs.rows_message(rows)
+            for conn in everything:
+                conn.sender.send(message)
+        return len(moved)
+
+    async def _step_off_npc(self, user_id: str, spawn: dict) -> dict:
+        """스폰 위치가 이 워커의 NPC 타일이면 빈 타일로 옮긴다 (권위 상태로 확정).
+
+        NPC 는 워커마다 따로 시뮬레이션해서 백플레인 권위 상태는 NPC 타일을 모른다 — 저장된 위치나
+        무작위 스폰이 NPC 위일 수 있으므로 입장한 워커가 확인한다. 빈 타일을 못 찾으면 그대로 둔다.
+        """
+        if not self.grid.is_npc(spawn["gridX"], spawn["gridY"]):
+            return spawn
+        direction = spawn.get("direction", "down")
+        for _ in range(NPC_RESPAWN_TRIES):
+            tile = self.grid.random_free()
+            if tile is None:
+                break
+            gx, gy = tile
+            if self.grid.is_free(gx, gy, ignore=user_id) and await self.backplane.move(user_id, gx, gy, direction):
+                return {"gridX": gx, "gridY": gy, "direction": direction}
+        return spawn
+
+    def _npc_cells(self) -> np.ndarray:
+        """NPC 번호별 관심 영역 셀 인덱스."""
+        size = self.interest.cell_size
+        return (self.npcs.y // size) * self.interest.cells_w + self.npcs.x // size
+
+    def _send_npc_view(self, user_id: str, old_cell: int | None, old_radius: int, new_cell: int, new_radius: int):
+        """시야(셀/반경)가 바뀐 관찰자에게 새로 보이게 된 영역의 NPC 현재 위치를 보낸다.
+
+        ``npc_moves`` 는 시야 안의 NPC 만 받으므로 그동안 밖에서 움직인 NPC 는 클라이언트에 예전 위치로 남아 있다.
+        """
+        if self.npcs is None or len(self.npcs) == 0:
+            return
+        cells = self._npc_cells()
+        newly = [
+            cell for cell in np.unique(cells).tolist()
+            if self.interest.sees(user_id, cell, new_radius, new_cell)
+            and not (old_cell is not None and self.interest.sees(user_id, cell, old_radius, old_cell))
+        ]
+        if not newly:
+            return
+        self.active_connections[user_id].sender.send(self.npcs.moves_message(np.flatnonzero(np.isin(cells, newly))))
 
 
-manager = ConnectionManager()
+def _direction(current: Position, gx: int, gy: int) -> str:
+    """한 칸 이동의 바라보는 방향."""
+    if gx > current.x:
+        return "right"
+    if gx < current.x:
+        return "left"
+    if gy < current.y:
+        return "up"
+    if gy > current.y:
+        return "down"
+    return current.get("direction", "down")
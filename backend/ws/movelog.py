@@ -0,0 +1,210 @@
+"""이동 이벤트 로그 — 확정된 이동을 고정 폭 바이너리 레코드로 파일 끝에 덧붙인다 (일 단위 교체).
+
+사무실에서 사람이 어디에 모이는지 나중에 분석하기 위한 기록이다 (``ws.heatmap`` 이 NumPy 로 읽음).
+이동 처리 경로에서는 미리 잡아 둔 청크에 레코드를 제자리로 채우기만 하고, 파일 쓰기는
+``WS_MOVE_LOG_FLUSH`` 초마다 스레드에서 한 번에 한다.
+
+파일: ``{WS_MOVE_LOG_DIR}/{룸}-{YYYY-MM-DD}-{워커}.bin`` (서버 로컬 날짜 기준으로 자정에 새 파일).
+레코드 (10 bytes, little-endian)::
+
+    [ms u32 — 그 날 자정부터 지난 밀리초][player u16][gridX u16][gridY u16]
+
+player 는 워커 프로세스의 룸 안 정수 핸들(바이너리 프로토콜의 player_index)이라 퇴장 후 다른 유저가
+재사용할 수 있다. 그래서 입장 때 스폰 위치를, 퇴장 때 ``gridX = gridY = 0xFFFF`` 인 퇴장 레코드를 남겨
+구간을 끊는다. 핸들은 워커마다 따로 매기므로(``uvicorn --workers``) 워커(pid)마다 파일을 나눠 쓰고,
+분석할 때 파일별로 핸들을 구분해 합친다 (``ws.heatmap``). 워커는 자기에게 접속한 유저의 이동만 기록한다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import glob
+import logging
+import os
+import struct
+import time
+from datetime import date, datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+# 비워 두면 기록하지 않음
+MOVE_LOG_DIR = os.environ.get(
+    "WS_MOVE_LOG_DIR",
+    os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "data", "movelog")),
+)
+MOVE_LOG_FLUSH = float(os.environ.get("WS_MOVE_LOG_FLUSH", "1"))
+# 이보다 오래된 로그 파일은 교체 때 지움 (0 이면 보관)
+MOVE_LOG_RETENTION_DAYS = int(os.environ.get("WS_MOVE_LOG_DAYS", "30"))
+
+RECORD = struct.Struct("<IHHH")
+RECORD_SIZE = RECORD.size
+LEAVE = 0xFFFF  # 퇴장 레코드의 gridX / gridY
+# append 가 채우는 청크 크기 — 다 차면 파일별 버퍼로 한 번에 옮긴다
+CHUNK_RECORDS = 4096
+CHUNK_BYTES = CHUNK_RECORDS * RECORD_SIZE
+
+_pack_into = RECORD.pack_into
+
+
+def log_path(directory: str, room: str, day: date, worker: str) -> str:
+    return os.path.join(directory, f"{room}-{day.isoformat()}-{worker}.bin")
+
+
+def log_files(directory: str, room: str) -> dict[date, list[str]]:
+    """{날짜: 워커별 파일 경로} — 이 룸의 로그 파일 (워커별로 나누기 전의 ``{룸}-{날짜}.bin`` 포함)."""
+    files: dict[date, list[str]] = {}
+    for path in sorted(glob.glob(os.path.join(glob.escape(directory), f"{glob.escape(room)}-*.bin"))):
+        stem = os.path.basename(path)[len(room) + 1:-len(".bin")]
+        day, sep, worker = stem[:10], stem[10:11], stem[11:]
+        if sep and (sep != "-" or not worker):
+            continue
+        try:
+            files.setdefault(date.fromisoformat(day), []).append(path)
+        except ValueError:
+            continue
+    return files
+
+
+class MoveLog:
+    """룸 하나의 (이 워커 몫) 이동 로그 writer.
+
+    - ``append()`` 는 이동 처리 경로에서 호출 — 청크의 다음 칸에 레코드를 ``pack_into`` 로 채우기만 함
+      (I/O / 객체 생성 없음). 청크가 다 차거나 날짜가 바뀌거나 flush 할 때 파일별 버퍼로 옮긴다
+    - 주기적 flush 태스크가 버퍼를 파일 끝에 쓰고(스레드), 날짜가 바뀌면 새 파일로 넘어간다
+    - ``close()`` 에서 남은 버퍼를 마지막으로 쓴다
+    """
+
+    def __init__(
+        self,
+        room: str,
+        directory: str = MOVE_LOG_DIR,
+        flush_interval: float = MOVE_LOG_FLUSH,
+        retention_days: int = MOVE_LOG_RETENTION_DAYS,
+        worker: str | None = None,
+    ):
+        self.room = room
+        self.directory = directory
+        # 파일 이름의 워커 id — 같은 워커의 핸들만 한 파일에 섞이도록 (재시작하면 새 pid 라 새 파일)
+        self.worker = worker or str(os.getpid())
+        self.flush_interval = flush_interval
+        self.retention_days = retention_days
+        # {파일 경로: 아직 쓰지 않은 레코드} — 자정 직후에는 어제/오늘 두 파일 몫이 함께 있을 수 있음
+        self._buffers: dict[str, bytearray] = {}
+        # 현재 파일(_path) 몫의 채우는 중인 청크, 다음 레코드 위치
+        self._chunk = bytearray(CHUNK_BYTES)
+        self._offset = 0
+        self._path = ""
+        # 오늘 자정 / 내일 자정 (time.time_ns)
+        self._day_start = 0
+        self._day_end = 0
+        self._task: asyncio.Task | None = None
+        self._flush_lock = asyncio.Lock()
+        # 메트릭
+        self.records = 0
+        self.bytes_written = 0
+        self.failed = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory)
+
+    def _rotate(self, now: int) -> None:
+        day = datetime.fromtimestamp(now / 1e9).date()
+        start = datetime.combine(day, datetime.min.time())
+        self._day_start = int(start.timestamp()) * 1_000_000_000
+        self._day_end = int((start + timedelta(days=1)).timestamp()) * 1_000_000_000
+        self._path = log_path(self.directory, self.room, day, self.worker)
+
+    def _seal(self, now: int) -> None:
+        """채운 청크를 현재 파일 버퍼로 옮기고 청크를 처음부터 다시 쓴다. 날짜가 바뀌었으면 새 파일로."""
+        if self._offset:
+            self._buffers.setdefault(self._path, bytearray()).extend(memoryview(self._chunk)[:self._offset])
+            self.records += self._offset // RECORD_SIZE
+            self._offset = 0
+        if now >= self._day_end:
+            self._rotate(now)
+
+    def append(self, player: int, grid_x: int, grid_y: int) -> None:
+        now = time.time_ns()
+        offset = self._offset
+        if now >= self._day_end or offset == CHUNK_BYTES:
+            self._seal(now)
+            offset = 0
+        _pack_into(self._chunk, offset, (now - self._day_start) // 1_000_000, player, grid_x, grid_y)
+        self._offset = offset + RECORD_SIZE
+
+    def append_leave(self, player: int) -> None:
+        self.append(player, LEAVE, LEAVE)
+
+    # ------------------------------------------------------------------
+    # 생명주기 / flush
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        if self.enabled and self.flush_interval and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Move log flush failed ({self.room}): {e}")
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            if self._offset:
+                self._seal(time.time_ns())
+            buffers = {path: data for path, data in self._buffers.items() if data}
+            if not buffers:
+                return
+            # 새 버퍼로 바꿔 끼운 뒤 스레드에서 쓴다 (쓰는 동안 들어온 이동은 청크/새 버퍼로)
+            self._buffers = {}
+            try:
+                written = await asyncio.to_thread(self._write, buffers)
+            except OSError as e:
+                self.failed += 1
+                logger.warning(f"Failed to write move log ({self.room}): {e}")
+                return
+            self.bytes_written += written
+
+    def _write(self, buffers: dict[str, bytearray]) -> int:
+        os.makedirs(self.directory, exist_ok=True)
+        written = 0
+        for path, data in buffers.items():
+            if not os.path.exists(path):
+                self._prune()
+            with open(path, "ab") as f:
+                f.write(data)
+            written += len(data)
+        return written
+
+    def _prune(self) -> None:
+        """보관 기간이 지난 파일 삭제 (새 날짜 파일을 만들 때)."""
+        if not self.retention_days:
+            return
+        cutoff = date.today() - timedelta(days=self.retention_days)
+        for day, paths in log_files(self.directory, self.room).items():
+            if day >= cutoff:
+                continue
+            for path in paths:
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    logger.warning(f"Failed to remove old move log {path}: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "file": self._path,
+            "records": self.records + self._offset // RECORD_SIZE,
+            "pending_bytes": sum(len(data) for data in self._buffers.values()) + self._offset,
+            "bytes_written": self.bytes_written,
+            "failed": self.failed,
+        }
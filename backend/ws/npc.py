@@ -0,0 +1,341 @@
+"""서버 시뮬레이션 NPC — 룸을 돌아다니거나(wander) 정해진 경로를 도는(route) NPC 수백 명.
+
+NPC 위치/방향/경로 진행 상태를 NumPy 배열로 두고 ``WS_NPC_TICK`` Hz 고정 주기로 전체를 한 번에 갱신한다
+(NPC 마다 파이썬 코드를 돌지 않음). 한 틱에 움직인 NPC 는 ``npc_moves`` 메시지로 묶어
+관찰자마다 시야 안의 것만 보낸다 (같은 묶음을 받는 관찰자끼리는 메시지 문자열을 한 번만 만듦).
+
+- wander: 틱마다 ``move_chance`` 확률로 상하좌우 중 무작위 한 칸
+- route: 경유지 ``(x, y, 대기 초)`` 를 차례로 돈다. 경유지마다 벽을 돌아가는 거리 지도(BFS)를 미리 만들어 두고
+  (맵이 바뀌면 다시), 이웃 네 칸 중 경유지에 더 가까운 빈 칸으로 한 칸 — 가까운 두 칸이 모두 막혔으면
+  무작위 한 칸으로 비켜 간다. 경유지에 닿으면(경유지가 막혀 있으면 바로 옆) 대기 후 다음 경유지
+  (마지막 다음은 처음)
+- 충돌: 벽/가구(충돌 레이어), 플레이어가 서 있는 타일, 다른 NPC 가 서 있는 타일로는 가지 않는다.
+  같은 타일로 가려는 NPC 가 여럿이면 번호가 가장 작은 NPC 만 움직인다
+
+NPC 는 백플레인 권위 상태에 올리지 않는다 — 시뮬레이션은 워커마다 따로 돌므로 워커가 여럿이면
+워커별로 NPC 위치가 다를 수 있다. 대신 틱마다 NPC 타일을 워커의 점유 격자에 넘겨
+(``OccupancyGrid.set_npc_tiles``) 그 워커에 접속한 플레이어는 자기 화면의 NPC 위로 이동할 수 없다.
+``npc_moves`` 는 플레이어 이동처럼 관찰자 시야(AOI 셀) 안에서 움직인 NPC 만 받는다.
+
+와이어 형식::
+
+    init        "npcs": {"sim_npc_0": {"user_info": {...}, "position": {"gridX", "gridY", "direction"}}, ...}
+    npc_moves   {"type": "npc_moves", "tick": n, "npcs": [[번호, gridX, gridY, 방향 코드], ...]}
+
+방향 코드는 바이너리 프로토콜과 같다 (``ws.protocol.DIRECTIONS``).
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from collections import deque
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from ws.protocol import DIRECTIONS
+
+if TYPE_CHECKING:
+    from ws.collision import CollisionMap
+
+# 기본 룸에 띄울 wander NPC 수 (0 이면 끔, 룸 설정 파일을 쓰면 룸별 ``npcs`` 로 지정)
+NPC_COUNT = int(os.environ.get("WS_NPC_COUNT", "0"))
+NPC_SPRITE = os.environ.get("WS_NPC_SPRITE", "")
+# 시뮬레이션 주기 (Hz) 와 wander NPC 가 한 틱에 움직일 확률
+NPC_TICK = float(os.environ.get("WS_NPC_TICK", "4"))
+NPC_MOVE_CHANCE = float(os.environ.get("WS_NPC_MOVE_CHANCE", "0.3"))
+
+NPC_ID_PREFIX = "sim_npc_"
+
+# 방향 코드별 한 칸 이동 (down, up, left, right)
+_DX = np.array([0, 0, -1, 1], dtype=np.int32)
+_DY = np.array([1, -1, 0, 0], dtype=np.int32)
+
+
+@dataclass(frozen=True)
+class NpcSpec:
+    """룸 설정의 NPC 항목 하나 — ``count`` 명을 같은 이름/이미지/경로로 만든다."""
+
+    name: str
+    sprite: str = ""  # 캐릭터 이미지 폴더 (email_prefix). 비우면 기본 이미지
+    count: int = 1
+    route: tuple[tuple[int, int, float], ...] = ()  # 경유지 (x, y, 대기 초). 비우면 wander
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> NpcSpec:
+        route = tuple(
+            (int(point[0]), int(point[1]), float(point[2]) if len(point) > 2 else 0.0)
+            for point in data.get("route", ())
+        )
+        return cls(
+            name=data["name"],
+            sprite=data.get("sprite", ""),
+            count=int(data.get("count", 1)),
+            route=route,
+        )
+
+
+def default_npcs(count: int = NPC_COUNT, sprite: str = NPC_SPRITE) -> tuple[NpcSpec, ...]:
+    return (NpcSpec("방문객", sprite, count),) if count > 0 else ()
+
+
+class NpcSimulation:
+    """룸 하나의 NPC 상태 배열 + 벡터화된 한 틱 갱신.
+
+    틱 루프/전송은 ``ConnectionManager`` 가 하고, 여기서는 상태와 ``step()`` / 메시지 조립만 맡는다.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        specs: Iterable[NpcSpec],
+        tick_rate: float = NPC_TICK,
+        move_chance: float = NPC_MOVE_CHANCE,
+        seed: int | None = None,
+    ):
+        self.width = width
+        self.height = height
+        self.tick_rate = tick_rate
+        self.move_chance = move_chance
+        self.rng = np.random.default_rng(seed)
+
+        names: list[str] = []
+        sprites: list[str] = []
+        starts: list[int] = []
+        lengths: list[int] = []
+        route: list[tuple[int, int, float]] = []
+        for spec in specs:
+            for n in range(spec.count):
+                names.append(spec.name if spec.count == 1 else f"{spec.name} {n + 1}")
+                sprites.append(spec.sprite)
+                starts.append(len(route))
+                lengths.append(len(spec.route))
+                route.extend(spec.route)
+        count = len(names)
+        if count > width * height // 2:
+            raise ValueError(f"{count} NPCs do not fit a {width}x{height} room")
+        for x, y, _ in route:
+            if not (0 <= x < width and 0 <= y < height):
+                raise ValueError(f"NPC route point ({x}, {y}) is outside the {width}x{height} room")
+
+        self.user_info = [
+            {"id": f"{NPC_ID_PREFIX}{i}", "name": names[i], "email": "", "email_prefix": sprites[i], "is_sim_npc": True}
+            for i in range(count)
+        ]
+        # NPC 번호별 상태
+        self.x = np.zeros(count, dtype=np.int32)
+        self.y = np.zeros(count, dtype=np.int32)
+        self.direction = np.zeros(count, dtype=np.int32)
+        self.route_start = np.array(starts, dtype=np.int32)
+        self.route_len = np.array(lengths, dtype=np.int32)
+        self.leg = np.zeros(count, dtype=np.int32)  # 지금 향하는 경유지 (경로 안에서의 순서)
+        self.wait = np.zeros(count, dtype=np.int32)  # 남은 대기 틱
+        # 모든 NPC 의 경유지를 이어 붙인 배열 (NPC 마다 route_start 부터 route_len 개)
+        self.route_x = np.array([p[0] for p in route], dtype=np.int32)
+        self.route_y = np.array([p[1] for p in route], dtype=np.int32)
+        self.route_wait = np.array([round(p[2] * tick_rate) for p in route], dtype=np.int32)
+        self._wander = self.route_len == 0
+        # 정적 충돌 레이어 (타일당 bool) 와 경유지별 거리 지도 (경유지 수, 타일 수)
+        self.static = np.zeros(width * height, dtype=bool)
+        self._fields = self._distance_fields()
+        self.placed = False
+        # 메트릭
+        self.ticks = 0
+        self.moves = 0
+        self.last_step_ms = 0.0
+        self.max_step_ms = 0.0
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def set_walls(self, walls: CollisionMap | None) -> None:
+        """충돌 레이어 교체 (맵 핫 리로드). 이미 막힌 타일에 서 있는 NPC 는 그대로 둔다."""
+        if walls is None:
+            self.static = np.zeros(self.width * self.height, dtype=bool)
+        else:
+            self.static = np.frombuffer(bytes(walls.to_bytemap()), dtype=np.uint8).astype(bool)
+        self._fields = self._distance_fields()
+
+    def _distance_fields(self) -> np.ndarray:
+        """경유지마다 모든 타일에서 그 경유지까지의 걸음 수 (벽은 돌아감, 닿을 수 없으면 타일 수).
+
+        같은 좌표의 경유지는 지도 하나를 같이 쓴다. 경유지 수만큼 BFS 를 돌지만 맵 변경 때 한 번뿐이다.
+        """
+        w, h = self.width, self.height
+        size = w * h
+        fields = np.full((len(self.route_x), size), size, dtype=np.int32)
+        static = self.static.tolist()
+        done: dict[int, int] = {}
+        for p, goal in enumerate((self.route_y * w + self.route_x).tolist()):
+            if goal in done:
+                fields[p] = fields[done[goal]]
+                continue
+            done[goal] = p
+            dist = [size] * size
+            dist[goal] = 0
+            queue = deque((goal,))
+            while queue:
+                idx = queue.popleft()
+                d = dist[idx] + 1
+                x = idx % w
+                for n in (idx - w, idx + w, idx - 1 if x > 0 else -1, idx + 1 if x < w - 1 else -1):
+                    if 0 <= n < size and dist[n] == size and not static[n]:
+                        dist[n] = d
+                        queue.append(n)
+            fields[p] = dist
+        return fields
+
+    # ------------------------------------------------------------------
+    # 배치 / 한 틱 갱신
+    # ------------------------------------------------------------------
+
+    def _blocked(self, occupied: Iterable[int]) -> np.ndarray:
+        blocked = self.static.copy()
+        occupied = np.fromiter(occupied, dtype=np.intp)
+        if len(occupied):
+            blocked[occupied] = True
+        return blocked
+
+    def place(self, occupied: Iterable[int] = ()) -> None:
+        """NPC 를 처음 세운다 — route NPC 는 첫 경유지(막혔으면 빈 타일), 나머지는 무작위 빈 타일.
+
+        빈 타일이 NPC 수보다 적으면 ValueError.
+        """
+        blocked = self._blocked(occupied)
+        for i in np.flatnonzero(~self._wander):
+            first = self.route_start[i]
+            idx = self.route_y[first] * self.width + self.route_x[first]
+            if not blocked[idx]:
+                self.x[i], self.y[i] = self.route_x[first], self.route_y[first]
+                blocked[idx] = True
+                self.leg[i] = 1 % self.route_len[i]
+                self.wait[i] = self.route_wait[first]
+            else:
+                self.x[i] = -1
+        rest = np.flatnonzero(self._wander | (self.x < 0))
+        free = np.flatnonzero(~blocked)
+        if len(free) < len(rest):
+            raise ValueError(f"not enough free tiles for {len(self)} NPCs")
+        tiles = self.rng.choice(free, len(rest), replace=False)
+        self.x[rest] = tiles % self.width
+        self.y[rest] = tiles // self.width
+        self.placed = True
+
+    def step(self, occupied: Iterable[int] = ()) -> np.ndarray:
+        """한 틱 진행. ``occupied`` 는 플레이어가 서 있는 타일 인덱스. 움직인 NPC 번호(오름차순) 반환."""
+        t0 = time.perf_counter()
+        count = len(self.x)
+        w = self.width
+        blocked = self._blocked(occupied)
+        # 다른 NPC 가 지금 서 있는 타일 — 이번 틱에 비워질 타일이라도 들어가지 않음 (연쇄 이동 없이 보수적으로)
+        here = self.y * w + self.x
+        blocked[here] = True
+
+        rand = self.rng.integers(0, 4, count, dtype=np.int32)
+        # NPC 마다 시도할 방향 3개 (앞에서부터 처음으로 빈 칸)
+        choices = np.repeat(rand[:, None], 3, axis=1)
+        moving = self._wander & (self.rng.random(count) < self.move_chance)
+
+        # route: 대기 중이면 한 틱 줄이고, 경유지에 닿았으면 대기 시작 + 다음 경유지
+        waiting = ~self._wander & (self.wait > 0)
+        self.wait[waiting] -= 1
+        active = np.flatnonzero(~self._wander & ~waiting)
+        if len(active):
+            point = self.route_start[active] + self.leg[active]
+            tx, ty = self.route_x[point], self.route_y[point]
+            dx, dy = tx - self.x[active], ty - self.y[active]
+            distance = np.abs(dx) + np.abs(dy)
+            arrived = (distance == 0) | ((distance == 1) & blocked[ty * w + tx])
+            done = active[arrived]
+            self.wait[done] = self.route_wait[point[arrived]]
+            self.leg[done] = (self.leg[done] + 1) % self.route_len[done]
+
+            # 이웃 네 칸을 경유지까지 거리순으로 (같은 거리는 무작위) — 가까운 두 칸 + 무작위 한 칸
+            go = ~arrived
+            walkers, point = active[go], point[go]
+            nx = self.x[walkers, None] + _DX
+            ny = self.y[walkers, None] + _DY
+            inside = (nx >= 0) & (nx < w) & (ny >= 0) & (ny < self.height)
+            field = self._fields[point[:, None], np.where(inside, ny * w + nx, 0)]
+            rank = np.where(inside, field, w * self.height) + self.rng.random((len(walkers), 4))
+            choices[walkers, :2] = np.argsort(rank, axis=1)[:, :2]
+            moving[walkers] = True
+
+        movers = np.flatnonzero(moving)
+        if len(movers) == 0:
+            self._record(t0, 0)
+            return movers
+        nx = self.x[movers, None] + _DX[choices[movers]]
+        ny = self.y[movers, None] + _DY[choices[movers]]
+        inside = (nx >= 0) & (nx < w) & (ny >= 0) & (ny < self.height)
+        target = np.where(inside, ny * w + nx, 0)
+        free = inside & ~blocked[target]
+        ok = free.any(axis=1)
+        col = free.argmax(axis=1)[ok]
+        movers = movers[ok]
+        rows = np.flatnonzero(ok)
+        target = target[rows, col]
+        # 같은 타일로 가려는 NPC 가 여럿이면 첫 번째만 (movers 가 오름차순이라 번호가 가장 작은 NPC)
+        _, first = np.unique(target, return_index=True)
+        first.sort()
+        movers = movers[first]
+        target = target[first]
+        self.x[movers] = target % w
+        self.y[movers] = target // w
+        self.direction[movers] = choices[movers, col[first]]
+        self._record(t0, len(movers))
+        return movers
+
+    def _record(self, t0: float, moved: int) -> None:
+        self.ticks += 1
+        self.moves += moved
+        self.last_step_ms = (time.perf_counter() - t0) * 1000
+        if self.last_step_ms > self.max_step_ms:
+            self.max_step_ms = self.last_step_ms
+
+    # ------------------------------------------------------------------
+    # 메시지
+    # ------------------------------------------------------------------
+
+    def entries(self) -> dict[str, dict]:
+        """init 메시지의 ``npcs`` — 플레이어 항목과 같은 모양 ({id: {"user_info", "position"}})."""
+        return {
+            info["id"]: {
+                "user_info": info,
+                "position": {"gridX": int(x), "gridY": int(y), "direction": DIRECTIONS[d]},
+            }
+            for info, x, y, d in zip(self.user_info, self.x.tolist(), self.y.tolist(), self.direction.tolist())
+        }
+
+    def tiles(self) -> np.ndarray:
+        """NPC 번호별 타일 인덱스 (``y * width + x``)."""
+        return self.y * self.width + self.x
+
+    def move_rows(self, moved: np.ndarray) -> list[str]:
+        """움직인 NPC 마다 ``npc_moves`` 의 ``[번호,gridX,gridY,방향 코드]`` JSON 조각 — 틱마다 한 번만 만들고
+        관찰자별 메시지는 조각을 골라 잇기만 한다."""
+        return [
+            f"[{i},{x},{y},{d}]"
+            for i, x, y, d in zip(moved.tolist(), self.x[moved].tolist(), self.y[moved].tolist(), self.direction[moved].tolist())
+        ]
+
+    def rows_message(self, rows: list[str]) -> str:
+        return f'{{"type":"npc_moves","tick":{self.ticks},"npcs":[{",".join(rows)}]}}'
+
+    def moves_message(self, moved: np.ndarray) -> str:
+        """움직인 NPC 들을 묶은 ``npc_moves`` 메시지 하나."""
+        return self.rows_message(self.move_rows(moved))
+
+    def stats(self) -> dict:
+        return {
+            "count": len(self),
+            "tick_rate": self.tick_rate,
+            "ticks": self.ticks,
+            "moves": self.moves,
+            "last_step_ms": round(self.last_step_ms, 3),
+            "max_step_ms": round(self.max_step_ms, 3),
+        }
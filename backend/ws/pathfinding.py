@@ -0,0 +1,151 @@
+"""서버 측 경로 탐색 — move_to 목적지까지 A* 로 경로를 계획한다.
+
+정적 장애물(벽/가구)만 반영한 목적지별 거리장(BFS)을 캐시해 A* 의 휴리스틱으로 쓴다.
+다른 플레이어는 장애물을 늘리기만 하므로 거리장 값은 항상 실제 거리 이하(허용 가능)이고,
+대부분의 경우 A* 가 거의 곧장 목적지로 나아간다. 호비 자리처럼 자주 가는 목적지는
+캐시에서 바로 꺼내 쓴다.
+"""
+
+from __future__ import annotations
+
+import heapq
+import os
+from collections import OrderedDict, deque
+from collections.abc import Callable
+
+# 캐시해 둘 목적지별 거리장 수 (룸마다)
+DISTANCE_FIELD_CACHE = int(os.environ.get("WS_PATH_FIELD_CACHE", "64"))
+# 한 번에 계획할 수 있는 최대 경로 길이 (타일). 넘으면 거부
+MAX_PATH_LENGTH = int(os.environ.get("WS_PATH_MAX_LENGTH", "200"))
+
+UNREACHABLE = -1
+
+
+class PathPlanner:
+    """width x height 격자의 4방향 경로 탐색기.
+
+    - ``blocked[idx]`` 가 참이면 정적으로 막힌 타일 (벽/가구). 바뀌면 ``set_static`` 으로 교체
+    - ``plan`` 의 ``occupied(idx)`` 로 현재 다른 플레이어가 점유한 타일을 알려준다
+    """
+
+    def __init__(self, width: int, height: int, cache_size: int = DISTANCE_FIELD_CACHE):
+        self.width = width
+        self.height = height
+        self.cache_size = cache_size
+        self.blocked = bytearray(width * height)
+        # {목적지 타일 인덱스: 거리장 (타일별 목적지까지 거리, 못 가면 -1)} — LRU
+        self._fields: OrderedDict[int, list[int]] = OrderedDict()
+        # 메트릭
+        self.field_hits = 0
+        self.field_misses = 0
+        self.planned = 0
+        self.failed = 0
+
+    def set_static(self, blocked: bytearray | bytes) -> None:
+        """정적 장애물 교체 — 캐시된 거리장은 모두 버린다."""
+        if len(blocked) != self.width * self.height:
+            raise ValueError("blocked size does not match grid")
+        self.blocked = bytearray(blocked)
+        self._fields.clear()
+
+    def _neighbors(self, idx: int) -> list[int]:
+        w = self.width
+        x = idx % w
+        out = []
+        if x > 0:
+            out.append(idx - 1)
+        if x < w - 1:
+            out.append(idx + 1)
+        if idx >= w:
+            out.append(idx - w)
+        if idx + w < len(self.blocked):
+            out.append(idx + w)
+        return out
+
+    def distance_field(self, goal: int) -> list[int]:
+        """정적 장애물만 고려한 ``goal`` 까지의 거리 (캐시). 목적지 자체가 막혀 있어도 출발점으로 쓴다."""
+        field = self._fields.get(goal)
+        if field is not None:
+            self._fields.move_to_end(goal)
+            self.field_hits += 1
+            return field
+        self.field_misses += 1
+        field = [UNREACHABLE] * len(self.blocked)
+        field[goal] = 0
+        queue = deque([goal])
+        blocked = self.blocked
+        while queue:
+            idx = queue.popleft()
+            d = field[idx] + 1
+            for n in self._neighbors(idx):
+                if field[n] == UNREACHABLE and not blocked[n]:
+                    field[n] = d
+                    queue.append(n)
+        self._fields[goal] = field
+        if len(self._fields) > self.cache_size:
+            self._fields.popitem(last=False)
+        return field
+
+    def plan(
+        self,
+        start: tuple[int, int],
+        goal: tuple[int, int],
+        occupied: Callable[[int], bool],
+    ) -> list[tuple[int, int]] | None:
+        """``start`` 에서 ``goal`` 까지의 경로 (출발 타일 제외). 못 가면 None.
+
+        목적지가 막혀 있거나(NPC 자리, 책상) 다른 플레이어가 서 있으면 그 옆 칸까지 간다.
+        """
+        w = self.width
+        s = start[1] * w + start[0]
+        g = goal[1] * w + goal[0]
+        field = self.distance_field(g)
+        # 목적지에 설 수 없으면 인접 타일 아무 곳이나 도착으로 인정 (휴리스틱도 1 줄임)
+        adjacent = bool(self.blocked[g]) or occupied(g)
+        if s == g or (adjacent and field[s] == 1):
+            self.planned += 1
+            return []
+        if field[s] == UNREACHABLE:
+            self.failed += 1
+            return None
+        offset = 1 if adjacent else 0
+
+        came_from: dict[int, int] = {s: s}
+        cost = {s: 0}
+        # 같은 f 면 더 멀리 온 노드 우선 — 휴리스틱이 정확(거리장)할 때 곧장 목적지로 나아감
+        heap = [(field[s] - offset, 0, s)]
+        blocked = self.blocked
+        while heap:
+            _, neg_c, idx = heapq.heappop(heap)
+            c = -neg_c
+            if c > cost[idx]:
+                continue
+            if idx == g or (adjacent and field[idx] == 1):
+                path = []
+                while idx != s:
+                    path.append((idx % w, idx // w))
+                    idx = came_from[idx]
+                path.reverse()
+                self.planned += 1
+                return path
+            if c >= MAX_PATH_LENGTH:
+                continue
+            for n in self._neighbors(idx):
+                if blocked[n] or field[n] == UNREACHABLE or occupied(n):
+                    continue
+                nc = c + 1
+                if nc < cost.get(n, MAX_PATH_LENGTH + 1):
+                    cost[n] = nc
+                    came_from[n] = idx
+                    heapq.heappush(heap, (nc + max(field[n] - offset, 0), -nc, n))
+        self.failed += 1
+        return None
+
+    def stats(self) -> dict:
+        return {
+            "planned": self.planned,
+            "failed": self.failed,
+            "cached_fields": len(self._fields),
+            "field_hits": self.field_hits,
+            "field_misses": self.field_misses,
+        }
@@ -0,0 +1,190 @@
+"""위치 저장 write-behind 서비스 — 연결 종료 처리가 네트워크를 기다리지 않도록 분리."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = 5.0  # 주기적 flush 간격 (초)
+MAX_CONCURRENCY = 8  # 동시에 진행할 Supabase 요청 수
+MAX_ATTEMPTS = 3  # 요청당 최대 시도 횟수
+RETRY_BACKOFF = 0.5  # 재시도 대기 기본값 (초, 시도마다 2배)
+REQUEST_TIMEOUT = 5.0
+
+
+class PositionStore:
+    """유저별 마지막 위치를 모아 두었다가 백그라운드에서 Supabase user_metadata 에 저장.
+
+    - ``mark_dirty()`` 는 메모리에 기록만 하고 즉시 반환 (같은 유저는 최신 값으로 합쳐짐)
+    - 주기적 flush 태스크가 동시 요청 수를 제한하며 PUT /auth/v1/user 호출, 실패 시 재시도
+    - 커넥션 풀을 가진 httpx.AsyncClient 하나를 계속 재사용
+    - ``close()`` 에서 남은 항목을 마지막으로 flush (FastAPI lifespan 종료 시)
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = FLUSH_INTERVAL,
+        max_concurrency: int = MAX_CONCURRENCY,
+    ):
+        self.flush_interval = flush_interval
+        self.max_concurrency = max_concurrency
+        # {user_id: (token, position)}
+        self._dirty: dict[str, tuple[str, dict]] = {}
+        # {user_id: 마지막으로 기록된 위치} — 재접속 시 토큰 안의 오래된 last_position 대신 사용
+        self._last: dict[str, dict] = {}
+        self._client: httpx.AsyncClient | None = None
+        self._task: asyncio.Task | None = None
+        self._flush_lock = asyncio.Lock()
+
+        # 메트릭
+        self.saved = 0
+        self.failed = 0
+
+    # ------------------------------------------------------------------
+    # 생명주기
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def close(self) -> None:
+        """flush 루프를 멈추고 남은 위치를 저장한 뒤 HTTP 클라이언트를 닫는다."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=REQUEST_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+            )
+        return self._client
+
+    # ------------------------------------------------------------------
+    # 기록 / flush
+    # ------------------------------------------------------------------
+
+    def mark_dirty(self, user_id: str, token: str, position: dict) -> None:
+        """저장할 위치 기록 (네트워크 호출 없음)."""
+        if not token:
+            return
+        stored = {
+            "gridX": position["gridX"],
+            "gridY": position["gridY"],
+            "direction": position.get("direction", "down"),
+        }
+        # 룸(맵)이 여러 개면 어느 룸의 위치인지도 함께 저장
+        if position.get("room"):
+            stored["room"] = position["room"]
+        self._dirty[user_id] = (token, stored)
+        self._last[user_id] = stored
+        self.start()
+
+    def last_known(self, user_id: str) -> dict | None:
+        """이 프로세스에서 마지막으로 기록된 위치 (없으면 None)."""
+        return self._last.get(user_id)
+
+    def restore(self, positions: dict[str, dict]) -> None:
+        """로컬 스냅샷에서 읽은 위치를 last_known 에 채운다 (이미 기록된 유저는 그대로)."""
+        for user_id, position in positions.items():
+            self._last.setdefault(user_id, position)
+
+    def known(self) -> dict[str, dict]:
+        """{user_id: 마지막으로 기록된 위치} — 로컬 스냅샷용 (읽기만 할 것)."""
+        return self._last
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Position flush failed: {e}")
+
+    async def flush(self) -> None:
+        """현재까지 쌓인 위치를 모두 저장."""
+        async with self._flush_lock:
+            if not self._dirty:
+                return
+            batch, self._dirty = self._dirty, {}
+            pending = dict(batch)
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+
+            async def save(user_id: str, token: str, position: dict):
+                async with semaphore:
+                    ok = await self._save_with_retry(user_id, token, position)
+                pending.pop(user_id, None)
+                if ok:
+                    self.saved += 1
+                else:
+                    self.failed += 1
+
+            try:
+                await asyncio.gather(*(
+                    save(uid, token, pos) for uid, (token, pos) in batch.items()
+                ))
+            except asyncio.CancelledError:
+                # 중단된 항목은 되돌려 close() 의 마지막 flush 에서 저장 (그 사이 새 값이 있으면 그쪽 우선)
+                for uid, entry in pending.items():
+                    self._dirty.setdefault(uid, entry)
+                raise
+
+    async def _save_with_retry(self, user_id: str, token: str, position: dict) -> bool:
+        supabase_url = os.environ.get("SUPABASE_URL")
+        supabase_key = os.environ.get("SUPABASE_KEY")
+        if not supabase_url or not supabase_key:
+            return False
+
+        for attempt in range(MAX_ATTEMPTS):
+            try:
+                response = await self._get_client().put(
+                    f"{supabase_url}/auth/v1/user",
+                    headers={
+                        "Authorization": f"Bearer {token}",
+                        "apikey": supabase_key,
+                        "Content-Type": "application/json",
+                    },
+                    json={"data": {"last_position": position}},
+                )
+                if response.status_code == 200:
+                    logger.info(f"Saved position for {user_id}: ({position['gridX']}, {position['gridY']})")
+                    return True
+                # 토큰 만료 등 클라이언트 오류는 재시도해도 소용없음
+                if 400 <= response.status_code < 500:
+                    logger.warning(f"Failed to save position for {user_id}: {response.status_code}")
+                    return False
+                logger.warning(f"Failed to save position for {user_id}: {response.status_code} (attempt {attempt + 1})")
+            except Exception as e:
+                logger.warning(f"Error saving position for {user_id}: {e} (attempt {attempt + 1})")
+            if attempt + 1 < MAX_ATTEMPTS:
+                await asyncio.sleep(RETRY_BACKOFF * (2 ** attempt))
+        return False
+
+    # ------------------------------------------------------------------
+    # 메트릭
+    # ------------------------------------------------------------------
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._dirty),
+            "saved": self.saved,
+            "failed": self.failed,
+        }
@@ -0,0 +1,253 @@
+"""로컬 위치 스냅샷 파일 — 재시작/배포 직후 Supabase 왕복 없이 마지막 위치를 복원.
+
+룸 레지스트리가 ``WS_SNAPSHOT_INTERVAL`` 초마다 모든 플레이어(접속 중 + 이 프로세스에서 나간 유저)의
+위치를 고정 크기 바이너리 레코드로 써 둔다. 쓰기는 임시 파일 → fsync → ``os.replace`` 라서
+프로세스가 쓰는 도중에 죽어도 이전 스냅샷이 그대로 남는다. 시작할 때 읽어
+``PositionStore.last_known`` 에 채워 두면 재접속한 유저는 토큰의 ``last_position`` 보다 먼저
+이 위치를 받는다.
+
+워커가 여러 개(``uvicorn --workers``)면 각자 ``WS_SNAPSHOT_FILE`` 이름 뒤에 워커 id(pid)를 붙인
+파일에 쓰고(``cgtown-positions.bin`` → ``cgtown-positions-1234.bin``), 시작할 때 같은 이름의
+파일을 모두 읽어 유저마다 가장 최근에 바뀐 레코드를 고른다. 한 파일을 같이 덮어쓰면 마지막에 쓴
+워커의 (다른 워커에서 나간 유저는 오래된) 위치만 남기 때문이다. ``WS_SNAPSHOT_MAX_AGE`` 보다
+오래된 파일(이전 실행의 워커)은 읽을 때 지운다.
+
+파일 형식 (little-endian)::
+
+    헤더  [magic "CGTP"][version u16][count u32][saved_at f64]
+    레코드 count * [user_id 40s][room 16s][gridX u16][gridY u16][direction u8][changed_at f64]
+
+``changed_at`` 은 이 워커가 그 위치를 처음 본 시각이다 (가만히 있으면 그대로라 내용이 같으면 다시 쓰지 않음).
+문자열은 UTF-8, 남는 자리는 0 으로 채운다. 필드 길이를 넘는 user_id / 룸 이름은 건너뛴다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import glob
+import logging
+import os
+import struct
+import tempfile
+import time
+from collections.abc import Callable, Iterable
+
+from ws.protocol import DIRECTIONS, direction_code
+
+logger = logging.getLogger(__name__)
+
+# 비워 두면 스냅샷을 쓰지 않음
+SNAPSHOT_FILE = os.environ.get(
+    "WS_SNAPSHOT_FILE", os.path.join(tempfile.gettempdir(), "cgtown-positions.bin")
+)
+SNAPSHOT_INTERVAL = float(os.environ.get("WS_SNAPSHOT_INTERVAL", "2"))
+# 이보다 오래된 스냅샷은 무시 (초) — 오래 꺼져 있던 뒤에는 Supabase 에 저장된 위치가 더 정확함
+SNAPSHOT_MAX_AGE = float(os.environ.get("WS_SNAPSHOT_MAX_AGE", "86400"))
+
+MAGIC = b"CGTP"
+VERSION = 2
+_HEADER = struct.Struct("<4sHId")
+_RECORD = struct.Struct("<40s16sHHBd")
+# 버전 1 (워커별 파일 이전, changed_at 없음) — 배포 직후 한 번은 읽을 수 있게
+_RECORD_V1 = struct.Struct("<40s16sHHB")
+RECORD_SIZE = _RECORD.size
+
+# (user_id, room, gridX, gridY, direction)
+Entry = tuple[str, str, int, int, str]
+
+
+def encode_records(entries: Iterable[tuple[Entry, float]]) -> bytes:
+    """``(엔트리, changed_at)`` 들을 레코드로."""
+    records = []
+    for (user_id, room, gx, gy, direction), changed_at in entries:
+        uid, name = user_id.encode(), room.encode()
+        if len(uid) > 40 or len(name) > 16 or not (0 <= gx < 65536 and 0 <= gy < 65536):
+            continue
+        records.append(_RECORD.pack(uid, name, gx, gy, direction_code(direction), changed_at))
+    return b"".join(records)
+
+
+def encode_snapshot(records: bytes, saved_at: float) -> bytes:
+    return _HEADER.pack(MAGIC, VERSION, len(records) // RECORD_SIZE, saved_at) + records
+
+
+def decode_snapshot(data: bytes) -> tuple[float, dict[str, tuple[Entry, float]]]:
+    """(saved_at, {user_id: (엔트리, changed_at)}). 형식이 틀리면 ValueError."""
+    if len(data) < _HEADER.size:
+        raise ValueError("truncated header")
+    magic, version, count, saved_at = _HEADER.unpack_from(data)
+    if magic != MAGIC or version not in (1, VERSION):
+        raise ValueError(f"unknown snapshot format {magic!r} v{version}")
+    record = _RECORD if version == VERSION else _RECORD_V1
+    if len(data) != _HEADER.size + count * record.size:
+        raise ValueError("size does not match record count")
+    entries = {}
+    for uid, room, gx, gy, d, *changed_at in record.iter_unpack(data[_HEADER.size:]):
+        user_id = uid.rstrip(b"\0").decode()
+        direction = DIRECTIONS[d] if d < len(DIRECTIONS) else "down"
+        entry = (user_id, room.rstrip(b"\0").decode(), gx, gy, direction)
+        entries[user_id] = (entry, changed_at[0] if changed_at else saved_at)
+    return saved_at, entries
+
+
+def worker_path(path: str, worker: str) -> str:
+    """``/tmp/cgtown-positions.bin`` → ``/tmp/cgtown-positions-{worker}.bin``."""
+    root, ext = os.path.splitext(path)
+    return f"{root}-{worker}{ext}"
+
+
+class PositionSnapshot:
+    """주기적으로 이 워커의 위치 스냅샷 파일을 원자적으로 교체한다.
+
+    - ``load()`` 는 시작 시 한 번 — 모든 워커 파일을 합침 (없거나 깨졌거나 너무 오래된 파일은 건너뜀)
+    - ``start(collect)`` 후 ``interval`` 마다 ``collect()`` 로 레코드를 모아 내용이 바뀌었을 때만 쓴다
+    - 인코딩은 이벤트 루프에서(일관된 시점), 파일 쓰기/fsync 는 스레드에서
+    """
+
+    def __init__(
+        self,
+        path: str = SNAPSHOT_FILE,
+        interval: float = SNAPSHOT_INTERVAL,
+        max_age: float = SNAPSHOT_MAX_AGE,
+        worker: str | None = None,
+    ):
+        # path 는 워커 파일 이름의 기준 (실제로 쓰는 파일은 self.path)
+        self.base_path = path
+        self.path = worker_path(path, worker or str(os.getpid())) if path else ""
+        self.interval = interval
+        self.max_age = max_age
+        self._collect: Callable[[], Iterable[Entry]] | None = None
+        self._task: asyncio.Task | None = None
+        self._last_body: bytes | None = None
+        # {user_id: (엔트리, 그 값을 처음 본 시각)} — 움직이지 않은 유저의 changed_at 을 유지
+        self._changed: dict[str, tuple[Entry, float]] = {}
+        # 메트릭
+        self.writes = 0
+        self.failed = 0
+        self.restored = 0
+        self.last_records = 0
+        self.last_write_ms = 0.0
+
+    def _files(self) -> list[str]:
+        """모든 워커의 스냅샷 파일 (+ 워커별 파일 이전의 단일 파일)."""
+        root, ext = os.path.splitext(self.base_path)
+        files = glob.glob(f"{glob.escape(root)}-*{glob.escape(ext)}")
+        if os.path.exists(self.base_path):
+            files.append(self.base_path)
+        return files
+
+    def load(self) -> dict[str, dict]:
+        """{user_id: {"gridX", "gridY", "direction", "room"}} — 워커 파일들을 합쳐 유저마다 가장 최근 위치."""
+        if not self.path:
+            return {}
+        now = time.time()
+        merged: dict[str, tuple[Entry, float]] = {}
+        for path in self._files():
+            try:
+                with open(path, "rb") as f:
+                    saved_at, entries = decode_snapshot(f.read())
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError, UnicodeDecodeError) as e:
+                logger.warning(f"Ignoring position snapshot {path}: {e}")
+                continue
+            age = now - saved_at
+            if self.max_age and age > self.max_age:
+                # 오래전에 끝난 워커의 파일 — 계속 쌓이지 않도록 정리
+                logger.info(f"Position snapshot {path} is {age:.0f}s old, removed")
+                _remove(path)
+                continue
+            for user_id, (entry, changed_at) in entries.items():
+                if user_id not in merged or changed_at > merged[user_id][1]:
+                    merged[user_id] = (entry, changed_at)
+            logger.info(f"Loaded {len(entries)} positions from snapshot {path} ({age:.1f}s old)")
+        # 다시 쓸 때 복원한 유저의 changed_at 을 그대로 유지 (다른 워커의 더 최신 위치를 덮지 않도록)
+        self._changed = dict(merged)
+        self.restored = len(merged)
+        return {
+            user_id: {"gridX": gx, "gridY": gy, "direction": direction, "room": room}
+            for user_id, ((_, room, gx, gy, direction), _) in merged.items()
+        }
+
+    def start(self, collect: Callable[[], Iterable[Entry]]) -> None:
+        self._collect = collect
+        if self.path and self.interval and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._loop())
+
+    async def close(self) -> None:
+        """주기 쓰기를 멈추고 마지막 스냅샷을 쓴다 (lifespan 종료 시)."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.save()
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.save()
+            except Exception as e:
+                logger.error(f"Position snapshot failed: {e}")
+
+    async def save(self) -> bool:
+        """현재 위치를 파일에 쓴다. 지난번과 같으면 건너뜀. 썼으면 True."""
+        if not self.path or self._collect is None:
+            return False
+        t0 = time.perf_counter()
+        now = time.time()
+        changed = {}
+        for entry in self._collect():
+            previous = self._changed.get(entry[0])
+            changed[entry[0]] = previous if previous is not None and previous[0] == entry else (entry, now)
+        self._changed = changed
+        # 헤더의 저장 시각만 다른 경우(아무도 움직이지 않음)는 다시 쓰지 않음
+        body = encode_records(sorted(changed.values()))
+        if body == self._last_body:
+            return False
+        data = encode_snapshot(body, now)
+        try:
+            await asyncio.to_thread(_write_atomic, self.path, data)
+        except OSError as e:
+            self.failed += 1
+            logger.warning(f"Failed to write position snapshot {self.path}: {e}")
+            return False
+        self._last_body = body
+        self.writes += 1
+        self.last_records = len(body) // RECORD_SIZE
+        self.last_write_ms = (time.perf_counter() - t0) * 1000
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "path": self.path,
+            "records": self.last_records,
+            "writes": self.writes,
+            "failed": self.failed,
+            "restored": self.restored,
+            "last_write_ms": round(self.last_write_ms, 2),
+        }
+
+
+def _remove(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=".positions-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
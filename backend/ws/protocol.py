@@ -0,0 +1,80 @@
+"""바이너리 WebSocket 프로토콜 — 위치 트래픽 전용 컴팩트 프레이밍.
+
+클라이언트가 ``cgtown.bin.v1`` 서브프로토콜로 접속하면 이동 메시지를
+JSON 대신 아래 형식의 바이너리 프레임으로 주고받는다.
+입장/퇴장/init 등 드문 이벤트는 기존 JSON 텍스트 프레임 그대로 사용한다.
+
+클라이언트 → 서버 (이동, 6 bytes)::
+
+    [0x01][gridX u16][gridY u16][direction u8]
+
+서버 → 클라이언트 (이동 묶음, 3 + 7n bytes)::
+
+    [0x02][count u16] + count * [player_index u16][gridX u16][gridY u16][direction u8]
+
+정수는 모두 little-endian. player_index 는 init/player_joined/view_enter 의
+``index`` / ``your_index`` 필드로 전달된다.
+"""
+
+from __future__ import annotations
+
+import struct
+
+SUBPROTOCOL_BINARY = "cgtown.bin.v1"
+
+OP_CLIENT_MOVE = 0x01
+OP_SERVER_MOVES = 0x02
+
+DIRECTIONS = ("down", "up", "left", "right")
+_DIRECTION_CODES = {d: i for i, d in enumerate(DIRECTIONS)}
+
+_CLIENT_MOVE = struct.Struct("<BHHB")
+_MOVES_HEADER = struct.Struct("<BH")
+_MOVE_RECORD = struct.Struct("<HHHB")
+
+MOVE_RECORD_SIZE = _MOVE_RECORD.size
+
+
+def direction_code(direction: str) -> int:
+    return _DIRECTION_CODES.get(direction, 0)
+
+
+def encode_client_move(grid_x: int, grid_y: int, direction: str) -> bytes:
+    """클라이언트 이동 프레임 (벤치마크/테스트 클라이언트용)."""
+    return _CLIENT_MOVE.pack(OP_CLIENT_MOVE, grid_x, grid_y, direction_code(direction))
+
+
+def decode_client_move(data: bytes) -> tuple[int, int, str] | None:
+    """클라이언트 이동 프레임 → (gridX, gridY, direction). 형식이 틀리면 None."""
+    if len(data) != _CLIENT_MOVE.size or data[0] != OP_CLIENT_MOVE:
+        return None
+    _, grid_x, grid_y, dir_code = _CLIENT_MOVE.unpack(data)
+    if dir_code >= len(DIRECTIONS):
+        return None
+    return grid_x, grid_y, DIRECTIONS[dir_code]
+
+
+def encode_move_record(player_index: int, position: dict) -> bytes:
+    """플레이어 한 명의 위치 레코드 (7 bytes)."""
+    return _MOVE_RECORD.pack(
+        player_index,
+        position["gridX"],
+        position["gridY"],
+        direction_code(position.get("direction", "down")),
+    )
+
+
+def encode_moves(records: list[bytes]) -> bytes:
+    """위치 레코드 묶음 → 서버 이동 프레임."""
+    return _MOVES_HEADER.pack(OP_SERVER_MOVES, len(records)) + b"".join(records)
+
+
+def decode_moves(data: bytes) -> list[tuple[int, int, int, str]]:
+    """서버 이동 프레임 → [(player_index, gridX, gridY, direction), ...]."""
+    op, count = _MOVES_HEADER.unpack_from(data)
+    if op != OP_SERVER_MOVES:
+        raise ValueError(f"unexpected opcode: {op}")
+    return [
+        (idx, gx, gy, DIRECTIONS[d])
+        for idx, gx, gy, d in _MOVE_RECORD.iter_unpack(data[_MOVES_HEADER.size:_MOVES_HEADER.size + count * MOVE_RECORD_SIZE])
+    ]
@@ -0,0 +1,534 @@
+"""룸(맵) 레지스트리 — 층별 사무실/식당/회의실 같은 여러 맵을 각자의 ConnectionManager 로 운영.
+
+룸마다 격자 크기, 타일 점유 상태, 브로드캐스트 범위, 백플레인이 따로 있다.
+수신 명령(이동/시야 변경/퇴장)은 룸 전용 워커 태스크가 도착 순서대로 처리하고,
+워커는 ``ROOM_TIME_SLICE`` 초마다 이벤트 루프에 양보하므로 한 룸에 이동이 몰려도
+조용한 룸의 명령이 그 뒤에 오래 줄 서지 않는다.
+
+룸 설정은 ``WS_ROOMS_FILE`` (JSON, 형식은 ``ws/rooms.example.json``) 으로 지정한다.
+없으면 기본 맵 하나(``main``)만 쓴다. 목록의 첫 번째 룸이 기본 룸이다.
+
+문(door): 룸의 특정 타일을 밟으면 연결을 끊지 않고 대상 룸의 지정 타일로 옮긴 뒤
+새 룸의 init 스냅샷을 보낸다.
+
+충돌 레이어: 룸의 ``map_file`` (프론트와 같은 Tiled JSON) 에서 벽/가구 타일을 읽어 이동/스폰/
+저장 위치 복원을 서버에서 막는다 (``ws.collision``). 파일이 바뀌면 ``WS_MAP_WATCH`` 초마다 확인해
+연결을 끊지 않고 다시 읽는다.
+
+프로필 변경(상태 메시지 등)은 ``publish_player_update`` 로 접속 중인 클라이언트에 바로 반영한다
+(재접속이나 ``/api/profiles`` 폴링 없이 ``player_updated`` 델타만 전송).
+
+워커 알림: 룸과 무관하게 모든 워커가 알아야 하는 일(호비 도구 캐시 무효화 등)은
+``publish_worker_event(이름)`` 으로 기본 룸 백플레인에 실어 보내고, 받은 워커는 ``on_worker_event`` 로
+등록한 핸들러를 부른다 (보낸 워커 자신은 직접 처리).
+
+NPC: 룸 설정의 ``npcs`` (기본 룸은 ``WS_NPC_COUNT``) 만큼 서버가 NPC 를 시뮬레이션해 움직인다 (``ws.npc``).
+
+이동 로그: 룸마다 확정된 이동을 일별 바이너리 로그로 남긴다 (``ws.movelog``, 분석은 ``ws.heatmap``).
+
+위치 스냅샷: 모든 룸의 위치를 주기적으로 로컬 파일(워커별)에 써 두고 시작할 때 모두 합쳐 읽어, 재시작/배포 직후
+재접속한 유저가 Supabase 저장 완료 여부와 관계없이 정확한 위치로 돌아온다 (``ws.position_snapshot``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+
+from fastapi import WebSocket
+
+from ws.backplane import create_backplane
+from ws.collision import CollisionMap, load_collision_map
+from ws.manager import BACKPLANE_URL, DEFAULT_ROOM, GRID_HEIGHT, GRID_WIDTH, ConnectionManager
+from ws.movelog import MOVE_LOG_DIR, MoveLog
+from ws.npc import NpcSimulation, NpcSpec, default_npcs
+from ws.persistence import PositionStore
+from ws.position_snapshot import Entry, PositionSnapshot
+from ws.session import Session
+
+logger = logging.getLogger(__name__)
+
+ROOMS_FILE = os.environ.get("WS_ROOMS_FILE", "")
+ROOM_TIME_SLICE = 0.002  # 룸 워커가 양보 없이 연달아 명령을 처리하는 최대 시간 (초)
+# 기본 룸 맵 (프론트 public 폴더의 Tiled JSON). 없으면 충돌 레이어 없이 동작
+_FRONTEND_MAP = os.path.normpath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "frontend", "public", "maps", "main.json")
+)
+MAP_FILE = os.environ.get("WS_MAP_FILE", _FRONTEND_MAP if os.path.exists(_FRONTEND_MAP) else "")
+# 맵 파일 변경 확인 주기 (초). 0 이면 시작 시 한 번만 읽음
+MAP_WATCH_INTERVAL = float(os.environ.get("WS_MAP_WATCH", "5"))
+# 기본 맵의 NPC 자리 (호비) — 프론트 NPC_POSITIONS 와 같게
+NPC_TILES = ((18, 3),)
+
+
+@dataclass(frozen=True)
+class Door:
+    """``(x, y)`` 타일을 밟으면 ``room`` 의 ``(target_x, target_y)`` 로 이동."""
+
+    x: int
+    y: int
+    room: str
+    target_x: int
+    target_y: int
+
+
+@dataclass(frozen=True)
+class RoomConfig:
+    name: str
+    title: str = ""
+    grid_width: int = GRID_WIDTH
+    grid_height: int = GRID_HEIGHT
+    doors: tuple[Door, ...] = ()
+    map_file: str = ""  # 충돌 레이어를 읽을 Tiled JSON (비어 있으면 벽 없음)
+    blocked: tuple[tuple[int, int], ...] = ()  # 맵에 없는 고정 장애물 (NPC 자리 등)
+    npcs: tuple[NpcSpec, ...] = ()  # 서버 시뮬레이션 NPC (ws.npc)
+
+
+DEFAULT_ROOMS = (RoomConfig(DEFAULT_ROOM, "사무실", map_file=MAP_FILE, blocked=NPC_TILES, npcs=default_npcs()),)
+
+
+def load_room_configs(path: str = ROOMS_FILE) -> list[RoomConfig]:
+    """룸 설정 파일 읽기. 경로가 없으면 기본 룸 하나."""
+    if not path:
+        return list(DEFAULT_ROOMS)
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    base = os.path.dirname(os.path.abspath(path))
+    configs = [
+        RoomConfig(
+            name=room["name"],
+            title=room.get("title", ""),
+            grid_width=room.get("grid_width", GRID_WIDTH),
+            grid_height=room.get("grid_height", GRID_HEIGHT),
+            doors=tuple(Door(**door) for door in room.get("doors", ())),
+            # 맵 파일 경로는 설정 파일 기준 상대 경로
+            map_file=os.path.normpath(os.path.join(base, room["map_file"])) if room.get("map_file") else "",
+            blocked=tuple(tuple(tile) for tile in room.get("blocked", ())),
+            npcs=tuple(NpcSpec.from_dict(npc) for npc in room.get("npcs", ())),
+        )
+        for room in data["rooms"]
+    ]
+    if not configs:
+        raise ValueError(f"{path}: no rooms defined")
+    names = {config.name for config in configs}
+    for config in configs:
+        for door in config.doors:
+            if door.room not in names:
+                raise ValueError(f"Room {config.name}: door at ({door.x}, {door.y}) leads to unknown room {door.room}")
+    return configs
+
+
+class Room:
+    """룸 하나 — ConnectionManager + 룸 상태를 바꾸는 명령을 처리하는 전용 워커 태스크."""
+
+    def __init__(self, config: RoomConfig, manager: ConnectionManager):
+        self.config = config
+        self.manager = manager
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        # 메트릭
+        self.processed = 0
+        self.max_queue_depth = 0
+        # 충돌 레이어 (맵 파일 수정 시각으로 핫 리로드 판단)
+        self.walls: CollisionMap | None = None
+        self.map_mtime = 0.0
+
+    @property
+    def name(self) -> str:
+        return self.config.name
+
+    def start(self) -> None:
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def submit(self, handler: Callable[..., Awaitable], *args) -> None:
+        """룸 워커 큐에 작업을 넣는다 (기다리지 않음, 도착 순서대로 처리)."""
+        self.start()
+        self._queue.put_nowait((handler, args))
+        depth = self._queue.qsize()
+        if depth > self.max_queue_depth:
+            self.max_queue_depth = depth
+
+    async def call(self, handler: Callable[..., Awaitable], *args):
+        """``submit`` 과 같은 큐로 넣되 처리가 끝날 때까지 기다려 결과를 돌려준다 (입장/재개처럼
+        호출자가 끝난 뒤에 이어가야 하는 작업). 앞서 들어온 명령이 모두 처리된 뒤에 실행된다."""
+        future = asyncio.get_running_loop().create_future()
+        self.submit(self._resolve, future, handler, args)
+        return await future
+
+    @staticmethod
+    async def _resolve(future: asyncio.Future, handler: Callable[..., Awaitable], args: tuple) -> None:
+        try:
+            result = await handler(*args)
+        except Exception as e:
+            if not future.done():  # 기다리던 쪽이 취소됐으면 버림
+                future.set_exception(e)
+            raise
+        if not future.done():
+            future.set_result(result)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        slice_end = loop.time() + ROOM_TIME_SLICE
+        while True:
+            handler, args = await self._queue.get()
+            try:
+                await handler(*args)
+            except Exception as e:
+                logger.error(f"Room {self.name} command failed: {e}")
+            self.processed += 1
+            now = loop.time()
+            if now >= slice_end:
+                # 큐가 계속 차 있으면 get() 이 양보하지 않으므로 다른 룸 워커에게 차례를 넘김
+                await asyncio.sleep(0)
+                slice_end = loop.time() + ROOM_TIME_SLICE
+
+    def stats(self) -> dict:
+        return {
+            "title": self.config.title,
+            "grid": [self.config.grid_width, self.config.grid_height],
+            "players": len(self.manager.active_connections),
+            "remote_players": len(self.manager.remote_players),
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue_depth": self.max_queue_depth,
+            "processed": self.processed,
+            "paths": self.manager.path_metrics(),
+            "move_log": self.manager.move_log.stats() if self.manager.move_log is not None else None,
+            "npcs": self.manager.npcs.stats() if self.manager.npcs is not None else None,
+            "map": {
+                "file": self.config.map_file,
+                "blocked_tiles": self.walls.count() if self.walls is not None else 0,
+            },
+        }
+
+
+class RoomRegistry:
+    """룸 목록 + 유저 → 룸 라우팅 + 문을 통한 룸 이동."""
+
+    def __init__(
+        self,
+        configs: list[RoomConfig] | None = None,
+        backplane_url: str = BACKPLANE_URL,
+        snapshot: PositionSnapshot | None = None,
+        move_log_dir: str = MOVE_LOG_DIR,
+        **manager_options,
+    ):
+        configs = configs or load_room_configs()
+        # 위치 저장은 룸끼리 공유 (저장된 위치에 룸 이름이 함께 들어감)
+        self.persistence = PositionStore()
+        self.snapshot = snapshot or PositionSnapshot()
+        self.default = configs[0].name
+        self.rooms: dict[str, Room] = {}
+        for config in configs:
+            manager = ConnectionManager(
+                config.grid_width,
+                config.grid_height,
+                backplane=create_backplane(backplane_url, config.grid_width, config.grid_height, config.name),
+                room=config.name,
+                persistence=self.persistence,
+                move_log=MoveLog(config.name, move_log_dir) if move_log_dir else None,
+                npcs=NpcSimulation(config.grid_width, config.grid_height, config.npcs) if config.npcs else None,
+                **manager_options,
+            )
+            manager.doors = {(door.x, door.y): door for door in config.doors}
+            manager.on_door = self._on_door
+            manager.on_worker_event = self._on_worker_event
+            room = self.rooms[config.name] = Room(config, manager)
+            self._load_map(room)
+        self._watch_task: asyncio.Task | None = None
+        # {워커 알림 이름: 핸들러}
+        self._worker_event_handlers: dict[str, Callable[[], None]] = {}
+        # 문을 지나는 중인 유저 {user_id: 도착 룸} — 도착 룸 워커가 받아들이기 전까지
+        self._transit: dict[str, Room] = {}
+
+    def get(self, name: str | None) -> Room | None:
+        return self.rooms.get(name) if name else None
+
+    def room_of(self, user_id: str) -> Room | None:
+        """유저가 지금 속한 룸 (룸 수가 적으므로 순회)."""
+        room = self._transit.get(user_id)
+        if room is not None:
+            return room
+        for room in self.rooms.values():
+            if user_id in room.manager.active_connections:
+                return room
+        return None
+
+    def resolve(self, requested: str | None, saved_position: dict | None) -> tuple[Room, dict | None]:
+        """접속할 룸 결정: 요청한 룸 → 저장된 위치의 룸 → 기본 룸.
+
+        저장된 위치는 같은 룸일 때만 쓸 수 있으므로 (룸, 그 룸에서 쓸 저장 위치) 를 반환.
+        """
+        saved_room = (saved_position or {}).get("room") or self.default
+        room = self.get(requested) or self.get(saved_room) or self.rooms[self.default]
+        return room, saved_position if saved_room == room.name else None
+
+    async def start(self) -> None:
+        # 재시작 직후 재접속하는 유저가 endpoint 의 last_known 으로 위치를 바로 받도록 먼저 읽음
+        self.persistence.restore(self.snapshot.load())
+        for room in self.rooms.values():
+            await room.manager.start()
+            room.start()
+            if room.manager.move_log is not None:
+                room.manager.move_log.start()
+        self.persistence.start()
+        self.snapshot.start(self._snapshot_entries)
+        if MAP_WATCH_INTERVAL and any(room.config.map_file for room in self.rooms.values()):
+            self._watch_task = asyncio.create_task(self._watch_maps())
+
+    async def shutdown(self) -> None:
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            self._watch_task = None
+        for room in self.rooms.values():
+            room.stop()
+            await room.manager.shutdown()
+            if room.manager.move_log is not None:
+                await room.manager.move_log.close()
+        # 접속 중이던 유저 위치까지 포함한 마지막 스냅샷 (Supabase 저장보다 먼저)
+        await self.snapshot.close()
+        await self.persistence.close()
+
+    # ------------------------------------------------------------------
+    # 접속 / 퇴장
+    #
+    # 입장/재개/퇴장도 이동/채팅과 같은 룸 워커 큐를 거친다 — 격자/색인/세션 상태를
+    # 바꾸는 작업이 큐에 먼저 들어온 명령과 섞여 실행되지 않도록.
+    # ------------------------------------------------------------------
+
+    async def connect(
+        self,
+        user_id: str,
+        user_info: dict,
+        websocket: WebSocket,
+        token: str,
+        room_name: str | None = None,
+        saved_position: dict | None = None,
+        view_radius: int | None = None,
+        binary: bool = False,
+    ) -> Room:
+        current = self.room_of(user_id)
+        if room_name is None and current is not None:
+            room_name = current.name
+        room, saved = self.resolve(room_name, saved_position)
+        if current is not None and current is not room:
+            # 다른 룸에 남아 있던 연결 — 그 룸 워커에서 닫고 퇴장 (같은 룸이면 manager.connect 가 처리)
+            await current.call(self._evict, current.manager, user_id)
+        await room.call(room.manager.connect, user_id, user_info, websocket, token, saved, view_radius, binary)
+        return room
+
+    @staticmethod
+    async def _evict(manager: ConnectionManager, user_id: str) -> None:
+        conn = manager.active_connections.get(user_id)
+        if conn is not None:
+            conn.sender.abort(code=4002, reason="duplicate_connection")
+        if await manager.disconnect(user_id):
+            await manager.broadcast_disconnect(user_id)
+
+    async def resume(
+        self,
+        user_id: str,
+        websocket: WebSocket,
+        resume_token: str,
+        last_seq: int | None,
+        binary: bool = False,
+        view_radius: int | None = None,
+    ) -> bool:
+        """진행 중인 세션에 새 소켓을 이어 붙인다 (룸 워커에서). 세션이 없거나 토큰이 다르면 False."""
+        room = self.room_of(user_id)
+        if room is None:
+            return False
+        return await room.call(room.manager.resume, user_id, websocket, resume_token, last_seq, binary, view_radius)
+
+    def leave(self, user_id: str, websocket: WebSocket, code: int | None = None) -> None:
+        """소켓이 끊김. 비정상 종료면 재접속을 잠시 기다리고, 아니면 퇴장 — 둘 다 룸 워커에서 처리.
+
+        정상 종료(1000/1001, 페이지 이탈 등)나 예외로 끝난 경우(code 없음)는 바로 퇴장.
+        """
+        room = self.room_of(user_id)
+        if room is None:
+            return
+        room.submit(self._leave, room.manager, user_id, websocket, code)
+
+    @staticmethod
+    async def _leave(manager: ConnectionManager, user_id: str, websocket: WebSocket, code: int | None) -> None:
+        if code not in (None, 1000, 1001) and manager.suspend(user_id, websocket):
+            return
+        if await manager.disconnect(user_id, websocket):
+            await manager.broadcast_disconnect(user_id)
+
+    # ------------------------------------------------------------------
+    # 문 (룸 이동)
+    # ------------------------------------------------------------------
+
+    async def _on_door(self, user_id: str, door: Door) -> None:
+        """출발 룸 워커에서 호출 — 출발 룸에서 내보내고 도착 룸 워커에 입장을 넘긴다."""
+        source = self.room_of(user_id)
+        target = self.rooms.get(door.room)
+        if source is None or target is None or target is source:
+            return
+        current = source.manager.positions.get(user_id)
+        direction = current.direction if current is not None else "down"
+        conn = await source.manager.release(user_id)
+        if conn is None:
+            return
+        self._transit[user_id] = target
+        position = {"gridX": door.target_x, "gridY": door.target_y, "direction": direction}
+        target.submit(self._arrive, target, user_id, conn, position)
+
+    async def _arrive(self, room: Room, user_id: str, conn: Session, position: dict) -> None:
+        if self._transit.get(user_id) is not room:
+            return  # 이동 중에 다시 접속해서 다른 세션이 됨
+        del self._transit[user_id]
+        if conn.sender.closed:
+            return  # 이동 중에 연결이 닫힘
+        await room.manager.admit(user_id, conn, position, conn.view_radius)
+        logger.info(f"{user_id} moved to room {room.name} ({position['gridX']}, {position['gridY']})")
+
+    # ------------------------------------------------------------------
+    # 충돌 레이어 (맵 핫 리로드)
+    # ------------------------------------------------------------------
+
+    def _load_map(self, room: Room, force: bool = False) -> bool:
+        """룸 맵 파일에서 충돌 레이어를 (다시) 읽는다. 바뀌었으면 True.
+
+        파일이 없거나 깨졌으면 경고만 남기고 이전 충돌 레이어를 유지한다.
+        """
+        config = room.config
+        if not config.map_file:
+            if config.blocked and room.walls is None:
+                room.walls = CollisionMap(config.grid_width, config.grid_height, config.blocked)
+                room.manager.set_collision(room.walls)
+                return True
+            return False
+        try:
+            mtime = os.path.getmtime(config.map_file)
+            if not force and mtime == room.map_mtime:
+                return False
+            walls = load_collision_map(config.map_file, config.grid_width, config.grid_height, config.blocked)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Room {room.name}: failed to load map {config.map_file}: {e}")
+            return False
+        room.map_mtime = mtime
+        room.walls = walls
+        room.manager.set_collision(walls)
+        logger.info(f"Room {room.name}: loaded collision map ({walls.count()} blocked tiles)")
+        return True
+
+    def reload_maps(self, force: bool = True) -> dict:
+        """맵 파일 다시 읽기 (관리자 API). 룸별 막힌 타일 수 반환."""
+        for room in self.rooms.values():
+            self._load_map(room, force)
+        return {name: room.walls.count() if room.walls is not None else 0 for name, room in self.rooms.items()}
+
+    async def _watch_maps(self) -> None:
+        while True:
+            await asyncio.sleep(MAP_WATCH_INTERVAL)
+            for room in self.rooms.values():
+                try:
+                    self._load_map(room)
+                except Exception as e:
+                    logger.error(f"Room {room.name}: map reload failed: {e}")
+
+    # ------------------------------------------------------------------
+    # 프로필 변경 알림
+    # ------------------------------------------------------------------
+
+    def publish_player_update(self, user_id: str, changes: dict) -> None:
+        """플레이어 user_info 변경을 그 플레이어가 있는 룸 워커에 넘긴다 (기다리지 않음).
+
+        이 워커가 모르는 플레이어(접속 중이 아님)면 아무것도 하지 않는다.
+        HTTP 요청이 어느 워커로 오든 같은 룸을 맡은 워커들은 모두 그 플레이어를 알고 있으므로
+        (로컬 또는 원격) 여기서 한 번 반영하면 나머지 워커에는 백플레인으로 전달된다.
+        """
+        for room in self.rooms.values():
+            manager = room.manager
+            if user_id in manager.active_connections or user_id in manager.remote_players:
+                room.submit(manager.update_player_info, user_id, changes)
+                return
+
+    def broadcast_player_update(self, user_id: str, changes: dict) -> None:
+        """맵에 고정으로 그려지는 NPC 처럼 위치 색인에 없는 플레이어의 변경 — 모든 룸/워커에 전송."""
+        message = json.dumps({"type": "player_updated", "user_id": user_id, "user_info": changes})
+        for room in self.rooms.values():
+            room.submit(room.manager.broadcast_all, message)
+
+    # ------------------------------------------------------------------
+    # 워커 알림
+    # ------------------------------------------------------------------
+
+    def on_worker_event(self, name: str, handler: Callable[[], None]) -> None:
+        """다른 워커가 ``publish_worker_event(name)`` 을 보내면 부를 핸들러 등록."""
+        self._worker_event_handlers[name] = handler
+
+    def publish_worker_event(self, name: str) -> None:
+        """다른 워커들에 알림 (기다리지 않음). 워커마다 룸별 백플레인 연결이 있으므로 기본 룸 것 하나로 보낸다."""
+        room = self.rooms[self.default]
+        room.submit(room.manager.backplane.publish, {"type": "worker_event", "name": name})
+
+    def _on_worker_event(self, name: str) -> None:
+        handler = self._worker_event_handlers.get(name)
+        if handler is None:
+            logger.warning(f"Unknown worker event: {name}")
+            return
+        handler()
+
+    # ------------------------------------------------------------------
+    # 위치 스냅샷
+    # ------------------------------------------------------------------
+
+    def _snapshot_entries(self) -> Iterable[Entry]:
+        """이 프로세스에서 나간 유저의 마지막 위치 + 지금 룸에 있는 모든 플레이어 위치 (후자 우선).
+
+        다른 워커 소속 플레이어도 위치 사본이 있으므로 포함한다 (어느 워커의 스냅샷이든 전체를 담음).
+        """
+        entries = {
+            uid: (uid, pos.get("room") or self.default, pos["gridX"], pos["gridY"], pos.get("direction", "down"))
+            for uid, pos in self.persistence.known().items()
+        }
+        for room in self.rooms.values():
+            for uid, pos in room.manager.positions.items():
+                entries[uid] = (uid, room.name, pos.x, pos.y, pos.direction)
+        return entries.values()
+
+    # ------------------------------------------------------------------
+    # 메트릭 (모든 룸 합계)
+    # ------------------------------------------------------------------
+
+    def connection_metrics(self) -> dict:
+        return {
+            uid: {**stats, "room": room.name}
+            for room in self.rooms.values()
+            for uid, stats in room.manager.connection_metrics().items()
+        }
+
+    def room_metrics(self) -> dict:
+        return {name: room.stats() for name, room in self.rooms.items()}
+
+    def limit_metrics(self) -> dict:
+        rejected: dict[str, int] = {}
+        for room in self.rooms.values():
+            for reason, count in room.manager.rejected_totals.items():
+                rejected[reason] = rejected.get(reason, 0) + count
+        metrics = self.rooms[self.default].manager.limit_metrics()
+        return {**metrics, "rejected": rejected}
+
+    def heartbeat_metrics(self) -> dict:
+        totals = [room.manager.heartbeat_metrics() for room in self.rooms.values()]
+        merged = dict(totals[0])
+        for key in ("reaped", "zombies", "suspended"):
+            merged[key] = sum(t[key] for t in totals)
+        return merged
+
+
+rooms = RoomRegistry()
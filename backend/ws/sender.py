@@ -0,0 +1,288 @@
+"""연결별 송신 큐 — 느린 클라이언트가 다른 플레이어의 브로드캐스트를 막지 않도록 분리."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import deque
+
+from fastapi import WebSocket
+
+logger = logging.getLogger(__name__)
+
+SEND_QUEUE_SIZE = 256  # 연결당 대기 가능한 최대 메시지 수
+SEND_TIMEOUT = 5.0  # 메시지 1개 전송 제한 시간 (초)
+
+# 큐가 가득 찼을 때의 정책
+#   coalesce: 같은 플레이어의 위치 메시지는 최신 것 하나만 남김 (그래도 넘치면 연결 종료)
+#   drop:     합치지 않고 큐가 넘치는 즉시 연결 종료
+OVERFLOW_COALESCE = "coalesce"
+OVERFLOW_DROP = "drop"
+OVERFLOW_POLICY = os.environ.get("WS_OVERFLOW_POLICY", OVERFLOW_COALESCE)
+
+SLOW_CONSUMER_CLOSE_CODE = 4003
+
+# 재접속(resume) 시 다시 보내줄 수 있도록 최근 전송 프레임을 보관하는 개수
+REPLAY_BUFFER_SIZE = int(os.environ.get("WS_REPLAY_BUFFER", "512"))
+
+_HAS_ASYNCIO_TIMEOUT = hasattr(asyncio, "timeout")  # Python 3.11+
+
+
+class _Control:
+    """큐에 들어간 제어 메시지 — 인코딩된 JSON 객체. 전송 시점에 ``"seq"`` 필드만 덧붙인다."""
+
+    __slots__ = ("body",)
+
+    def __init__(self, message: dict | str):
+        self.body = message if isinstance(message, str) else json.dumps(message)
+
+    def encode(self, seq: int) -> str:
+        return f'{self.body[:-1]}, "seq": {seq}}}'
+
+
+class ConnectionSender:
+    """WebSocket 하나에 대한 송신 큐 + 전용 writer 태스크.
+
+    ``send()`` 는 큐에 넣기만 하고 즉시 반환하므로 브로드캐스트 루프가
+    개별 소켓의 전송 완료를 기다리지 않는다.
+
+    ``key`` 가 있는 메시지(플레이어 위치)는 아직 전송되지 않은 같은 key 의
+    메시지가 큐에 있으면 그 자리의 내용을 최신 것으로 교체한다.
+    key 없는 메시지(입장/퇴장 등)가 들어오면 그 이전 슬롯은 더 이상 합치지 않아
+    메시지 간 순서가 뒤바뀌지 않는다.
+
+    세션 재개(resume)용 시퀀스: writer 가 일반 프레임을 꺼낼 때마다 ``seq`` 를 1 올리고
+    최근 ``REPLAY_BUFFER_SIZE`` 개를 링 버퍼에 보관한다. 프레임 본문에는 seq 를 넣지 않고
+    (관찰자끼리 공유하는 인코딩 결과를 그대로 쓰기 위해) 클라이언트가 받은 프레임 수를 센다.
+    init/resumed 같은 제어 메시지는 ``send_control()`` 로 보내며 세지 않고,
+    전송 시점의 ``seq`` 를 담아 클라이언트가 카운터를 맞출 수 있게 한다.
+
+    소켓이 끊기면 ``detach()`` 된 상태로 큐를 계속 쌓고, ``attach()`` 로 새 소켓에 이어 붙인다.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        maxsize: int = SEND_QUEUE_SIZE,
+        policy: str = OVERFLOW_POLICY,
+        send_timeout: float = SEND_TIMEOUT,
+    ):
+        self.websocket = websocket
+        self.maxsize = maxsize
+        self.policy = policy
+        self.send_timeout = send_timeout
+        # 항목: str | bytes (일반 메시지), [payload, key] (합칠 수 있는 슬롯),
+        #       _Control (제어 메시지, seq 미포함), (payload,) (재전송 — 이미 seq 를 받은 프레임)
+        self._queue: deque = deque()
+        # {key: 아직 열려 있는 슬롯}
+        self._open: dict[str, list] = {}
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self.closed = False
+
+        # 세션 재개
+        self.seq = 0
+        self._replay: deque[tuple[int, str | bytes]] = deque(maxlen=REPLAY_BUFFER_SIZE)
+        self.detached = False
+        # 분리된 동안 큐가 넘쳐 이벤트를 잃었음 → 재개 시 전체 스냅샷 필요
+        self.lost = False
+
+        # 메트릭
+        self.sent = 0
+        self.coalesced = 0
+        self.max_depth = 0
+        self.latency_avg = 0.0  # 전송 지연 지수이동평균 (초)
+        self.latency_max = 0.0
+
+    # ------------------------------------------------------------------
+    # 생명주기
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def detach(self) -> None:
+        """소켓이 끊김 — 재접속을 기다리는 동안 보낼 메시지는 큐에 쌓아 둔다."""
+        self.detached = True
+
+    def attach(self, websocket: WebSocket, last_seq: int | None, resumed: dict) -> bool:
+        """새 소켓으로 이어 붙인다.
+
+        클라이언트가 받은 마지막 seq 이후 프레임이 링 버퍼에 모두 남아 있으면
+        ``resumed`` 제어 메시지 → 빠진 프레임 재전송 → 대기 중이던 큐 순서로 보내고 True.
+        간격이 버퍼보다 크면 큐를 비우고 False (호출자가 전체 스냅샷을 보낸다).
+        """
+        if self._task is not None:
+            # 이전 소켓으로 전송 중이던 프레임은 이미 seq/링 버퍼에 기록되어 있음
+            self._task.cancel()
+            self._task = None
+        self.websocket = websocket
+        self.detached = False
+
+        first_seq = self._replay[0][0] if self._replay else self.seq + 1
+        ok = (
+            not self.lost
+            and last_seq is not None
+            and first_seq - 1 <= last_seq <= self.seq
+        )
+        if ok:
+            missed = [(payload,) for seq, payload in self._replay if seq > last_seq]
+            self._queue.extendleft(reversed([_Control(resumed), *missed]))
+        else:
+            self._queue.clear()
+            self._open.clear()
+        self.lost = False
+        self.start()
+        self._wakeup.set()
+        return ok
+
+    def stop(self) -> None:
+        """writer 태스크 중단 (소켓은 닫지 않음)."""
+        self.closed = True
+        self._queue.clear()
+        self._open.clear()
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
+
+    def abort(self, code: int = SLOW_CONSUMER_CLOSE_CODE, reason: str = "slow_consumer") -> None:
+        """큐를 버리고 소켓을 닫는다. 정리는 엔드포인트의 수신 루프 종료 시 처리된다."""
+        if self.closed:
+            return
+        self.stop()
+        asyncio.create_task(self._close(code, reason))
+
+    async def _close(self, code: int, reason: str) -> None:
+        try:
+            await self.websocket.close(code=code, reason=reason)
+        except Exception:
+            pass
+
+    # ------------------------------------------------------------------
+    # 송신
+    # ------------------------------------------------------------------
+
+    def send_control(self, message: dict | str) -> None:
+        """seq 를 세지 않는 제어 메시지 (전송 시점의 seq 를 ``"seq"`` 필드로 담아 보냄).
+
+        ``message`` 는 dict 또는 이미 인코딩된 JSON 객체 문자열.
+        """
+        if self.closed:
+            return
+        self._open.clear()
+        self._queue.append(_Control(message))
+        self._wakeup.set()
+
+    def send(self, message: str | bytes, key: str | None = None) -> bool:
+        """메시지를 큐에 넣는다. 큐가 넘쳐 연결을 끊었으면 False."""
+        if self.closed:
+            return False
+        if self.lost:
+            return True  # 재개 시 전체 스냅샷을 보내므로 그 전 이벤트는 버림
+        if key is not None and self.policy == OVERFLOW_COALESCE:
+            slot = self._open.get(key)
+            if slot is not None:
+                slot[0] = message
+                self.coalesced += 1
+                return True
+        if len(self._queue) >= self.maxsize:
+            if self.detached:
+                # 재접속 대기 중 — 연결을 끊지 않고 재개 시 스냅샷으로 대체
+                self.lost = True
+                self._queue.clear()
+                self._open.clear()
+                return True
+            logger.warning(f"WS send queue overflow ({len(self._queue)}), dropping client")
+            self.abort()
+            return False
+        if key is not None and self.policy == OVERFLOW_COALESCE:
+            slot = [message, key]
+            self._open[key] = slot
+            self._queue.append(slot)
+        else:
+            # 순서 보장: 이전 위치 슬롯은 더 이상 갱신하지 않음
+            self._open.clear()
+            self._queue.append(message)
+        depth = len(self._queue)
+        if depth > self.max_depth:
+            self.max_depth = depth
+        self._wakeup.set()
+        return True
+
+    async def _run(self) -> None:
+        try:
+            while not self.closed:
+                if not self._queue or self.detached:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+                item = self._queue.popleft()
+                if isinstance(item, list):
+                    payload, key = item
+                    if self._open.get(key) is item:
+                        del self._open[key]
+                elif isinstance(item, _Control):
+                    payload = item.encode(self.seq)
+                elif isinstance(item, tuple):
+                    payload = item[0]
+                else:
+                    payload = item
+                if not isinstance(item, (_Control, tuple)):
+                    # 전송 전에 기록 — 전송 도중 끊겨도 재개 시 다시 보낼 수 있도록
+                    self.seq += 1
+                    self._replay.append((self.seq, payload))
+                start = time.perf_counter()
+                try:
+                    await self._send(payload)
+                except asyncio.TimeoutError:
+                    raise
+                except Exception as e:
+                    # 소켓이 끊김 — 수신 루프가 세션을 재접속 대기로 돌리거나 정리한다
+                    logger.info(f"WS send failed, waiting for resume: {e!r}")
+                    self.detached = True
+                    continue
+                self._record_latency(time.perf_counter() - start)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.info(f"WS send failed, closing connection: {e!r}")
+            self.abort(code=1011, reason="send_failed")
+
+    async def _send(self, payload: str | bytes) -> None:
+        if isinstance(payload, bytes):
+            coro = self.websocket.send_bytes(payload)
+        else:
+            coro = self.websocket.send_text(payload)
+        if _HAS_ASYNCIO_TIMEOUT:
+            # wait_for 는 전송 완료와 취소가 겹치면 취소를 삼키는 경우가 있어 3.11+ 에서는 timeout 사용
+            async with asyncio.timeout(self.send_timeout):
+                await coro
+        else:
+            await asyncio.wait_for(coro, self.send_timeout)
+
+    def _record_latency(self, elapsed: float) -> None:
+        self.sent += 1
+        self.latency_avg = elapsed if self.sent == 1 else self.latency_avg * 0.9 + elapsed * 0.1
+        if elapsed > self.latency_max:
+            self.latency_max = elapsed
+
+    # ------------------------------------------------------------------
+    # 메트릭
+    # ------------------------------------------------------------------
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": len(self._queue),
+            "max_queue_depth": self.max_depth,
+            "sent": self.sent,
+            "coalesced": self.coalesced,
+            "send_latency_ms_avg": round(self.latency_avg * 1000, 3),
+            "send_latency_ms_max": round(self.latency_max * 1000, 3),
+            "policy": self.policy,
+            "closed": self.closed,
+            "seq": self.seq,
+            "detached": self.detached,
+        }
@@ -0,0 +1,139 @@
+"""플레이어별 상태 레코드 — 연결 세션과 타일 위치.
+
+접속자마다 dict 두 개(연결 정보, 위치)를 두던 것을 ``__slots__`` 레코드로 바꿔 플레이어당
+메모리를 줄이고, 위치는 이동마다 새로 만들지 않고 제자리에서 갱신한다.
+``user_info`` 는 입장 때 한 번 읽기 전용 매핑으로 고정하고, 바뀌면(상태 메시지) 통째로 교체한다.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import asyncio
+
+    from fastapi import WebSocket
+
+    from ws.limits import ConnectionLimiter
+    from ws.sender import ConnectionSender
+
+# 와이어 형식(JSON/저장소)의 위치 키
+POSITION_KEYS = ("gridX", "gridY", "direction")
+
+
+def freeze_info(user_info: Mapping) -> Mapping:
+    """user_info 를 복사해 읽기 전용으로 고정 (JSON 으로 보낼 때는 ``dict(...)``)."""
+    return MappingProxyType(dict(user_info))
+
+
+class Position:
+    """타일 위치 + 바라보는 방향.
+
+    위치 dict 를 받던 코드(limits, persistence, protocol, 벤치마크)를 위해
+    와이어 키(``gridX``/``gridY``/``direction``)로도 읽을 수 있다 — ``pos["gridX"]``, ``{**pos}``.
+    """
+
+    __slots__ = ("x", "y", "direction")
+
+    def __init__(self, x: int, y: int, direction: str = "down"):
+        self.x = x
+        self.y = y
+        self.direction = direction
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> Position:
+        return cls(data["gridX"], data["gridY"], data.get("direction", "down"))
+
+    def set(self, x: int, y: int, direction: str) -> None:
+        self.x = x
+        self.y = y
+        self.direction = direction
+
+    def as_dict(self) -> dict:
+        return {"gridX": self.x, "gridY": self.y, "direction": self.direction}
+
+    def json(self) -> str:
+        """``json.dumps(self.as_dict())`` 와 같은 문자열 (중간 dict 없이)."""
+        return f'{{"gridX": {self.x}, "gridY": {self.y}, "direction": {json.dumps(self.direction)}}}'
+
+    # dict 호환 읽기 --------------------------------------------------
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "gridX":
+            return self.x
+        if key == "gridY":
+            return self.y
+        if key == "direction":
+            return self.direction
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self) -> tuple[str, ...]:
+        return POSITION_KEYS
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Position):
+            return (self.x, self.y, self.direction) == (other.x, other.y, other.direction)
+        if isinstance(other, Mapping):
+            return self.as_dict() == dict(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Position({self.x}, {self.y}, {self.direction!r})"
+
+
+class Session:
+    """이 워커에 접속한 플레이어 한 명의 연결 상태.
+
+    ``handle`` 은 룸 안에서의 작은 정수 핸들 (바이너리 프로토콜의 player_index 와 같음).
+    룸을 옮기면(문) 세션은 그대로 넘어가고 새 룸에서 핸들만 다시 받는다.
+    """
+
+    __slots__ = (
+        "ws",
+        "sender",
+        "user_info",
+        "token",
+        "binary",
+        "resume_token",
+        "expiry",
+        "limiter",
+        "last_seen",
+        "view_radius",
+        "handle",
+    )
+
+    def __init__(
+        self,
+        ws: WebSocket | None,
+        sender: ConnectionSender,
+        user_info: Mapping,
+        token: str,
+        limiter: ConnectionLimiter,
+        resume_token: str,
+        last_seen: float,
+        binary: bool = False,
+    ):
+        self.ws = ws
+        self.sender = sender
+        self.user_info = freeze_info(user_info)
+        self.token = token
+        self.binary = binary
+        # 재접속 시 이 세션을 이어받기 위한 토큰 (init 메시지로 전달)
+        self.resume_token = resume_token
+        self.expiry: asyncio.Task | None = None
+        self.limiter = limiter
+        # 마지막 수신 시각 (monotonic) — heartbeat 정리 기준
+        self.last_seen = last_seen
+        self.view_radius: int | None = None
+        self.handle = -1
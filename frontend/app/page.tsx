@@ -7,6 +7,7 @@ import { useMultiplayer } from '@/hooks/useMultiplayer'
 import { createClient } from '@/lib/supabase/client'
 import { getEmailPrefix, NPC_POSITIONS } from '@/lib/gameConfig'
 import NpcChat from '@/components/NpcChat'
+import NearbyChat from '@/components/NearbyChat'
 
 // PhaserGame 컴포넌트를 dynamic import로 로드 (SSR 비활성화)
 const PhaserGame = dynamic(() => import('@/components/PhaserGame'), {
@@ -40,7 +41,10 @@ export default function Home() {
   const router = useRouter()
 
   // 멀티플레이어 훅 사용
-  const { remotePlayers, isConnected, sendPosition, myName, myEmailPrefix, myStatusMessage, myGridPos } = useMultiplayer()
+  const {
+    remotePlayers, isConnected, sendPosition, moveTo, sendChat, chatMessages, profileUpdates, collision,
+    myName, myEmailPrefix, myStatusMessage, myGridPos
+  } = useMultiplayer()
 
   // NPC 프로필 + 대화 상태
   const [npcProfiles, setNpcProfiles] = useState<NpcProfile[]>([])
@@ -69,13 +73,15 @@ export default function Home() {
     npcProfiles.forEach((npc, i) => {
       const emailPrefix = getEmailPrefix(npc.email)
       const pos = NPC_POSITIONS[emailPrefix] || { x: 20 + i, y: 3 }
+      // 서버가 보낸 실시간 상태 메시지 변경 (식단 갱신 등) 이 있으면 우선
+      const update = profileUpdates[npc.id]
       npcEntries[`npc_${npc.id}`] = {
         user_info: {
           id: npc.id,
           email: npc.email,
           email_prefix: emailPrefix,
           name: npc.username,
-          status_message: npc.status_message || '',
+          status_message: (update?.status_message ?? npc.status_message) || '',
           is_npc: true,
         },
         position: {
@@ -87,7 +93,7 @@ export default function Home() {
     })
 
     return { ...remotePlayers, ...npcEntries }
-  }, [remotePlayers, npcProfiles])
+  }, [remotePlayers, npcProfiles, profileUpdates])
 
   // NPC 대화 이벤트 핸들링 (EventBus는 SSR 방지를 위해 dynamic import)
   useEffect(() => {
@@ -203,12 +209,16 @@ export default function Home() {
         myEmailPrefix={myEmailPrefix}
         myStatusMessage={myStatusMessage}
         myGridPos={myGridPos}
+        collision={collision}
         onPositionChange={handlePositionChange}
+        onMoveTo={moveTo}
       />
 
-      {/* NPC 대화창 */}
-      {chatNpc && (
+      {/* NPC 대화창 (열려 있는 동안 근접 채팅은 숨김) */}
+      {chatNpc ? (
         <NpcChat npcName={chatNpc.npcName} onClose={handleCloseChat} />
+      ) : (
+        <NearbyChat messages={chatMessages} isConnected={isConnected} onSend={sendChat} />
       )}
     </>
   )
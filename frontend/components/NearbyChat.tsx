@@ -0,0 +1,142 @@
+'use client'
+
+import { useEffect, useRef, useState } from 'react'
+import type { ChatMessage } from '@/hooks/useMultiplayer'
+
+interface NearbyChatProps {
+  messages: ChatMessage[]
+  isConnected: boolean
+  onSend: (message: string) => void
+}
+
+// 화면에 보여줄 최근 채팅 수
+const VISIBLE_MESSAGES = 6
+// 서버 제한 (backend/ws/limits.py WS_CHAT_MAX_LENGTH) 과 동일
+const MAX_LENGTH = 200
+// 모바일 D-pad (PhaserGame) 위로 올릴 높이 — 24 + 48 * 3 + 4 * 2 + 12
+const DPAD_OFFSET = 188
+
+/**
+ * 근접 채팅 — 주변 플레이어와 주고받은 최근 메시지 + 입력창.
+ * 서버가 보낸 사람에게도 메시지를 돌려주므로 목록은 chat_message 로 받은 것만 보여준다.
+ */
+export default function NearbyChat({ messages, isConnected, onSend }: NearbyChatProps) {
+  const [input, setInput] = useState('')
+  const [aboveDpad, setAboveDpad] = useState(false)
+  const endRef = useRef<HTMLDivElement>(null)
+  const inputRef = useRef<HTMLInputElement>(null)
+
+  useEffect(() => {
+    const check = () => setAboveDpad(window.innerWidth < 1024 || navigator.maxTouchPoints > 0)
+    check()
+    window.addEventListener('resize', check)
+    return () => window.removeEventListener('resize', check)
+  }, [])
+
+  useEffect(() => {
+    endRef.current?.scrollIntoView({ behavior: 'smooth' })
+  }, [messages])
+
+  const send = () => {
+    const text = input.trim()
+    if (!text || !isConnected) return
+    onSend(text)
+    setInput('')
+  }
+
+  const handleKeyDown = (e: React.KeyboardEvent<HTMLInputElement>) => {
+    // Phaser 키보드(방향키/스페이스 캡처)가 window 에서 받지 않도록 — 입력 중 캐릭터가 움직이지 않음
+    e.stopPropagation()
+    if (e.key === 'Enter' && !e.nativeEvent.isComposing) {
+      e.preventDefault()
+      send()
+    } else if (e.key === 'Escape') {
+      inputRef.current?.blur()
+    }
+  }
+
+  const visible = messages.slice(-VISIBLE_MESSAGES)
+
+  return (
+    <div
+      style={{
+        position: 'fixed',
+        bottom: aboveDpad ? DPAD_OFFSET : 24,
+        left: 24,
+        zIndex: 150,
+        width: 'min(320px, calc(100vw - 48px))',
+        display: 'flex',
+        flexDirection: 'column',
+        gap: 6,
+      }}
+      onClick={(e) => e.stopPropagation()}
+    >
+      {visible.length > 0 && (
+        <div
+          style={{
+            maxHeight: 160,
+            overflowY: 'auto',
+            padding: '6px 10px',
+            borderRadius: 10,
+            backgroundColor: 'rgba(0,0,0,0.45)',
+            display: 'flex',
+            flexDirection: 'column',
+            gap: 2,
+          }}
+        >
+          {visible.map((msg, i) => (
+            <div
+              key={`${msg.timestamp}-${msg.user_id}-${i}`}
+              style={{ fontSize: 12, lineHeight: 1.4, color: 'white', wordBreak: 'break-word' }}
+            >
+              <span style={{ fontWeight: 'bold', color: msg.mine ? '#FDBA74' : '#BFDBFE' }}>
+                {msg.user_name || '알 수 없음'}
+              </span>{' '}
+              {msg.message}
+            </div>
+          ))}
+          <div ref={endRef} />
+        </div>
+      )}
+
+      <div style={{ display: 'flex', gap: 6 }}>
+        <input
+          ref={inputRef}
+          type="text"
+          value={input}
+          maxLength={MAX_LENGTH}
+          onChange={(e) => setInput(e.target.value)}
+          onKeyDown={handleKeyDown}
+          onKeyUp={(e) => e.stopPropagation()}
+          placeholder={isConnected ? '주변 사람에게 말하기...' : '연결 중...'}
+          disabled={!isConnected}
+          style={{
+            flex: 1,
+            minWidth: 0,
+            padding: '6px 10px',
+            borderRadius: 8,
+            border: '1px solid rgba(0,0,0,0.15)',
+            backgroundColor: 'rgba(255,255,255,0.9)',
+            fontSize: 12,
+            outline: 'none',
+          }}
+        />
+        <button
+          onClick={send}
+          disabled={!isConnected || !input.trim()}
+          style={{
+            padding: '6px 12px',
+            borderRadius: 8,
+            border: 'none',
+            backgroundColor: !isConnected || !input.trim() ? 'rgba(156,163,175,0.9)' : '#E8852C',
+            color: 'white',
+            fontSize: 12,
+            cursor: !isConnected || !input.trim() ? 'default' : 'pointer',
+          }}
+        >
+          전송
+        </button>
+      </div>
+    </div>
+  )
+}
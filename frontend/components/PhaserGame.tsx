@@ -4,6 +4,7 @@ import { useEffect, useRef, useState, forwardRef, useImperativeHandle } from 're
 import * as Phaser from 'phaser'
 import { EventBus, GameEvents } from '@/lib/EventBus'
 import { MAP_WIDTH, MAP_HEIGHT, TILE_SIZE, GRID_WIDTH, GRID_HEIGHT, getCharacterImageUrl } from '@/lib/gameConfig'
+import { isBlocked, type CollisionLayer } from '@/lib/wsProtocol'
 
 // 모바일 터치 D-pad 방향 (모듈 레벨 — Phaser update()에서 읽음)
 let mobileDirection: string | null = null
@@ -39,7 +40,9 @@ interface PhaserGameProps {
   myEmailPrefix: string
   myStatusMessage: string
   myGridPos: { x: number; y: number } | null
+  collision: CollisionLayer | null
   onPositionChange: (gridX: number, gridY: number, direction: string) => void
+  onMoveTo: (gridX: number, gridY: number) => void
 }
 
 // 게임 인스턴스 Ref 타입
@@ -63,6 +66,11 @@ class MainScene extends Phaser.Scene {
   private gridX: number = 12
   private gridY: number = 6
   private isMoving: boolean = false
+  private moveTimer: Phaser.Time.TimerEvent | null = null
+  // 마지막으로 받은 서버 기준 위치 (init / correction / move_to 경로) — 새 값이 오면 이동 중이어도 맞춤
+  private serverGridPos: { x: number; y: number } | null = null
+  // 서버 충돌 레이어 — 막힌 타일로는 방향만 바꾸고 이동하지 않음 (서버 보정으로 되돌아가는 것 방지)
+  private collision: CollisionLayer | null = null
   private direction: string = 'down'
   private myName: string = ''
   private myEmailPrefix: string = ''
@@ -206,6 +214,9 @@ class MainScene extends Phaser.Scene {
       this.enterKey = this.input.keyboard.addKey(Phaser.Input.Keyboard.KeyCodes.ENTER)
     }
 
+    // 클릭/탭 이동 — 누른 타일까지의 경로는 서버가 찾아 한 칸씩 보내준다
+    this.input.on('pointerdown', this.handlePointerDown, this)
+
     // NPC 대화 힌트 텍스트 (숨김 상태)
     this.npcHintText = this.add.text(0, 0, '대화하기 (Enter)', {
       fontSize: '12px',
@@ -241,6 +252,11 @@ class MainScene extends Phaser.Scene {
     EventBus.on(GameEvents.REMOTE_PLAYERS_UPDATE, this.handleRemotePlayersUpdate, this)
     EventBus.on(GameEvents.MY_INFO_UPDATE, this.handleMyInfoUpdate, this)
     EventBus.on(GameEvents.CHAT_OPEN, (open: boolean) => { chatOpen = open })
+    EventBus.on(GameEvents.COLLISION_UPDATE, this.handleCollisionUpdate, this)
+  }
+
+  private handleCollisionUpdate = (collision: CollisionLayer | null) => {
+    this.collision = collision
   }
 
   /**
@@ -289,10 +305,10 @@ class MainScene extends Phaser.Scene {
       this.drawBubble(this.playerBubbleGfx, this.playerBubbleText)
     }
 
-    if (data.gridPos && !this.isMoving) {
-      this.gridX = data.gridPos.x
-      this.gridY = data.gridPos.y
-      this.updatePlayerPosition()
+    // 서버 기준 위치가 새로 왔으면 (이름 등 다른 정보만 바뀐 경우는 같은 객체) 걷는 중이어도 취소하고 맞춤
+    if (data.gridPos && data.gridPos !== this.serverGridPos) {
+      this.serverGridPos = data.gridPos
+      this.snapTo(data.gridPos.x, data.gridPos.y)
     }
   }
 
@@ -559,6 +575,12 @@ class MainScene extends Phaser.Scene {
       newDirection = 'right'
     }
 
+    if ((newGridX !== this.gridX || newGridY !== this.gridY) && this.collision && isBlocked(this.collision, newGridX, newGridY)) {
+      // 벽/가구 — 서버가 거부할 이동이므로 보내지 않고 그쪽을 바라보기만 함
+      newGridX = this.gridX
+      newGridY = this.gridY
+    }
+
     if (newGridX !== this.gridX || newGridY !== this.gridY) {
       this.direction = newDirection
       this.gridX = newGridX
@@ -631,7 +653,8 @@ class MainScene extends Phaser.Scene {
       ease: 'Linear',
     })
 
-    this.time.delayedCall(150, () => {
+    this.moveTimer = this.time.delayedCall(150, () => {
+      this.moveTimer = null
       this.isMoving = false
       this.player.setDepth(this.gridY)
 
@@ -643,6 +666,34 @@ class MainScene extends Phaser.Scene {
     })
   }
 
+  /**
+   * 포인터 위치(월드 좌표)를 타일로 바꿔 서버 경로 이동 요청
+   */
+  private handlePointerDown(pointer: Phaser.Input.Pointer) {
+    if (chatOpen) return
+    const gridX = Math.floor(pointer.worldX / TILE_SIZE)
+    const gridY = Math.floor(pointer.worldY / TILE_SIZE)
+    if (gridX < 0 || gridX >= GRID_WIDTH || gridY < 0 || gridY >= GRID_HEIGHT) return
+    if (gridX === this.gridX && gridY === this.gridY) return
+    if (this.collision && isBlocked(this.collision, gridX, gridY)) return
+    EventBus.emit(GameEvents.PLAYER_MOVE_TO, { gridX, gridY })
+  }
+
+  /**
+   * 서버 기준 위치로 즉시 이동 — 진행 중인 한 칸 이동(트윈 + 완료 시 전송)은 취소
+   */
+  private snapTo(gridX: number, gridY: number) {
+    if (this.moveTimer) {
+      this.moveTimer.remove(false)
+      this.moveTimer = null
+    }
+    this.tweens.killTweensOf([this.player, this.playerNameText, this.playerBubbleGfx, this.playerBubbleText])
+    this.isMoving = false
+    this.gridX = gridX
+    this.gridY = gridY
+    this.updatePlayerPosition()
+  }
+
   private updatePlayerPosition() {
     const x = this.gridX * TILE_SIZE + TILE_SIZE / 2
     const y = this.gridY * TILE_SIZE + TILE_SIZE / 2
@@ -664,6 +715,8 @@ class MainScene extends Phaser.Scene {
     EventBus.off(GameEvents.REMOTE_PLAYERS_UPDATE, this.handleRemotePlayersUpdate, this)
     EventBus.off(GameEvents.MY_INFO_UPDATE, this.handleMyInfoUpdate, this)
     EventBus.off(GameEvents.CHAT_OPEN)
+    EventBus.off(GameEvents.COLLISION_UPDATE, this.handleCollisionUpdate, this)
+    this.input.off('pointerdown', this.handlePointerDown, this)
 
     this.remotePlayerSprites.forEach((container) => container.destroy())
     this.remotePlayerSprites.clear()
@@ -685,14 +738,14 @@ function dpadUp() {
  * PhaserGame 컴포넌트
  */
 const PhaserGame = forwardRef<PhaserGameRef, PhaserGameProps>((props, ref) => {
-  const { remotePlayers, isConnected, myName, myEmailPrefix, myStatusMessage, myGridPos, onPositionChange } = props
+  const { remotePlayers, isConnected, myName, myEmailPrefix, myStatusMessage, myGridPos, collision, onPositionChange, onMoveTo } = props
 
   const gameRef = useRef<Phaser.Game | null>(null)
   const containerRef = useRef<HTMLDivElement>(null)
   const sceneRef = useRef<Phaser.Scene | null>(null)
   const sceneReadyRef = useRef<boolean>(false)
-  const latestPropsRef = useRef({ myName, myEmailPrefix, myStatusMessage, myGridPos, remotePlayers })
-  latestPropsRef.current = { myName, myEmailPrefix, myStatusMessage, myGridPos, remotePlayers }
+  const latestPropsRef = useRef({ myName, myEmailPrefix, myStatusMessage, myGridPos, remotePlayers, collision })
+  latestPropsRef.current = { myName, myEmailPrefix, myStatusMessage, myGridPos, remotePlayers, collision }
 
   const [showDpad, setShowDpad] = useState(false)
   const [nearbyNpc, setNearbyNpc] = useState<{ npcId: string; npcName: string } | null>(null)
@@ -757,6 +810,7 @@ const PhaserGame = forwardRef<PhaserGameRef, PhaserGameProps>((props, ref) => {
       const p = latestPropsRef.current
       EventBus.emit(GameEvents.MY_INFO_UPDATE, { name: p.myName, emailPrefix: p.myEmailPrefix, statusMessage: p.myStatusMessage, gridPos: p.myGridPos })
       EventBus.emit(GameEvents.REMOTE_PLAYERS_UPDATE, p.remotePlayers)
+      EventBus.emit(GameEvents.COLLISION_UPDATE, p.collision)
     }
     EventBus.on(GameEvents.SCENE_READY, handleSceneReady)
 
@@ -778,6 +832,15 @@ const PhaserGame = forwardRef<PhaserGameRef, PhaserGameProps>((props, ref) => {
     }
   }, [onPositionChange])
 
+  // 클릭/탭 이동 요청 전달 (게임 인스턴스와 따로 등록해 콜백이 바뀌어도 게임을 다시 만들지 않음)
+  useEffect(() => {
+    const handleMoveTo = (data: { gridX: number; gridY: number }) => {
+      onMoveTo(data.gridX, data.gridY)
+    }
+    EventBus.on(GameEvents.PLAYER_MOVE_TO, handleMoveTo)
+    return () => { EventBus.off(GameEvents.PLAYER_MOVE_TO, handleMoveTo) }
+  }, [onMoveTo])
+
   useEffect(() => {
     if (sceneReadyRef.current) {
       EventBus.emit(GameEvents.REMOTE_PLAYERS_UPDATE, remotePlayers)
@@ -790,6 +853,12 @@ const PhaserGame = forwardRef<PhaserGameRef, PhaserGameProps>((props, ref) => {
     }
   }, [myName, myEmailPrefix, myStatusMessage, myGridPos])
 
+  useEffect(() => {
+    if (sceneReadyRef.current) {
+      EventBus.emit(GameEvents.COLLISION_UPDATE, collision)
+    }
+  }, [collision])
+
   const btnStyle: React.CSSProperties = {
     width: 48,
     height: 48,
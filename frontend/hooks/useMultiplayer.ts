@@ -1,6 +1,8 @@
 'use client'
 import { useState, useEffect, useRef, useCallback } from 'react'
 import { createClient } from '@/lib/supabase/client'
+import { TILE_SIZE, MAP_WIDTH, MAP_HEIGHT } from '@/lib/gameConfig'
+import { SUBPROTOCOL_BINARY, DIRECTIONS, encodeClientMove, decodeServerMoves, decodeCollision, type CollisionLayer } from '@/lib/wsProtocol'
 
 interface PlayerInfo {
   id: string
@@ -16,13 +18,43 @@ interface PlayerPosition {
   direction: string
 }
 
+export interface ChatMessage {
+  user_id: string
+  user_name: string
+  message: string
+  timestamp: string
+  mine: boolean  // 내가 보낸 메시지 (서버가 보낸 사람에게도 돌려줌)
+}
+
 interface RemotePlayer {
+  index?: number
   user_info: PlayerInfo
   position: PlayerPosition
 }
 
 const WS_URL = process.env.NEXT_PUBLIC_WS_URL || 'ws://localhost:8000'
 
+// 카메라 최소 줌 (PhaserGame.updateCameraFit 과 동일)
+const MIN_CAMERA_ZOOM = 0.8
+// 시야 경계 밖에서 미리 받아둘 여유 타일 수
+const VIEW_MARGIN_TILES = 2
+// 보관할 최근 채팅 수
+const MAX_CHAT_MESSAGES = 50
+// 서버 시뮬레이션 NPC 의 remotePlayers 키 접두사 (backend/ws/npc.py NPC_ID_PREFIX)
+const SIM_NPC_PREFIX = 'sim_npc_'
+
+/**
+ * 화면에 보이는 타일 반경 계산.
+ * 맵 전체가 화면에 들어오면 null (서버가 전체 이벤트 전송)
+ */
+function getViewRadius(): number | null {
+  if (typeof window === 'undefined') return null
+  const fitZoom = Math.min(window.innerWidth / MAP_WIDTH, window.innerHeight / MAP_HEIGHT)
+  if (fitZoom >= MIN_CAMERA_ZOOM) return null
+  const visibleTiles = Math.max(window.innerWidth, window.innerHeight) / (TILE_SIZE * MIN_CAMERA_ZOOM)
+  return Math.ceil(visibleTiles / 2) + VIEW_MARGIN_TILES
+}
+
 export function useMultiplayer() {
   const [remotePlayers, setRemotePlayers] = useState<Record<string, RemotePlayer>>({})
   const [isConnected, setIsConnected] = useState(false)
@@ -30,10 +62,54 @@ export function useMultiplayer() {
   const [myEmailPrefix, setMyEmailPrefix] = useState<string>('')
   const [myStatusMessage, setMyStatusMessage] = useState<string>('')
   const [myGridPos, setMyGridPos] = useState<{ x: number; y: number } | null>(null)
+  const [chatMessages, setChatMessages] = useState<ChatMessage[]>([])
+  // 서버 충돌 레이어 (init / 맵 핫 리로드 시 collision 메시지) — 벽으로 가는 이동을 미리 막음
+  const [collision, setCollision] = useState<CollisionLayer | null>(null)
+  // 실시간 프로필 변경 누적 {user_id: 바뀐 필드} — 위치 동기화 대상이 아닌 NPC 표시에 사용
+  const [profileUpdates, setProfileUpdates] = useState<Record<string, Partial<PlayerInfo>>>({})
+  const myIdRef = useRef<string | null>(null)
   const wsRef = useRef<WebSocket | null>(null)
   const reconnectTimeoutRef = useRef<NodeJS.Timeout | null>(null)
   // React Strict Mode 중복 연결 방지를 위한 연결 상태 추적
   const isConnectingRef = useRef<boolean>(false)
+  // 바이너리 프로토콜: 서버가 부여한 player index → user_id
+  const indexToUserRef = useRef<Map<number, string>>(new Map())
+  // 세션 재개: init 으로 받은 resume 토큰 + 지금까지 받은 프레임 seq (init/resumed 제외 모든 프레임을 셈)
+  const resumeRef = useRef<{ token: string; lastSeq: number } | null>(null)
+  // move_to 경로 보간 타이머 {user_id: interval}
+  const pathTimersRef = useRef<Map<string, ReturnType<typeof setInterval>>>(new Map())
+
+  const stopPath = useCallback((userId: string) => {
+    const timer = pathTimersRef.current.get(userId)
+    if (timer) {
+      clearInterval(timer)
+      pathTimersRef.current.delete(userId)
+    }
+  }, [])
+
+  // 서버가 경로를 한 번 보내면 step_ms 간격으로 한 칸씩 위치를 진행 (칸마다 메시지를 받지 않음)
+  const followPath = useCallback((userId: string, path: [number, number][], stepMs: number) => {
+    stopPath(userId)
+    if (path.length === 0) return
+    const isMe = userId === myIdRef.current
+    let i = 0
+    const timer = setInterval(() => {
+      const [gridX, gridY] = path[i++]
+      if (isMe) {
+        setMyGridPos({ x: gridX, y: gridY })
+      } else {
+        setRemotePlayers(prev => {
+          const player = prev[userId]
+          if (!player) return prev
+          const { gridX: px, gridY: py } = player.position
+          const direction = gridX > px ? 'right' : gridX < px ? 'left' : gridY < py ? 'up' : 'down'
+          return { ...prev, [userId]: { ...player, position: { gridX, gridY, direction } } }
+        })
+      }
+      if (i >= path.length) stopPath(userId)
+    }, stepMs)
+    pathTimersRef.current.set(userId, timer)
+  }, [stopPath])
 
   const connect = useCallback(async () => {
     // 이미 연결 중이거나 연결된 상태면 스킵 (Strict Mode 중복 호출 방지)
@@ -51,23 +127,77 @@ export function useMultiplayer() {
 
     setMyName(session.user?.user_metadata?.username || session.user?.user_metadata?.name || session.user?.email || '')
 
-    const ws = new WebSocket(`${WS_URL}/ws?token=${session.access_token}`)
+    const viewRadius = getViewRadius()
+    const viewParam = viewRadius === null ? '' : `&view_radius=${viewRadius}`
+    const resume = resumeRef.current
+    const resumeParam = resume ? `&resume=${encodeURIComponent(resume.token)}&last_seq=${resume.lastSeq}` : ''
+    const ws = new WebSocket(`${WS_URL}/ws?token=${session.access_token}${viewParam}${resumeParam}`, [SUBPROTOCOL_BINARY])
+    ws.binaryType = 'arraybuffer'
     wsRef.current = ws
 
+    const countFrame = () => {
+      if (resumeRef.current) resumeRef.current.lastSeq += 1
+    }
+
+    const rememberIndices = (players: Record<string, RemotePlayer>) => {
+      for (const [uid, p] of Object.entries(players)) {
+        if (p.index !== undefined && p.index !== null) {
+          indexToUserRef.current.set(p.index, uid)
+        }
+      }
+    }
+
     ws.onopen = () => {
       setIsConnected(true)
       isConnectingRef.current = false
     }
 
     ws.onmessage = (event) => {
+      // 바이너리 프레임 = 위치 묶음
+      if (typeof event.data !== 'string') {
+        countFrame()
+        const moves = decodeServerMoves(event.data as ArrayBuffer)
+        setRemotePlayers(prev => {
+          const next = { ...prev }
+          for (const move of moves) {
+            const uid = indexToUserRef.current.get(move.index)
+            if (uid && next[uid]) {
+              next[uid] = {
+                ...next[uid],
+                position: { gridX: move.gridX, gridY: move.gridY, direction: move.direction },
+              }
+            }
+          }
+          return next
+        })
+        return
+      }
+
       const data = JSON.parse(event.data)
+      // 제어 메시지(init/resumed/ping)는 서버 seq 에 포함되지 않음
+      if (data.type !== 'init' && data.type !== 'resumed' && data.type !== 'ping') {
+        countFrame()
+      }
 
       switch (data.type) {
+        case 'ping':
+          // 서버 heartbeat — 응답이 없으면 서버가 죽은 연결로 보고 정리함
+          if (ws.readyState === WebSocket.OPEN) {
+            ws.send(JSON.stringify({ type: 'pong' }))
+          }
+          break
         case 'init':
-          setRemotePlayers(data.players)
+          // 처음 접속 또는 재개 간격이 서버 버퍼보다 커서 받은 전체 스냅샷
+          resumeRef.current = data.resume_token ? { token: data.resume_token, lastSeq: data.seq ?? 0 } : null
+          indexToUserRef.current = new Map()
+          myIdRef.current = data.your_id ?? null
+          rememberIndices(data.players)
+          // 서버 시뮬레이션 NPC 도 플레이어와 같은 모양으로 옴 (index 없음 — 바이너리 이동 대상 아님)
+          setRemotePlayers({ ...data.players, ...data.npcs })
           if (data.your_position) {
             setMyGridPos({ x: data.your_position.gridX, y: data.your_position.gridY })
           }
+          setCollision(data.room?.collision ? decodeCollision(data.room.collision, data.room.width, data.room.height) : null)
           if (data.your_email_prefix) {
             setMyEmailPrefix(data.your_email_prefix)
           }
@@ -76,6 +206,9 @@ export function useMultiplayer() {
           }
           break
         case 'player_joined':
+          if (data.index !== undefined) {
+            indexToUserRef.current.set(data.index, data.user_id)
+          }
           setRemotePlayers(prev => ({
             ...prev,
             [data.user_id]: {
@@ -91,7 +224,111 @@ export function useMultiplayer() {
             return next
           })
           break
+        case 'players_left':
+          // 서버가 응답 없는 연결을 한꺼번에 정리함
+          setRemotePlayers(prev => {
+            const next = { ...prev }
+            for (const uid of data.user_ids) {
+              delete next[uid]
+            }
+            return next
+          })
+          break
+        case 'view_enter':
+          // 시야 안으로 들어온 플레이어들
+          rememberIndices(data.players)
+          setRemotePlayers(prev => ({ ...prev, ...data.players }))
+          break
+        case 'view_leave':
+          // 시야 밖으로 나간 플레이어들
+          setRemotePlayers(prev => {
+            const next = { ...prev }
+            for (const uid of data.user_ids) {
+              delete next[uid]
+            }
+            return next
+          })
+          break
+        case 'tick':
+          // 틱 모드: 이번 틱에 움직인 플레이어들의 위치 묶음
+          setRemotePlayers(prev => {
+            const next = { ...prev }
+            for (const [uid, position] of Object.entries(data.players as Record<string, PlayerPosition>)) {
+              if (next[uid]) {
+                next[uid] = { ...next[uid], position }
+              }
+            }
+            return next
+          })
+          break
+        case 'npc_moves':
+          // 서버 시뮬레이션 NPC — 이번 NPC 틱에 움직인 NPC 묶음 [번호, gridX, gridY, 방향 코드]
+          setRemotePlayers(prev => {
+            const next = { ...prev }
+            for (const [i, gridX, gridY, dir] of data.npcs as number[][]) {
+              const key = SIM_NPC_PREFIX + i
+              if (next[key]) {
+                next[key] = { ...next[key], position: { gridX, gridY, direction: DIRECTIONS[dir] || 'down' } }
+              }
+            }
+            return next
+          })
+          break
+        case 'collision':
+          // 서버가 맵을 다시 읽음
+          setCollision(data.collision ? decodeCollision(data.collision, data.width, data.height) : null)
+          break
+        case 'correction':
+          // 서버가 이동을 거부함 (순간이동/속도 초과/충돌) — 서버 기준 위치로 되돌림
+          setMyGridPos({ x: data.position.gridX, y: data.position.gridY })
+          break
+        case 'player_updated': {
+          // 상태 메시지 등 프로필 변경 — 바뀐 필드만 옴
+          const changes = data.user_info as Partial<PlayerInfo>
+          if (data.user_id === myIdRef.current) {
+            if (changes.status_message !== undefined) {
+              setMyStatusMessage(changes.status_message || '')
+            }
+            break
+          }
+          setRemotePlayers(prev => {
+            if (!prev[data.user_id]) return prev
+            return {
+              ...prev,
+              [data.user_id]: {
+                ...prev[data.user_id],
+                user_info: { ...prev[data.user_id].user_info, ...changes }
+              }
+            }
+          })
+          // 위치 동기화 대상이 아닌 NPC 등은 화면 쪽에서 profileUpdates 로 덮어씀
+          setProfileUpdates(prev => ({ ...prev, [data.user_id]: { ...prev[data.user_id], ...changes } }))
+          break
+        }
+        case 'chat_message':
+          // 근접 채팅 — 서버가 반경 안의 플레이어와 보낸 사람 본인에게 보냄
+          setChatMessages(prev => [...prev.slice(-(MAX_CHAT_MESSAGES - 1)), {
+            user_id: data.user_id,
+            user_name: data.user_name,
+            message: data.message,
+            timestamp: data.timestamp,
+            mine: data.user_id === myIdRef.current
+          }])
+          break
+        case 'chat_rejected':
+          console.warn('Chat rejected:', data.reason)
+          break
+        case 'player_path':
+          // move_to 경로 — 빈 경로는 정지 (막혀서 더 갈 수 없음)
+          if (data.user_id !== myIdRef.current && data.position) {
+            setRemotePlayers(prev => prev[data.user_id]
+              ? { ...prev, [data.user_id]: { ...prev[data.user_id], position: data.position } }
+              : prev)
+          }
+          followPath(data.user_id, data.path, data.step_ms)
+          break
         case 'player_moved':
+          stopPath(data.user_id)
           setRemotePlayers(prev => ({
             ...prev,
             [data.user_id]: {
@@ -110,6 +347,7 @@ export function useMultiplayer() {
       // 인증 실패 시 재연결 안 함 (code 4001)
       if (event.code === 4001) {
         console.warn('WebSocket auth failed, not reconnecting')
+        resumeRef.current = null
         return
       }
       // 3초 후 재연결
@@ -122,22 +360,47 @@ export function useMultiplayer() {
       isConnectingRef.current = false
       ws.close()
     }
+  }, [followPath, stopPath])
+
+  // 화면 크기 변경 시 시야 반경 갱신
+  useEffect(() => {
+    let lastRadius = getViewRadius()
+    const handleResize = () => {
+      const radius = getViewRadius()
+      if (radius === lastRadius) return
+      lastRadius = radius
+      if (wsRef.current?.readyState === WebSocket.OPEN) {
+        wsRef.current.send(JSON.stringify({ type: 'view', radius }))
+      }
+    }
+    window.addEventListener('resize', handleResize)
+    return () => window.removeEventListener('resize', handleResize)
   }, [])
 
   useEffect(() => {
     connect()
+    const pathTimers = pathTimersRef.current
     return () => {
+      pathTimers.forEach(timer => clearInterval(timer))
+      pathTimers.clear()
       if (reconnectTimeoutRef.current) {
         clearTimeout(reconnectTimeoutRef.current)
       }
       if (wsRef.current) {
-        wsRef.current.close()
+        // 정상 종료 코드 — 서버가 재접속을 기다리지 않고 바로 퇴장 처리
+        wsRef.current.close(1000)
       }
     }
   }, [connect])
 
   const sendPosition = useCallback((gridX: number, gridY: number, direction: string) => {
     if (wsRef.current?.readyState === WebSocket.OPEN) {
+      // 직접 움직이면 서버도 진행 중인 move_to 를 취소함
+      stopPath(myIdRef.current ?? '')
+      if (wsRef.current.protocol === SUBPROTOCOL_BINARY) {
+        wsRef.current.send(encodeClientMove(gridX, gridY, direction))
+        return
+      }
       wsRef.current.send(JSON.stringify({
         type: 'move',
         gridX,
@@ -145,7 +408,24 @@ export function useMultiplayer() {
         direction
       }))
     }
+  }, [stopPath])
+
+  // 목적지 타일로 이동 요청 — 서버가 경로를 계획해 player_path 로 알려줌
+  const moveTo = useCallback((gridX: number, gridY: number) => {
+    if (wsRef.current?.readyState === WebSocket.OPEN) {
+      stopPath(myIdRef.current ?? '')
+      wsRef.current.send(JSON.stringify({ type: 'move_to', gridX, gridY }))
+    }
+  }, [stopPath])
+
+  const sendChat = useCallback((message: string) => {
+    const text = message.trim()
+    if (!text || wsRef.current?.readyState !== WebSocket.OPEN) return
+    wsRef.current.send(JSON.stringify({ type: 'chat', message: text }))
   }, [])
 
-  return { remotePlayers, isConnected, sendPosition, myName, myEmailPrefix, myStatusMessage, myGridPos }
+  return {
+    remotePlayers, isConnected, sendPosition, moveTo, sendChat, chatMessages, profileUpdates, collision,
+    myName, myEmailPrefix, myStatusMessage, myGridPos
+  }
 }
@@ -20,10 +20,12 @@ export const GameEvents = {
 
   // Phaser -> React
   PLAYER_MOVE: 'player-move',                         // 플레이어 이동 시
+  PLAYER_MOVE_TO: 'player-move-to',                   // 타일 클릭/탭 — 서버 경로 이동 요청
   SCENE_READY: 'scene-ready',                         // 씬 준비 완료
   GAME_READY: 'game-ready',                           // 게임 인스턴스 준비 완료
   NPC_INTERACT: 'npc-interact',                       // NPC 대화 시작 요청
 
   // React -> Phaser
   CHAT_OPEN: 'chat-open',                             // 채팅창 열림/닫힘
+  COLLISION_UPDATE: 'collision-update',               // 서버 충돌 레이어 (벽/가구) 수신
 } as const
@@ -0,0 +1,69 @@
+// 바이너리 WebSocket 프로토콜 (backend/ws/protocol.py 와 동일한 형식)
+// 위치 트래픽만 바이너리, 나머지 이벤트는 JSON 텍스트 프레임
+
+export const SUBPROTOCOL_BINARY = 'cgtown.bin.v1'
+
+const OP_CLIENT_MOVE = 0x01
+const OP_SERVER_MOVES = 0x02
+const MOVES_HEADER_SIZE = 3
+const MOVE_RECORD_SIZE = 7
+
+export const DIRECTIONS = ['down', 'up', 'left', 'right']
+
+// 서버 충돌 레이어 (벽/가구) — 막힌 타일로 가는 이동은 서버가 거부하므로 클라이언트도 미리 막는다
+export interface CollisionLayer {
+  width: number
+  height: number
+  bits: Uint8Array
+}
+
+export interface BinaryMove {
+  index: number
+  gridX: number
+  gridY: number
+  direction: string
+}
+
+// 클라이언트 → 서버 이동: [0x01][gridX u16][gridY u16][direction u8]
+export function encodeClientMove(gridX: number, gridY: number, direction: string): ArrayBuffer {
+  const buf = new ArrayBuffer(6)
+  const view = new DataView(buf)
+  view.setUint8(0, OP_CLIENT_MOVE)
+  view.setUint16(1, gridX, true)
+  view.setUint16(3, gridY, true)
+  view.setUint8(5, Math.max(0, DIRECTIONS.indexOf(direction)))
+  return buf
+}
+
+// 서버 → 클라이언트 이동 묶음: [0x02][count u16] + count * [index u16][gridX u16][gridY u16][direction u8]
+export function decodeServerMoves(buf: ArrayBuffer): BinaryMove[] {
+  const view = new DataView(buf)
+  if (view.getUint8(0) !== OP_SERVER_MOVES) return []
+  const count = view.getUint16(1, true)
+  const moves: BinaryMove[] = []
+  for (let i = 0; i < count; i++) {
+    const offset = MOVES_HEADER_SIZE + i * MOVE_RECORD_SIZE
+    moves.push({
+      index: view.getUint16(offset, true),
+      gridX: view.getUint16(offset + 2, true),
+      gridY: view.getUint16(offset + 4, true),
+      direction: DIRECTIONS[view.getUint8(offset + 6)] || 'down',
+    })
+  }
+  return moves
+}
+
+// 충돌 레이어 (backend/ws/collision.py CollisionMap.encode): 비트셋 base64 —
+// 타일 y * width + x 의 비트, 바이트 안에서는 낮은 비트부터
+export function decodeCollision(encoded: string, width: number, height: number): CollisionLayer {
+  const raw = atob(encoded)
+  const bits = new Uint8Array(raw.length)
+  for (let i = 0; i < raw.length; i++) bits[i] = raw.charCodeAt(i)
+  return { width, height, bits }
+}
+
+export function isBlocked(layer: CollisionLayer, gridX: number, gridY: number): boolean {
+  if (gridX < 0 || gridY < 0 || gridX >= layer.width || gridY >= layer.height) return true
+  const idx = gridY * layer.width + gridX
+  return ((layer.bits[idx >> 3] >> (idx & 7)) & 1) === 1
+}